@@ -0,0 +1,74 @@
+"""
+Benchmark do parse HTML por fonte: árvore completa com `html.parser` (comportamento
+anterior) contra o backend configurado com parse restrito ao alvo (`SoupStrainer`).
+
+Uso:
+    python benchmarks/bench_html_parsing.py [--fixtures data/fixtures/pages] [--repeat 5]
+"""
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+from bs4 import BeautifulSoup
+
+from factory.pipelines.data_ingestion import utils
+from fixtures import SOURCES, load_pages, load_parameters
+
+
+def _parse(source: str, page: str, parameters: dict, parser: str):
+    parms = parameters.get(f"{source}_parms", {})
+    if source in ("cds", "ifix"):
+        return utils.parse_html_table(page, parser)
+    if source == "infomoney":
+        return utils.parse_infomoney(page, parms["class_"], parser)
+    if source == "valorinveste":
+        return utils.parse_valorinveste(page, parms["class_post"], parms["class_date"], parser)
+    if source == "seudinheiro":
+        return utils.parse_seudinheiro(page, parms["class_feed"], parms["class_title"], parms["class_date"], parser)
+    return utils.parse_moneytimes(page, parms["class_item"], parms["class_title"], parms["class_date"], parser)
+
+
+def _full_tree(markup, parser=None, parse_only=None):  # pylint: disable=unused-argument
+    return BeautifulSoup(markup, "html.parser")
+
+
+def _measure(func, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, statistics.median(timings), peak
+
+
+def main() -> None:
+    args = argparse.ArgumentParser(description=__doc__)
+    args.add_argument("--fixtures", default=None, help="Diretório com <fonte>.html salvos")
+    args.add_argument("--repeat", type=int, default=5)
+    args.add_argument("--items", type=int, default=50, help="Itens por página sintética")
+    options = args.parse_args()
+
+    parameters = load_parameters()
+    pages = load_pages(options.fixtures, options.items)
+
+    sys.stdout.write(f"{'fonte':<14}{'KB':>8}{'base ms':>10}{'base MB':>10}{'novo ms':>10}{'novo MB':>10}  linhas iguais\n")
+    for source in SOURCES:
+        page = pages[source]
+        parser = parameters.get(f"{source}_parms", {}).get("parser")
+        with mock.patch.object(utils, "make_soup", _full_tree):
+            baseline, base_time, base_peak = _measure(lambda: _parse(source, page, parameters, None), options.repeat)
+        fast, fast_time, fast_peak = _measure(lambda: _parse(source, page, parameters, parser), options.repeat)
+        sys.stdout.write(f"{source:<14}{len(page.encode()) / 1024:>8.0f}{base_time * 1000:>10.1f}{base_peak / 2 ** 20:>10.1f}"
+                         f"{fast_time * 1000:>10.1f}{fast_peak / 2 ** 20:>10.1f}  {baseline == fast}\n")
+
+
+if __name__ == "__main__":
+    main()
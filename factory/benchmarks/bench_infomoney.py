@@ -0,0 +1,65 @@
+"""
+Benchmark da extração do InfoMoney: `find_next("time")` por bloco (implementação
+anterior) contra o extrator de passada única, em páginas sintéticas com milhares de itens.
+
+O cenário "sem time" remove o `<time>` de todos os blocos, caso em que cada
+`find_next` percorre o restante do documento.
+
+Uso:
+    python benchmarks/bench_infomoney.py [--sizes 250 500 1000 2000 4000]
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+from factory.pipelines.data_ingestion.utils import parse_infomoney
+from fixtures import build_page, load_parameters
+
+
+def _legacy_parse_infomoney(html, class_):
+    soup = BeautifulSoup(html, "html.parser")
+    noticias = []
+    for bloco in soup.find_all("div", class_=class_):
+        titulo = bloco.text.strip()
+        h2 = bloco.find("h2")
+        if h2:
+            a_tag = h2.find("a")
+            link = a_tag["href"] if a_tag and a_tag.has_attr("href") else None
+            data_el = bloco.find_next("time")
+            data = data_el["datetime"] if data_el else datetime.today().isoformat()
+            noticias.append({"fonte": "InfoMoney", "titulo": titulo, "dat_ref": data, "link": link})
+    return noticias
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    args = argparse.ArgumentParser(description=__doc__)
+    args.add_argument("--sizes", type=int, nargs="+", default=[250, 500, 1000, 2000, 4000])
+    options = args.parse_args()
+
+    parameters = load_parameters()
+    class_ = parameters["infomoney_parms"]["class_"]
+    parser = parameters["infomoney_parms"].get("parser")
+
+    sys.stdout.write(f"{'cenário':<10}{'itens':>8}{'anterior s':>12}{'passada única s':>17}  registros iguais\n")
+    for scenario in ("com time", "sem time"):
+        for size in options.sizes:
+            page = build_page("infomoney", parameters, size)
+            if scenario == "sem time":
+                page = page.replace("<time", "<small").replace("</time>", "</small>")
+            legacy, legacy_time = _timed(lambda: _legacy_parse_infomoney(page, class_))
+            fast, fast_time = _timed(lambda: parse_infomoney(page, class_, parser))
+            same = [{**n, "dat_ref": n["dat_ref"][:10]} for n in legacy] == [{**n, "dat_ref": n["dat_ref"][:10]} for n in fast]
+            sys.stdout.write(f"{scenario:<10}{size:>8}{legacy_time:>12.2f}{fast_time:>17.2f}  {same}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark da ingestão de notícias pelo feed RSS/sitemap (`parse_feed`) contra o
+scraping da listagem HTML, por fonte: bytes transferidos, tempo de parse e registros.
+
+Uso:
+    python benchmarks/bench_news_feed.py [--fixtures data/fixtures/pages] [--repeat 5] [--items 50]
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from factory.pipelines.data_ingestion import utils
+from fixtures import NEWS_SOURCES, load_feeds, load_pages, load_parameters
+
+FONTES = {"infomoney": "InfoMoney", "valorinveste": "Valor Investe", "seudinheiro": "Seu Dinheiro", "moneytimes": "MoneyTimes"}
+
+
+def _parse_html(source: str, page: str, parameters: dict):
+    parms = parameters[f"{source}_parms"]
+    parser = parms.get("parser")
+    if source == "infomoney":
+        return utils.parse_infomoney(page, parms["class_"], parser)
+    if source == "valorinveste":
+        return utils.parse_valorinveste(page, parms["class_post"], parms["class_date"], parser)
+    if source == "seudinheiro":
+        return utils.parse_seudinheiro(page, parms["class_feed"], parms["class_title"], parms["class_date"], parser)
+    return utils.parse_moneytimes(page, parms["class_item"], parms["class_title"], parms["class_date"], parser)
+
+
+def _median_time(func, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings)
+
+
+def main() -> None:
+    args = argparse.ArgumentParser(description=__doc__)
+    args.add_argument("--fixtures", default=None, help="Diretório com <fonte>.html e <fonte>.xml salvos")
+    args.add_argument("--repeat", type=int, default=5)
+    args.add_argument("--items", type=int, default=50, help="Itens por página/feed sintético")
+    options = args.parse_args()
+
+    parameters = load_parameters()
+    pages = load_pages(options.fixtures, options.items)
+    feeds = load_feeds(options.fixtures, options.items)
+
+    sys.stdout.write(f"{'fonte':<14}{'html KB':>9}{'feed KB':>9}{'html ms':>9}{'feed ms':>9}{'html n':>8}{'feed n':>8}  campos\n")
+    for source in NEWS_SOURCES:
+        page, feed = pages[source].encode(), feeds[source].encode()
+        html_rows, html_time = _median_time(lambda: _parse_html(source, page.decode(), parameters), options.repeat)
+        feed_rows, feed_time = _median_time(lambda: utils.parse_feed(feed, FONTES[source]), options.repeat)
+        campos = {"dat_ref", "fonte", "titulo", "link"} <= set(feed_rows[0]) if feed_rows else False
+        sys.stdout.write(f"{source:<14}{len(page) / 1024:>9.0f}{len(feed) / 1024:>9.0f}{html_time * 1000:>9.1f}"
+                         f"{feed_time * 1000:>9.1f}{len(html_rows):>8}{len(feed_rows):>8}  {campos}\n")
+
+
+if __name__ == "__main__":
+    main()
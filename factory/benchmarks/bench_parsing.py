@@ -0,0 +1,88 @@
+"""
+Micro-benchmarks dos parsers de ingestão: funções linha a linha (`apply`) contra as
+versões vetorizadas de `data_ingestion.parsing`, conferindo que o resultado é idêntico.
+
+Uso:
+    python benchmarks/bench_parsing.py [--rows 100000]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from factory.pipelines.data_ingestion import parsing, utils
+from fixtures import MESES
+
+AGORA = datetime(2025, 1, 15, 20, 0)
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def _legacy_numeric(df, columns, replace_decimal):
+    df = df.copy()
+    df["change_percentage"] = df["change_percentage"].str.replace("%", "", regex=False)
+    for col in columns:
+        if replace_decimal:
+            df[col] = df[col].str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def _frames(rows: int, rng: random.Random):
+    titulos = pd.Series([
+        f"Mercados  Ibovespa sobe {i} pontos com juros  {rng.randint(1, 28)} jan 2025" if i % 3 else
+        f"Economia Inflação desacelera em {i} capitais 12 jan 2025"
+        for i in range(rows)])
+    links = pd.Series([f"https://valorinveste.globo.com/mercados/2025/01/{rng.randint(1, 28):02d}/n{i}.ghtml" if i % 10 else f"https://x/{i}"
+                       for i in range(rows)])
+    datas_pt = pd.Series([f"{rng.randint(1, 28)} de {rng.choice(MESES).capitalize()} de 2025" if i % 50 else "ontem" for i in range(rows)])
+    relativas = pd.Series([f"há {rng.randint(1, 23)} horas" if i % 2 else f"há {rng.randint(1, 30)} dias" for i in range(rows)])
+    numeros = pd.DataFrame({col: [f"{rng.uniform(1000, 200000):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") for _ in range(rows)]
+                            for col in ["close_price", "open_price", "high_price", "low_price"]})
+    numeros["change_percentage"] = [f"{rng.uniform(-3, 3):.2f}%".replace(".", ",") for _ in range(rows)]
+    return titulos, links, datas_pt, relativas, numeros
+
+
+def main() -> None:
+    args = argparse.ArgumentParser(description=__doc__)
+    args.add_argument("--rows", type=int, default=100_000)
+    options = args.parse_args()
+
+    titulos, links, datas_pt, relativas, numeros = _frames(options.rows, random.Random(7))
+    colunas = list(numeros.columns)
+    casos = {
+        "extrair_campos": (
+            lambda: titulos.apply(utils.extrair_campos).set_axis(["categoria", "titulo", "data_publicacao"], axis=1),
+            lambda: parsing.extrair_campos_vetorizado(titulos)),
+        "extrair_data_url": (
+            lambda: links.apply(utils.extrair_data_url),
+            lambda: parsing.extrair_data_url_vetorizado(links)),
+        "parse_data_portugues": (
+            lambda: datas_pt.apply(utils.parse_data_portugues),
+            lambda: parsing.parse_data_portugues_vetorizado(datas_pt)),
+        "data_relativa": (
+            lambda: relativas.apply(utils.data_relativa_para_absoluta, agora=AGORA),
+            lambda: parsing.data_relativa_para_absoluta_vetorizado(relativas, AGORA)),
+        "converter_numerico": (
+            lambda: _legacy_numeric(numeros, colunas, True),
+            lambda: parsing.converter_numerico(numeros, colunas, True)),
+    }
+
+    sys.stdout.write(f"{'parser':<22}{'linhas':>8}{'apply s':>10}{'vetorizado s':>14}{'ganho':>8}  idêntico\n")
+    for nome, (legado, vetorizado) in casos.items():
+        esperado, tempo_legado = _timed(legado)
+        obtido, tempo_vetorizado = _timed(vetorizado)
+        identico = esperado.equals(obtido)
+        sys.stdout.write(f"{nome:<22}{options.rows:>8}{tempo_legado:>10.3f}{tempo_vetorizado:>14.3f}"
+                         f"{tempo_legado / tempo_vetorizado:>7.1f}x  {identico}\n")
+
+
+if __name__ == "__main__":
+    main()
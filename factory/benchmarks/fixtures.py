@@ -0,0 +1,131 @@
+"""
+Páginas de exemplo para os benchmarks de ingestão.
+
+Quando não há páginas salvas (ex.: `data/fixtures/pages/<fonte>.html`), gera documentos
+sintéticos com a mesma estrutura das fontes reais: tabelas históricas do investing.com
+e listagens de notícias cercadas de scripts, menus e anúncios. Os feeds das fontes de
+notícias (`<fonte>.xml`) seguem o mesmo esquema: RSS 2.0 ou sitemap de notícias.
+"""
+from pathlib import Path
+from typing import Dict
+import random
+
+import yaml
+
+PROJECT_PATH = Path(__file__).resolve().parents[1]
+PARAMETERS_PATH = PROJECT_PATH / "conf" / "base" / "parameters_data_ingestion.yml"
+SOURCES = ("cds", "ifix", "infomoney", "valorinveste", "seudinheiro", "moneytimes")
+NEWS_SOURCES = ("infomoney", "valorinveste", "seudinheiro", "moneytimes")
+
+MESES = ["janeiro", "fevereiro", "março", "abril", "maio", "junho", "julho",
+         "agosto", "setembro", "outubro", "novembro", "dezembro"]
+
+
+def load_parameters() -> Dict:
+    """Lê `parameters_data_ingestion.yml` (classes CSS e URLs de cada fonte)."""
+    with open(PARAMETERS_PATH, encoding="utf-8") as file:
+        return yaml.safe_load(file)
+
+
+def _noise(rng: random.Random, blocks: int) -> str:
+    """Scripts, menus e anúncios que cercam o conteúdo útil das páginas reais."""
+    parts = []
+    for i in range(blocks):
+        parts.append(f"<script>window.__ads_{i} = {{slot: '{rng.random()}', sizes: [[300, 250], [728, 90]]}};</script>")
+        parts.append(f'<nav class="menu"><ul>{"".join(f"<li><a href=/m/{j}>Menu {j}</a></li>" for j in range(20))}</ul></nav>')
+        parts.append(f'<div class="ad-slot"><iframe src="https://ads.example/{i}"></iframe><p>Publicidade {i}</p></div>')
+    return "".join(parts)
+
+
+def _table_page(rng: random.Random, rows: int, english: bool) -> str:
+    header = ["Date", "Price", "Open", "High", "Low", "Vol.", "Change %"] if english else \
+        ["Data", "Último", "Abertura", "Máxima", "Mínima", "Vol.", "Var%"]
+    body = []
+    for i in range(rows):
+        day = f"Jan {i % 28 + 1:02d}, 2025" if english else f"{i % 28 + 1:02d}.01.2025"
+        values = [f"{rng.uniform(100, 200):.2f}" if english else f"{rng.uniform(3000, 3500):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+                  for _ in range(4)]
+        body.append("<tr>" + "".join(f"<td>{v}</td>" for v in [day, *values, "", f"{rng.uniform(-2, 2):.2f}%"]) + "</tr>")
+    other = "<table><thead><tr><th>Nome</th><th>Valor</th></tr></thead><tbody>" + \
+        "".join(f"<tr><td>x{i}</td><td>{i}</td></tr>" for i in range(30)) + "</tbody></table>"
+    target = "<table><thead><tr>" + "".join(f"<th>{h}</th>" for h in header) + "</tr></thead><tbody>" + "".join(body) + "</tbody></table>"
+    return f"<html><head>{_noise(rng, 40)}</head><body>{other}{_noise(rng, 40)}{target}{_noise(rng, 80)}</body></html>"
+
+
+def _news_page(source: str, parms: Dict, rng: random.Random, items: int) -> str:
+    rows = []
+    for i in range(items):
+        titulo = f"Notícia {i} sobre mercado e juros {rng.randint(0, 10 ** 6)}"
+        if source == "infomoney":
+            rows.append(f'<div class="{parms["class_"]}"><span>Mercados</span>  <h2><a href="https://www.infomoney.com.br/n/{i}">{titulo}</a></h2>  '
+                        f'<time datetime="2025-01-{i % 28 + 1:02d}T10:00:00">há {i} horas</time></div>')
+        elif source == "valorinveste":
+            rows.append(f'<div class="feed-post"><a class="{parms["class_post"]}" href="https://valorinveste.globo.com/2025/01/{i % 28 + 1:02d}/n{i}.ghtml">{titulo}</a>'
+                        f'<span class="{parms["class_date"]}">Há {i} horas</span></div>')
+        elif source == "seudinheiro":
+            rows.append(f'<div class="{parms["class_feed"]}"><h2 class="{parms["class_title"]}"><a href="https://www.seudinheiro.com/n/{i}">{titulo}</a></h2>'
+                        f'<div class="{parms["class_date"]}">{i % 28 + 1} de {MESES[i % 12]} de 2025</div></div>')
+        else:
+            rows.append(f'<div class="{parms["class_item"]}"><h2 class="{parms["class_title"]}"><a href="https://www.moneytimes.com.br/n/{i}">{titulo}</a></h2>'
+                        f'<span class="{parms["class_date"]}">há {i % 47 + 1} horas</span></div>')
+        if i % 5 == 4:
+            rows.append(_noise(rng, 1))
+    return f"<html><head>{_noise(rng, 40)}</head><body>{_noise(rng, 20)}{''.join(rows)}{_noise(rng, 60)}</body></html>"
+
+
+def build_page(source: str, parameters: Dict, items: int = 50, seed: int = 42) -> str:
+    """Gera a página sintética de uma fonte (`SOURCES`)."""
+    rng = random.Random(seed)
+    if source in ("cds", "ifix"):
+        return _table_page(rng, items, english=source == "cds")
+    return _news_page(source, parameters[f"{source}_parms"], rng, items)
+
+
+def load_pages(fixtures_dir: str = None, items: int = 50) -> Dict[str, str]:
+    """Lê as páginas salvas em `fixtures_dir` ou gera as sintéticas para as fontes ausentes."""
+    parameters = load_parameters()
+    pages = {}
+    for source in SOURCES:
+        saved = Path(fixtures_dir) / f"{source}.html" if fixtures_dir else None
+        if saved and saved.exists():
+            pages[source] = saved.read_text(encoding="utf-8")
+        else:
+            pages[source] = build_page(source, parameters, items)
+    return pages
+
+
+def build_feed(source: str, items: int = 50, seed: int = 42) -> str:
+    """Gera o feed sintético de uma fonte de notícias: sitemap de notícias (Valor Investe) ou RSS 2.0."""
+    rng = random.Random(seed)
+    entries = []
+    for i in range(items):
+        titulo = f"Notícia {i} sobre mercado e juros {rng.randint(0, 10 ** 6)}"
+        dia = 28 - i % 28
+        if source == "valorinveste":
+            entries.append(f"<url><loc>https://valorinveste.globo.com/2025/01/{dia:02d}/n{i}.ghtml</loc><news:news>"
+                           "<news:publication><news:name>Valor Investe</news:name><news:language>pt</news:language></news:publication>"
+                           f"<news:publication_date>2025-01-{dia:02d}T10:00:00-03:00</news:publication_date>"
+                           f"<news:title>{titulo}</news:title></news:news></url>")
+        else:
+            entries.append(f"<item><title>{titulo}</title><link>https://www.{source}.com.br/n/{i}</link>"
+                           f"<pubDate>{['Mon', 'Tue', 'Wed', 'Thu', 'Fri'][i % 5]}, {dia:02d} Jan 2025 13:00:00 +0000</pubDate>"
+                           f"<category><![CDATA[{'Esportes' if i % 10 == 9 else 'Mercados'}]]></category>"
+                           f"<description><![CDATA[<p>{titulo}. {'Resumo da notícia. ' * 10}</p>]]></description></item>")
+    if source == "valorinveste":
+        return ('<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+                'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">' + "".join(entries) + "</urlset>")
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>{source}</title><link>https://www.{source}.com.br</link><description>Últimas notícias</description>"
+            + "".join(entries) + "</channel></rss>")
+
+
+def load_feeds(fixtures_dir: str = None, items: int = 50) -> Dict[str, str]:
+    """Lê os feeds salvos em `fixtures_dir` (`<fonte>.xml`) ou gera os sintéticos para as fontes ausentes."""
+    feeds = {}
+    for source in NEWS_SOURCES:
+        saved = Path(fixtures_dir) / f"{source}.xml" if fixtures_dir else None
+        if saved and saved.exists():
+            feeds[source] = saved.read_text(encoding="utf-8")
+        else:
+            feeds[source] = build_feed(source, items)
+    return feeds
@@ -49,6 +49,9 @@ class KedroOperator(BaseOperator):
             all_params['execution_date'] = ds
         if _needs_render(all_params.get('run_id')):
             all_params['run_id'] = run_id
+        # cada tentativa da task tem o próprio orçamento de tempo do estágio de ingestão
+        if context.get('ti') is not None:
+            all_params['try_number'] = context['ti'].try_number
         
         # Log dos parâmetros para debug
         self.log.info(f"Executing with parameters: {all_params}")
@@ -97,7 +100,8 @@ with DAG(
         "execution_date": "{{ ds }}",
         "run_id": "{{ run_id }}",
         "environment": "production",
-        "process_full_data": False
+        "process_full_data": False,
+        "ingestion_mode": "daily"  # "incremental" recupera os dias desde a última marca d'água
     }
 ) as dag:
     tasks = {
@@ -155,20 +159,11 @@ with DAG(
             env=env,
             conf_source=conf_source,
         ),
-        "etl-ibov-node": KedroOperator(
-            task_id="etl-ibov-node",
+        "etl-yf-node": KedroOperator(
+            task_id="etl-yf-node",
             package_name=package_name,
             pipeline_name=pipeline_name,
-            node_name="etl_ibov_node",
-            project_path=project_path,
-            env=env,
-            conf_source=conf_source,
-        ),
-        "etl-ivvb11-vix-brasil-node": KedroOperator(
-            task_id="etl-ivvb11-vix-brasil-node",
-            package_name=package_name,
-            pipeline_name=pipeline_name,
-            node_name="etl_ivvb11_vix_brasil_node",
+            node_name="etl_yf_node",
             project_path=project_path,
             env=env,
             conf_source=conf_source,
@@ -237,16 +232,15 @@ with DAG(
             conf_source=conf_source,
         )
     }
-    tasks["etl-ibov-node"] >> tasks["indicador-atividade-mercado-node"]
+    tasks["etl-yf-node"] >> tasks["indicador-atividade-mercado-node"]
     tasks["etl-html-ifix-node"] >> tasks["indicador-confianca-mercado-local-node"]
-    tasks["etl-ibov-node"] >> tasks["indicador-retorno-mercado-node"]
+    tasks["etl-yf-node"] >> tasks["indicador-retorno-mercado-node"]
     tasks["etl-html-cds-node"] >> tasks["indicador-risco-credito-node"]
     tasks["etl-html-seudinheiro-node"] >> tasks["indicador-sentimento-noticias-node"]
     tasks["etl-html-moneytimes-node"] >> tasks["indicador-sentimento-noticias-node"]
     tasks["etl-html-infomoney-node"] >> tasks["indicador-sentimento-noticias-node"]
     tasks["etl-html-valorinveste-node"] >> tasks["indicador-sentimento-noticias-node"]
-    tasks["etl-ibov-node"] >> tasks["indicador-volatilidade-mercado-node"]
-    tasks["etl-ivvb11-vix-brasil-node"] >> tasks["indicador-volatilidade-mercado-node"]
+    tasks["etl-yf-node"] >> tasks["indicador-volatilidade-mercado-node"]
     tasks["indicador-confianca-mercado-local-node"] >> tasks["process-score-data-node"]
     tasks["indicador-volatilidade-mercado-node"] >> tasks["process-score-data-node"]
     tasks["indicador-retorno-mercado-node"] >> tasks["process-score-data-node"]
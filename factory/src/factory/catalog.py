@@ -0,0 +1,135 @@
+"""
+Catálogo com cache de sessão para datasets lidos por vários nós
+"""
+import copy
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+from kedro.io import DataCatalog, MemoryDataset
+import pandas as pd
+from factory.datasets import AppendCSVDataset, AppendParquetDataset, DatePartitionedDataset
+
+
+logger = logging.getLogger(__name__)
+
+APPEND_DATASETS = (AppendCSVDataset, AppendParquetDataset, DatePartitionedDataset)
+
+
+def _copy(data: Any) -> Any:
+    """Cópia entregue a cada nó (os nós alteram os DataFrames recebidos)"""
+    if isinstance(data, pd.DataFrame):
+        return data.copy(deep=True)
+    return copy.deepcopy(data)
+
+
+class CachedDataCatalog(DataCatalog):
+    """
+    `DataCatalog` que guarda em memória, durante a sessão, os dados lidos e gravados
+
+    - Leituras repetidas de um dataset (com o mesmo intervalo de `set_date_range`) são
+      servidas da memória; antes de cada uso, a entrada é validada pela impressão digital
+      do conteúdo gravado (`fingerprint`: ETag ou tamanho e data dos arquivos, sem baixar
+      os dados), de modo que gravações de outras execuções invalidam o cache.
+    - Os dados gravados por um nó passam direto aos nós seguintes quando o dataset é
+      sobrescrito a cada gravação. Nos datasets de append (que acumulam o histórico), as
+      linhas gravadas são incorporadas à entrada do intervalo já lido, com a regra de
+      duplicatas do dataset, e a impressão digital é atualizada após a gravação; sem
+      entrada válida (nada lido ainda na sessão, ou o armazenamento mudou desde a leitura),
+      a gravação apenas invalida o cache, e a próxima leitura vem do armazenamento.
+    - `release` (chamado pelo runner após o último consumidor) descarta a entrada.
+
+    O cache é compartilhado com as cópias do catálogo (`shallow_copy`, usada pelo runner);
+    no `ParallelRunner`, cada processo começa com o cache vazio.
+
+    Ativado em `settings.py` (`DATA_CATALOG_CLASS`).
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._cache: Dict[Tuple[str, Any], Tuple[Optional[str], Any]] = {}
+        self._cache_locks: Dict[str, threading.Lock] = {}
+        self._cache_guard = threading.Lock()
+        self._cache_stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'passthrough': 0}
+
+    def shallow_copy(self, extra_dataset_patterns: Any = None) -> "CachedDataCatalog":
+        catalog = super().shallow_copy(extra_dataset_patterns)
+        catalog.__dict__.update({attr: self.__dict__[attr] for attr in
+                                 ('_cache', '_cache_locks', '_cache_guard', '_cache_stats')})
+        return catalog
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state.update(_cache={}, _cache_locks={}, _cache_guard=None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._cache_guard = threading.Lock()
+
+    def _dataset_lock(self, name: str) -> threading.Lock:
+        with self._cache_guard:
+            return self._cache_locks.setdefault(name, threading.Lock())
+
+    @staticmethod
+    def _fingerprint(dataset: Any) -> Optional[str]:
+        fingerprint = getattr(dataset, 'fingerprint', None)
+        return fingerprint() if callable(fingerprint) else None
+
+    def _drop(self, name: str) -> None:
+        with self._cache_guard:
+            for key in [key for key in self._cache if key[0] == name]:
+                del self._cache[key]
+
+    def load(self, name: str, version: Optional[str] = None) -> Any:
+        if version is not None:
+            return super().load(name, version)
+
+        dataset = self._get_dataset(name)
+        if isinstance(dataset, MemoryDataset):
+            return super().load(name)
+        key = (name, getattr(dataset, 'date_range', None))
+        with self._dataset_lock(name):
+            fingerprint = self._fingerprint(dataset)
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == fingerprint:
+                self._cache_stats['hits'] += 1
+                logger.info("Loading data from %s (cache da sessão, intervalo %s)...", name, key[1])
+                return _copy(cached[1])
+
+            data = super().load(name)
+            self._cache_stats['misses'] += 1
+            self._cache[key] = (fingerprint, data)
+            return _copy(data)
+
+    def save(self, name: str, data: Any) -> None:
+        dataset = self._get_dataset(name)
+        if isinstance(dataset, MemoryDataset):
+            super().save(name, data)
+            return
+        key = (name, getattr(dataset, 'date_range', None))
+        with self._dataset_lock(name):
+            if not isinstance(dataset, APPEND_DATASETS):
+                super().save(name, data)
+                self._drop(name)
+                # o conteúdo do dataset passa a ser exatamente `data`
+                self._cache[key] = (self._fingerprint(dataset), _copy(data))
+                self._cache_stats['passthrough'] += 1
+                return
+
+            cached = self._cache.get(key)
+            if cached is not None and (not isinstance(data, pd.DataFrame) or cached[0] != self._fingerprint(dataset)):
+                cached = None  # gravado por outra execução desde a leitura
+            super().save(name, data)
+            self._drop(name)
+            merged = dataset.merge_appended(cached[1], data) if cached is not None else None
+            if merged is not None:
+                self._cache[key] = (self._fingerprint(dataset), merged)
+                self._cache_stats['passthrough'] += 1
+
+    def release(self, name: str) -> None:
+        self._drop(name)
+        super().release(name)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Leituras servidas da memória (`hits`), do armazenamento (`misses`) e gravações repassadas"""
+        return dict(self._cache_stats)
@@ -1,26 +1,525 @@
 """
-Datasets customizados para particionamento automático por odate e append em CSV
+Datasets customizados para particionamento automático por odate e append em CSV ou Parquet
 """
+import io
+import os
+import csv
+import fcntl
+import random
+import re
+import json
+import hashlib
+import time
+import uuid
 import logging
-from typing import Any, Dict, List, Optional
-from kedro.io import AbstractDataset
+import posixpath
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from kedro.io import AbstractDataset, DatasetError
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import fsspec
+from fsspec.utils import infer_compression
 
 
 logger = logging.getLogger(__name__)
 
+NEWS_KEYS: List[str] = ['dat_ref', 'fonte', 'titulo']
+
+DateRange = Tuple[Optional[str], Optional[str]]
+
+
+def _append_dedup(existing: pd.DataFrame, data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Concatena `data` ao histórico e mantém a linha mais recente de cada chave
+
+    A chave é `dat_ref`, ou `dat_ref/fonte/titulo` para notícias (tabelas com `fonte`).
+    """
+    return _keep_latest([existing, data])
+
+
+def _keep_latest(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatena os DataFrames em ordem cronológica e mantém a última linha de cada chave"""
+    if not frames:
+        return pd.DataFrame()
+    combined: pd.DataFrame = _typed_dates(pd.concat(frames, ignore_index=True))
+    if combined.empty:
+        return combined
+    keys: List[str] = NEWS_KEYS if 'fonte' in combined.columns else ['dat_ref']
+    combined = combined.sort_values(keys, ascending=False, kind='stable')
+    return combined.drop_duplicates(subset=keys, keep='last')
+
+
+def _merge_appended(current: pd.DataFrame, data: pd.DataFrame, date_range: DateRange) -> Optional[pd.DataFrame]:
+    """
+    Resultado da leitura do intervalo `date_range` após gravar `data`, a partir da leitura
+    anterior (`current`), com a regra de duplicatas do append
+
+    Returns:
+        Optional[pd.DataFrame]: `None` quando as colunas divergem (ex.: leitura com projeção).
+    """
+    if not current.empty and set(current.columns) != set(data.columns):
+        return None
+    merged = _filter_date_range(_keep_latest([current, data]), 'dat_ref', *date_range).reset_index(drop=True)
+    return merged[list(current.columns)] if not current.empty else merged
+
+
+def _typed_dates(data: pd.DataFrame) -> pd.DataFrame:
+    """Converte `dat_ref` para data (`datetime64`); o texto `YYYY-MM-DD` vem do CSV e dos arquivos antigos"""
+    if 'dat_ref' in data.columns and not pd.api.types.is_datetime64_any_dtype(data['dat_ref']):
+        data = data.assign(dat_ref=pd.to_datetime(data['dat_ref'], errors='coerce'))
+    return data
+
+
+def _fingerprint(fs: Any, paths: List[str]) -> Optional[str]:
+    """
+    Identificador do conteúdo gravado em `paths` (arquivos ou diretórios), sem ler os dados
+
+    Usa o ETag (object store) ou o tamanho e a data de modificação de cada arquivo; os
+    diretórios são listados por inteiro (uma listagem paginada no S3). `None` quando não há
+    nada gravado.
+    """
+    entries: List[str] = []
+    for path in paths:
+        fs.invalidate_cache(path)
+        try:
+            info = fs.info(path)
+        except FileNotFoundError:
+            continue
+        infos = fs.find(path, detail=True).values() if info.get('type') == 'directory' else [info]
+        for item in infos:
+            tag = item.get('ETag') or item.get('LastModified') or item.get('mtime')
+            entries.append(f"{item['name']}:{item.get('size')}:{tag}")
+    return hashlib.sha1('\n'.join(sorted(entries)).encode()).hexdigest() if entries else None
+
+
+_FILESYSTEMS: Dict[Tuple[int, str, str], Any] = {}
+
+
+def _url_to_fs(url: str, storage_options: Optional[Dict[str, Any]] = None) -> Tuple[Any, str]:
+    """
+    `fsspec.core.url_to_fs` reaproveitando a instância do sistema de arquivos
+
+    Uma instância por processo, protocolo e `storage_options` (as credenciais e a sessão do
+    S3 são criadas uma única vez por worker).
+    """
+    storage_options = storage_options or {}
+    protocol = url.rsplit('://', 1)[0] if '://' in url else 'file'
+    key = (os.getpid(), protocol, json.dumps(storage_options, sort_keys=True, default=str))
+    fs = _FILESYSTEMS.get(key)
+    if fs is None:
+        fs, path = fsspec.core.url_to_fs(url, **storage_options)
+        _FILESYSTEMS[key] = fs
+        return fs, path
+    return fs, fs._strip_protocol(url)  # pylint: disable=protected-access
+
+
+def _object_version(info: Dict[str, Any]) -> str:
+    """Versão de um objeto: VersionId ou ETag (object store), ou tamanho e data de modificação"""
+    return str(info.get('VersionId') or info.get('ETag')
+               or f"{info.get('size')}:{info.get('LastModified') or info.get('mtime') or info.get('created')}")
+
+
+class LocalCache:
+    """
+    Cache em disco, local ao worker, dos objetos lidos de um object store
+
+    Cada objeto é guardado em `directory` com o nome `<hash do caminho>-<hash da versão>`,
+    de modo que as tarefas do mesmo worker (e execuções seguintes) compartilham os
+    downloads. A validade é conferida com um único HEAD (`fs.info`): quando o ETag (ou
+    VersionId) muda, a cópia antiga é descartada e o objeto é baixado de novo. Acima de
+    `max_bytes`, as cópias usadas há mais tempo são removidas (LRU pela data de acesso).
+
+    O download é gravado em um arquivo temporário e renomeado, o que torna seguro o uso
+    do mesmo diretório por vários processos. O sistema de arquivos local não é copiado.
+    """
+
+    DEFAULT_DIR: str = os.environ.get('FACTORY_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'factory-cache'))
+    DEFAULT_MAX_BYTES: int = 2 * 1024 ** 3
+    # cópias usadas há menos tempo que isso não são removidas (outro processo pode estar lendo)
+    MIN_AGE_SECONDS: float = 60.0
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self._directory: str = directory or self.DEFAULT_DIR
+        self._max_bytes: int = self.DEFAULT_MAX_BYTES if max_bytes is None else int(max_bytes)
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'evicted': 0}
+        os.makedirs(self._directory, exist_ok=True)
+
+    def fetch(self, fs: Any, path: str) -> str:
+        """
+        Caminho local de uma cópia atual do objeto
+
+        Args:
+            fs: Sistema de arquivos do objeto.
+            path: Caminho do objeto (sem protocolo).
+
+        Returns:
+            str: Caminho da cópia local (o próprio `path` no sistema de arquivos local).
+
+        Raises:
+            FileNotFoundError: O objeto não existe.
+        """
+        if 'file' in fs.protocol:
+            return path
+
+        fs.invalidate_cache(path)
+        info = fs.info(path)
+        if info.get('type') == 'directory':
+            raise FileNotFoundError(path)
+        path_hash = hashlib.sha1(f"{fs.protocol}://{path}".encode()).hexdigest()
+        version_hash = hashlib.sha1(_object_version(info).encode()).hexdigest()[:16]
+        local_path = os.path.join(self._directory, f"{path_hash}-{version_hash}{posixpath.splitext(path)[1]}")
+
+        if os.path.exists(local_path):
+            try:
+                os.utime(local_path)
+                self.stats['hits'] += 1
+                logger.debug("Cache local: %s lido de %s", path, local_path)
+                return local_path
+            except FileNotFoundError:
+                pass  # removida por outro processo entre as duas chamadas
+
+        tmp_path = os.path.join(self._directory, f"_tmp-{uuid.uuid4().hex}")
+        try:
+            fs.get_file(path, tmp_path)
+            os.replace(tmp_path, local_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.stats['misses'] += 1
+        logger.info("Cache local: %s baixado (%d bytes)", path, os.path.getsize(local_path))
+        self._evict(keep=local_path, stale_prefix=f"{path_hash}-")
+        return local_path
+
+    def _evict(self, keep: str, stale_prefix: str) -> None:
+        """Remove as versões antigas do objeto e, acima de `max_bytes`, as cópias menos usadas"""
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self._directory):
+                if entry.name.startswith('_tmp-') or entry.path == keep:
+                    continue
+                try:
+                    if entry.name.startswith(stale_prefix):
+                        os.remove(entry.path)
+                        continue
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries) + os.path.getsize(keep)
+            cutoff = time.time() - self.MIN_AGE_SECONDS
+            for mtime, size, entry_path in sorted(entries):
+                if total <= self._max_bytes or mtime > cutoff:
+                    break
+                try:
+                    os.remove(entry_path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.stats['evicted'] += 1
+
+
+_LOCAL_CACHES: Dict[Tuple[str, Optional[int]], LocalCache] = {}
+
+
+def _cache_for(config: Optional[Dict[str, Any]]) -> Optional[LocalCache]:
+    """Instância do `LocalCache` configurada em `local_cache` (uma por diretório no processo)"""
+    if config is None or not config.get('enabled', True):
+        return None
+    key = (config.get('dir') or LocalCache.DEFAULT_DIR, config.get('max_bytes'))
+    if key not in _LOCAL_CACHES:
+        _LOCAL_CACHES[key] = LocalCache(*key)
+    return _LOCAL_CACHES[key]
+
+
+def _filter_date_range(data: pd.DataFrame, column: str, start: Optional[str], end: Optional[str]) -> pd.DataFrame:
+    """Mantém as linhas com `column` em `[start, end]` (`None`: sem limite)"""
+    if data.empty or column not in data.columns or (start is None and end is None):
+        return data
+    dates = pd.to_datetime(data[column], errors='coerce')
+    mask = pd.Series(True, index=data.index)
+    if start is not None:
+        mask &= dates >= pd.Timestamp(start)
+    if end is not None:
+        mask &= dates <= pd.Timestamp(end)
+    return data[mask].reset_index(drop=True)
+
+
+def _range_predicates(schema: Optional[pa.Schema], start: Optional[str], end: Optional[str]) -> List[Tuple[str, str, Any]]:
+    """Filtros do pyarrow para `dat_ref` em `[start, end]`, no tipo da coluna (texto `YYYY-MM-DD` ou data)"""
+    if schema is None or 'dat_ref' not in schema.names:
+        return []
+    field_type = schema.field('dat_ref').type
+    if pa.types.is_timestamp(field_type):
+        value = pd.Timestamp
+    elif pa.types.is_date(field_type):
+        value = lambda date: pd.Timestamp(date).date()  # noqa: E731
+    else:
+        value = lambda date: pd.Timestamp(date).strftime('%Y-%m-%d')  # noqa: E731
+    predicates = [('dat_ref', '>=', value(start))] if start is not None else []
+    return predicates + ([('dat_ref', '<=', value(end))] if end is not None else [])
+
+
+def _with_predicates(filters: Optional[List[Any]], predicates: List[Tuple[str, str, Any]]) -> Optional[List[Any]]:
+    """Acrescenta `predicates` aos filtros de `load_args` (conjunção simples ou DNF)"""
+    if not predicates:
+        return filters
+    if not filters:
+        return predicates
+    if isinstance(filters[0], list):
+        return [[*conjunction, *predicates] for conjunction in filters]
+    return [*filters, *predicates]
+
+
+class _WriteConflict(Exception):
+    """O objeto foi gravado por outro processo entre a leitura e a gravação condicional"""
+
+
+def _read_versioned(fs: Any, path: str) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    Conteúdo atual do objeto e a versão usada na gravação condicional
+
+    A versão é o ETag (S3) ou o hash do conteúdo (demais sistemas de arquivos); `None`
+    quando o objeto não existe. No S3, o HEAD precede o GET: se o objeto mudar entre os
+    dois, a gravação condicional falha e a tentativa é refeita.
+    """
+    fs.invalidate_cache(path)
+    try:
+        etag = fs.info(path).get('ETag') if 's3' in fs.protocol else None
+        payload = fs.cat_file(path)
+    except FileNotFoundError:
+        return None, None
+    return payload, etag or hashlib.sha1(payload).hexdigest()
+
+
+def _conditional_put(fs: Any, path: str, payload: bytes, version: Optional[str]) -> Optional[str]:
+    """
+    Grava `payload` somente se o objeto ainda estiver na versão lida (`None`: se ainda não existir)
+
+    No S3, a condição vai no próprio PUT (`If-Match` / `If-None-Match`); no disco local, a
+    comparação e o rename acontecem sob um lock (`flock`) em `<arquivo>.lock`. Nos demais
+    sistemas de arquivos, a versão é comparada logo antes da gravação, sem garantia de atomicidade.
+
+    Returns:
+        Optional[str]: Versão gravada (a mesma de `_read_versioned`), se conhecida.
+
+    Raises:
+        _WriteConflict: O objeto mudou depois da leitura.
+    """
+    if 's3' in fs.protocol:
+        condition: Dict[str, Any] = {'mode': 'create'} if version is None else {'IfMatch': version}
+        try:
+            # um único PUT (até 5 GB): o upload multipart não leva o If-Match
+            response = fs.pipe_file(path, payload, chunksize=max(len(payload), 5 * 1024 ** 2), **condition)
+        except FileExistsError as error_conflict:
+            raise _WriteConflict(path) from error_conflict
+        except OSError as error_put:
+            code = getattr(error_put.__cause__, 'response', {}).get('Error', {}).get('Code')
+            if code in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                raise _WriteConflict(path) from error_put
+            raise
+        return response.get('ETag') if isinstance(response, dict) else None
+
+    if 'file' in fs.protocol:
+        fs.makedirs(posixpath.dirname(path), exist_ok=True)
+        with open(f"{path}.lock", 'a', encoding='utf-8') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)  # liberado ao fechar o arquivo
+            if _read_versioned(fs, path)[1] != version:
+                raise _WriteConflict(path)
+            tmp_path = posixpath.join(posixpath.dirname(path), f"_tmp-{uuid.uuid4().hex}")
+            with open(tmp_path, 'wb') as tmp_file:
+                tmp_file.write(payload)
+            os.replace(tmp_path, path)
+        return hashlib.sha1(payload).hexdigest()
+
+    if _read_versioned(fs, path)[1] != version:
+        raise _WriteConflict(path)
+    fs.pipe_file(path, payload)
+    return hashlib.sha1(payload).hexdigest()
+
+
+KeyIndex = Tuple[np.ndarray, np.ndarray]
+
+
+def _key_hashes(data: pd.DataFrame, keys: List[str]) -> np.ndarray:
+    """Hash de 64 bits das chaves de duplicata de cada linha (`dat_ref` como data, as demais como texto)"""
+    frame = _typed_dates(data[keys])
+    frame = frame.assign(**{key: frame[key].fillna('').astype(str) for key in keys if key != 'dat_ref'})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def _row_hashes(data: pd.DataFrame) -> np.ndarray:
+    """Hash de 64 bits do conteúdo de cada linha (colunas em ordem alfabética, `dat_ref` como data, as demais como texto)"""
+    frame = _typed_dates(data[sorted(data.columns)])
+    frame = frame.assign(**{column: frame[column].astype(object).where(frame[column].notna(), '').astype(str)
+                            for column in frame.columns if column != 'dat_ref'})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def _build_key_index(data: pd.DataFrame, keys: List[str]) -> KeyIndex:
+    """Índice de `data` (já sem duplicatas): hashes das chaves ordenados e o hash do conteúdo de cada linha"""
+    if data.empty:
+        return np.array([], dtype=np.uint64), np.array([], dtype=np.uint64)
+    hashes = _key_hashes(data, keys)
+    order = np.argsort(hashes, kind='stable')
+    return hashes[order], _row_hashes(data)[order]
+
+
+def _contains(index: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+    """Máscara dos `hashes` presentes no índice ordenado (busca binária, O(novas linhas × log n))"""
+    if not len(index):
+        return np.zeros(len(hashes), dtype=bool)
+    positions = np.searchsorted(index, hashes).clip(max=len(index) - 1)
+    return index[positions] == hashes
+
+
+def _unseen(data: pd.DataFrame, keys: List[str], index: KeyIndex) -> Tuple[pd.DataFrame, bool, KeyIndex]:
+    """
+    Linhas de `data` (a mais recente de cada chave) que ainda não estão gravadas como estão
+
+    Uma linha entra se a chave não está no índice ou se o conteúdo difere do indexado (vale
+    a mais recente, como em `_keep_latest`); linhas idênticas às já gravadas são descartadas.
+
+    Returns:
+        Tuple: As linhas, se alguma delas substitui uma linha já gravada e o índice atualizado.
+    """
+    key_index, row_index = index
+    data = _keep_latest([data])
+    hashes, rows = _key_hashes(data, keys), _row_hashes(data)
+    seen = _contains(key_index, hashes)
+    positions = np.searchsorted(key_index, hashes)
+    changed = np.zeros(len(hashes), dtype=bool)
+    if seen.any():
+        changed[seen] = row_index[positions[seen]] != rows[seen]
+    row_index = row_index.copy()
+    row_index[positions[changed]] = rows[changed]
+
+    order = np.argsort(hashes[~seen], kind='stable')
+    new_keys, new_rows = hashes[~seen][order], rows[~seen][order]
+    at = np.searchsorted(key_index, new_keys)
+    index = (np.insert(key_index, at, new_keys), np.insert(row_index, at, new_rows))
+    return data[~seen | changed], bool(changed.any()), index
+
+
+def _prepend_rows(payload: Optional[bytes], rows: pd.DataFrame, save_kwargs: Dict[str, Any]) -> Optional[bytes]:
+    """
+    CSV com `rows` acrescentadas logo após o cabeçalho de `payload`, sem reler o histórico
+
+    As linhas entram em ordem decrescente de `dat_ref`, e só quando nenhuma é anterior à
+    primeira linha do arquivo: a leitura por intervalo (`_scan_range`) depende da ordem
+    decrescente para parar cedo.
+
+    Returns:
+        Optional[bytes]: `None` quando as colunas de `rows` não são as do arquivo ou alguma
+        linha é anterior à primeira do arquivo (a gravação faz a mesclagem completa).
+    """
+    rows = rows.sort_values('dat_ref', ascending=False, kind='stable')
+    if not payload:
+        buffer = io.BytesIO()
+        rows.to_csv(buffer, index=False, **save_kwargs)
+        return buffer.getvalue()
+
+    encoding = save_kwargs.get('encoding') or 'utf-8'
+    header, _, body = payload.partition(b'\n')
+    columns = next(csv.reader([header.decode(encoding).rstrip('\r')]))
+    if sorted(columns) != sorted(rows.columns):
+        return None
+    first = next(csv.reader([body.partition(b'\n')[0].decode(encoding).rstrip('\r')]), None)
+    if first and pd.to_datetime(rows['dat_ref']).min() < pd.Timestamp(first[columns.index('dat_ref')]):
+        return None
+    buffer = io.BytesIO()
+    rows[columns].to_csv(buffer, index=False, header=False, **save_kwargs)
+    return header + b'\n' + buffer.getvalue() + body
+
+
+def _read_key_index(fs: Any, path: str) -> Tuple[Optional[KeyIndex], Optional[str]]:
+    """Índice de chaves (`<filepath>.keys`) e a versão dos dados que ele cobre (`None` se não existir ou for do formato antigo)"""
+    fs.invalidate_cache(path)
+    try:
+        table = pq.read_table(pa.BufferReader(fs.cat_file(path)))
+    except FileNotFoundError:
+        return None, None
+    version = (table.schema.metadata or {}).get(b'version')
+    if 'row' not in table.column_names:
+        return None, None
+    return (table.column('key').to_numpy(), table.column('row').to_numpy()), version.decode() if version else None
+
+
+def _write_key_index(fs: Any, path: str, index: KeyIndex, version: Optional[str]) -> None:
+    """Grava o índice com a versão dos dados gravados (sem versão, é reconstruído na próxima gravação)"""
+    table = pa.table({'key': pa.array(index[0], type=pa.uint64()), 'row': pa.array(index[1], type=pa.uint64())})
+    table = table.replace_schema_metadata({'version': version or ''})
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression='zstd')
+    AppendParquetDataset._put_object(fs, path, buffer.getvalue())
+
+
+_COMPACTION_LOCKS: Dict[str, threading.Lock] = {}
+_COMPACTION_THREADS: Dict[str, threading.Thread] = {}
+_COMPACTION_REGISTRY_LOCK = threading.Lock()
+
+
+def _compaction_lock(delta_dir: str) -> threading.Lock:
+    """Lock do processo para a compactação de um log de deltas (compartilhado pelas instâncias do mesmo caminho)"""
+    with _COMPACTION_REGISTRY_LOCK:
+        return _COMPACTION_LOCKS.setdefault(delta_dir, threading.Lock())
+
+
+def _join_compactions(prefix: str) -> None:
+    """Aguarda as compactações em segundo plano dos logs de deltas sob `prefix`"""
+    with _COMPACTION_REGISTRY_LOCK:
+        threads = [thread for delta_dir, thread in _COMPACTION_THREADS.items() if delta_dir.startswith(prefix)]
+    for thread in threads:
+        thread.join()
+    with _COMPACTION_REGISTRY_LOCK:
+        for delta_dir in [delta_dir for delta_dir, thread in _COMPACTION_THREADS.items() if not thread.is_alive()]:
+            del _COMPACTION_THREADS[delta_dir]
+
 
 class AppendCSVDataset(AbstractDataset):
     """
     Dataset que faz append e remove duplicatas por dat_ref, mantendo o mais recente
+
+    `dat_ref` é lido como data e gravado como texto `YYYY-MM-DD`. Com `set_date_range`, a leitura percorre o CSV em blocos de `SCAN_CHUNK_ROWS` linhas e
+    para ao passar do início do intervalo (o arquivo é gravado em ordem decrescente de dat_ref).
+
+    Com `local_cache` (`dir`, `max_bytes`), o arquivo remoto é lido de uma cópia local ao
+    worker (`LocalCache`), validada por um HEAD a cada leitura.
+
+    A gravação é otimista: lê o arquivo e sua versão, mescla as linhas e grava somente se
+    a versão não mudou (`_conditional_put`); em conflito com outra execução, relê, mescla
+    de novo e repete, até `MAX_WRITE_ATTEMPTS` vezes. Execuções paralelas (backfill de
+    vários odates) não perdem as linhas umas das outras.
+
+    Com `key_index`, nas notícias (tabelas com `fonte`) a gravação consulta o índice de
+    chaves `<filepath>.keys` (hashes de 64 bits de `dat_ref/fonte/titulo` e do conteúdo de
+    cada linha): linhas idênticas às gravadas são descartadas e as de chave nova vão para o
+    início do arquivo, sem reler nem ordenar o histórico. Se uma notícia já gravada mudou,
+    ou se alguma linha nova é anterior à primeira do arquivo (o que quebraria a ordem
+    decrescente), a gravação faz a mesclagem completa, e continua valendo a versão mais recente. O índice
+    guarda a versão do arquivo que cobre e é reconstruído quando o arquivo muda por outro
+    caminho. O arquivo continua sendo lido e regravado por inteiro (object stores não têm
+    append): o índice poupa CPU, não tráfego; gravações O(linhas novas) no S3 são as do
+    `AppendParquetDataset` com `delta_log`.
     """
 
+    SCAN_CHUNK_ROWS: int = 50_000
+    MAX_WRITE_ATTEMPTS: int = 10
+
     def __init__(self, filepath: str, load_args: Optional[Dict[str, Any]] = None, save_args: Optional[Dict[str, Any]] = None,
-                 credentials: Optional[Dict[str, Any]] = None, fs_args: Optional[Dict[str, Any]] = None):
+                 credentials: Optional[Dict[str, Any]] = None, fs_args: Optional[Dict[str, Any]] = None,
+                 local_cache: Optional[Dict[str, Any]] = None, key_index: bool = False):
         self._filepath: str = filepath
         self._load_args: Dict[str, Any] = load_args or {}
         self._save_args: Dict[str, Any] = save_args or {}
+        self._local_cache: Optional[Dict[str, Any]] = local_cache
+        self._key_index: bool = key_index
+        self._date_range: DateRange = (None, None)
 
         self._storage_options: Dict[str, Any] = {}
         if credentials:
@@ -28,33 +527,137 @@ class AppendCSVDataset(AbstractDataset):
         if fs_args:
             self._storage_options.update(fs_args)
 
+    def set_date_range(self, start: Optional[str] = None, end: Optional[str] = None) -> None:
+        """Restringe os próximos `load` ao intervalo `[start, end]` de dat_ref (`None`: sem limite)"""
+        self._date_range = (start, end)
+
+    @property
+    def date_range(self) -> DateRange:
+        return self._date_range
+
+    def merge_appended(self, current: pd.DataFrame, data: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Resultado de `load` após gravar `data`, sem reler: `current` é o `load` anterior"""
+        return _merge_appended(current, data, self._date_range)
+
+    def fingerprint(self) -> Optional[str]:
+        """Identificador do conteúdo gravado (ETag ou tamanho e data de modificação)"""
+        fs, path = _url_to_fs(self._filepath, self._storage_options)
+        return _fingerprint(fs, [path])
+
     def _load(self) -> pd.DataFrame:
-        if self._exists():
-            load_kwargs = dict(self._load_args)
-            load_kwargs.setdefault('storage_options', self._storage_options)
-            return pd.read_csv(self._filepath, **load_kwargs)
+        if self._date_range != (None, None):
+            return self._scan_range(*self._date_range)
+        return self._read()
+
+    def _source(self, **defaults: Any) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Arquivo lido e argumentos do `read_csv`: a cópia do `local_cache` ou o próprio `filepath`
+
+        Returns:
+            Optional[Tuple[str, Dict[str, Any]]]: `None` quando o arquivo não existe.
+        """
+        load_kwargs = {**defaults, **self._load_args}
+        cache = _cache_for(self._local_cache)
+        if cache is not None:
+            try:
+                local_path = cache.fetch(*_url_to_fs(self._filepath, self._storage_options))
+            except FileNotFoundError:
+                return None
+            load_kwargs.pop('storage_options', None)
+            return local_path, load_kwargs
+
+        if not self._exists():
+            return None
+        load_kwargs.setdefault('storage_options', self._storage_options)
+        return self._filepath, load_kwargs
+
+    def _read(self) -> pd.DataFrame:
+        source = self._source()
+        if source is not None:
+            filepath, load_kwargs = source
+            return _typed_dates(pd.read_csv(filepath, **load_kwargs))
 
         return pd.DataFrame()
 
+    def _scan_range(self, start: Optional[str], end: Optional[str]) -> pd.DataFrame:
+        source = self._source(chunksize=self.SCAN_CHUNK_ROWS)
+        if source is None:
+            return pd.DataFrame()
+        filepath, load_kwargs = source
+
+        frames: List[pd.DataFrame] = []
+        descending, previous, chunks = True, None, 0
+        with pd.read_csv(filepath, **load_kwargs) as reader:
+            for raw_chunk in reader:
+                chunks += 1
+                chunk = _typed_dates(raw_chunk)
+                frames.append(_filter_date_range(chunk, 'dat_ref', start, end))
+                if start is None or 'dat_ref' not in chunk.columns:
+                    continue
+                dates = chunk['dat_ref']
+                # a parada antecipada só vale enquanto o arquivo estiver em ordem decrescente
+                descending = descending and dates.is_monotonic_decreasing and (previous is None or dates.iloc[0] <= previous)
+                previous = dates.iloc[-1]
+                if descending and previous < pd.Timestamp(start):
+                    break
+        logger.info("%s: %d blocos lidos para o intervalo %s a %s", self._filepath, chunks, start, end)
+        frames = [frame for frame in frames if not frame.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
     def _save(self, data):
-        existing: pd.DataFrame = self._load()
-        combined: pd.DataFrame = pd.concat([existing, data], ignore_index=True)
+        fs, path = _url_to_fs(self._filepath, self._storage_options)
+        load_kwargs = {key: value for key, value in self._load_args.items() if key not in ('storage_options', 'chunksize')}
+        load_kwargs.setdefault('compression', infer_compression(path))
+        save_kwargs = {key: value for key, value in self._save_args.items() if key != 'storage_options'}
+        save_kwargs.setdefault('date_format', '%Y-%m-%d')
+        save_kwargs.setdefault('compression', infer_compression(path))
+        # o acréscimo ao início do arquivo só vale para CSV sem compressão
+        use_index = self._key_index and 'fonte' in data.columns and save_kwargs['compression'] is None
 
-        if 'fonte' not in combined.columns:
-            combined = combined.sort_values('dat_ref', ascending=False)
-            combined = combined.drop_duplicates(subset=['dat_ref'], keep='last')
-        else:
-            keys_order_subset: List[str] = ['dat_ref', 'fonte', 'titulo']
-            combined = combined.sort_values(keys_order_subset, ascending=False)
-            combined = combined.drop_duplicates(subset=keys_order_subset, keep='last')
+        for attempt in range(1, self.MAX_WRITE_ATTEMPTS + 1):
+            payload, version = _read_versioned(fs, path)
+            content, index = None, None
+            if use_index:
+                data_unseen, replaces, index = _unseen(data, NEWS_KEYS, self._current_index(fs, path, payload, version, load_kwargs))
+                if data_unseen.empty:
+                    logger.info("%s: nenhuma linha nova (índice de chaves)", self._filepath)
+                    return
+                if not replaces:
+                    content = _prepend_rows(payload, data_unseen, save_kwargs)
+            if content is None:
+                existing = _typed_dates(pd.read_csv(io.BytesIO(payload), **load_kwargs)) if payload else pd.DataFrame()
+                combined = _append_dedup(existing, data)
+                buffer = io.BytesIO()
+                combined.to_csv(buffer, index=False, **save_kwargs)
+                content = buffer.getvalue()
+                if use_index:
+                    index = _build_key_index(combined, NEWS_KEYS)
+            try:
+                written = _conditional_put(fs, path, content, version)
+            except _WriteConflict:
+                logger.info("Gravação concorrente em %s (tentativa %d de %d): relendo e mesclando",
+                            self._filepath, attempt, self.MAX_WRITE_ATTEMPTS)
+                time.sleep(random.uniform(0, min(2.0, 0.05 * 2 ** attempt)))
+                continue
+            if index is not None:
+                _write_key_index(fs, f"{path}.keys", index, written)
+            return
+        raise DatasetError(f"Gravação de {self._filepath} não concluída: {self.MAX_WRITE_ATTEMPTS} conflitos com gravações concorrentes")
 
-        save_kwargs = dict(self._save_args)
-        save_kwargs.setdefault('storage_options', self._storage_options)
-        combined.to_csv(self._filepath, index=False, **save_kwargs)
+    def _current_index(self, fs: Any, path: str, payload: Optional[bytes], version: Optional[str],
+                       load_kwargs: Dict[str, Any]) -> KeyIndex:
+        """Índice de chaves da versão lida do arquivo, reconstruído a partir dele se estiver desatualizado"""
+        index, index_version = _read_key_index(fs, f"{path}.keys")
+        if index is not None and index_version is not None and index_version == version:
+            return index
+        if not payload:
+            return _build_key_index(pd.DataFrame(), NEWS_KEYS)
+        logger.info("%s: índice de chaves desatualizado, reconstruindo", self._filepath)
+        return _build_key_index(_keep_latest([pd.read_csv(io.BytesIO(payload), **load_kwargs)]), NEWS_KEYS)
 
     def _exists(self) -> bool:
         storage_options: Dict[str, Any] = self._load_args.get('storage_options', {}) or self._storage_options or {}
-        fs, path = fsspec.core.url_to_fs(self._filepath, **storage_options)
+        fs, path = _url_to_fs(self._filepath, storage_options)
         try:
             exist_file = fs.exists(path)
         except Exception as error_file_empty:
@@ -65,3 +668,635 @@ class AppendCSVDataset(AbstractDataset):
 
     def _describe(self) -> Dict[str, Any]:
         return {'filepath': self._filepath}
+
+
+class AppendParquetDataset(AbstractDataset):
+    """
+    Dataset Parquet com a mesma semântica de append do `AppendCSVDataset`
+
+    Mantém a linha mais recente por `dat_ref` (ou `dat_ref/fonte/titulo` para notícias),
+    gravando Parquet tipado (`dat_ref` como timestamp) e comprimido, com estatísticas por
+    row group, ordenado por `dat_ref` decrescente. A leitura aceita projeção de colunas (`load_args.columns`) e
+    filtros do pyarrow (`load_args.filters`).
+
+    Enquanto o Parquet não existir, o histórico é lido do CSV em `legacy_filepath`; a
+    primeira gravação (ou `migrate`) converte esse histórico.
+
+    Sem `delta_log`, a gravação é otimista como a do `AppendCSVDataset`: lê o Parquet e
+    sua versão, mescla e grava somente se a versão não mudou (`_conditional_put`),
+    repetindo em conflito até `MAX_WRITE_ATTEMPTS` vezes. Com `key_index`, uma gravação
+    de notícias sem linhas novas ou alteradas não regrava o arquivo.
+
+    Com `delta_log`, cada gravação cria um objeto imutável `delta-<instante>-<id>.parquet`
+    em `<filepath>.deltas/`, sem ler o histórico. A leitura aplica à base os deltas mais
+    novos que ela, na ordem dos nomes, com a mesma regra de duplicatas. A compactação
+    (`compact`) consolida os deltas em uma nova base imutável `base-<último delta>.<id>.parquet`
+    quando `max_deltas` ou `max_bytes` é atingido; vale a base de maior marca, de modo que
+    compactações concorrentes não se sobrepõem, e só são removidos os deltas já incluídos
+    nela. Sem base compactada, a base é o arquivo em `filepath` (ou o CSV legado). No
+    processo, cada log tem uma compactação por vez (lock por caminho, compartilhado pelas
+    instâncias que o `DatePartitionedDataset` cria a cada gravação); com `background`, ela
+    roda em uma thread daemon que `release` aguarda.
+
+    `set_date_range` acrescenta aos filtros da leitura o intervalo de `dat_ref`, de modo
+    que os row groups fora dele são descartados pelas estatísticas do Parquet.
+
+    Com `local_cache`, os objetos remotos (o Parquet, as bases e os deltas) são lidos de
+    cópias locais ao worker (`LocalCache`).
+
+    Com `key_index` e `delta_log`, o delta das notícias (tabelas com `fonte`) leva só as
+    linhas ausentes do índice `<filepath>.keys` ou com conteúdo diferente do indexado
+    (nenhum delta quando todas já estão gravadas como estão); a leitura resolve as
+    duplicatas mantendo a mais recente. O índice guarda a impressão digital do log que
+    cobre e é reconstruído a partir do log quando ele muda por outro caminho (compactação,
+    outra execução).
+    """
+
+    MAX_WRITE_ATTEMPTS: int = 10
+    DEFAULT_SAVE_ARGS: Dict[str, Any] = {'compression': 'zstd', 'index': False, 'row_group_size': 100_000}
+    DEFAULT_DELTA_LOG: Dict[str, Any] = {'enabled': True, 'max_deltas': 32, 'max_bytes': 64 * 1024 * 1024,
+                                         'grace_seconds': 60, 'background': True}
+
+    def __init__(self, filepath: str, load_args: Optional[Dict[str, Any]] = None, save_args: Optional[Dict[str, Any]] = None,
+                 credentials: Optional[Dict[str, Any]] = None, fs_args: Optional[Dict[str, Any]] = None,
+                 legacy_filepath: Optional[str] = None, delta_log: Optional[Dict[str, Any]] = None,
+                 local_cache: Optional[Dict[str, Any]] = None, key_index: bool = False):
+        self._filepath: str = filepath
+        self._legacy_filepath: Optional[str] = legacy_filepath
+        self._load_args: Dict[str, Any] = load_args or {}
+        self._local_cache: Optional[Dict[str, Any]] = local_cache
+        self._key_index: bool = key_index
+        self._save_args: Dict[str, Any] = {**self.DEFAULT_SAVE_ARGS, **(save_args or {})}
+        self._delta_log: Optional[Dict[str, Any]] = {**self.DEFAULT_DELTA_LOG, **delta_log} if delta_log is not None else None
+        if self._delta_log is not None and not self._delta_log['enabled']:
+            self._delta_log = None
+        self._delta_dir: str = self._filepath.rstrip('/') + '.deltas'
+        self._date_range: DateRange = (None, None)
+
+        self._storage_options: Dict[str, Any] = {}
+        if credentials:
+            self._storage_options.update(credentials)
+        if fs_args:
+            self._storage_options.update(fs_args)
+
+    def set_date_range(self, start: Optional[str] = None, end: Optional[str] = None) -> None:
+        """Restringe os próximos `load` ao intervalo `[start, end]` de dat_ref (`None`: sem limite)"""
+        self._date_range = (start, end)
+
+    @property
+    def date_range(self) -> DateRange:
+        return self._date_range
+
+    def merge_appended(self, current: pd.DataFrame, data: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Resultado de `load` após gravar `data`, sem reler: `current` é o `load` anterior"""
+        return _merge_appended(current, data, self._date_range)
+
+    def fingerprint(self) -> Optional[str]:
+        """Identificador do conteúdo gravado: Parquet, log de deltas e CSV legado"""
+        fs, path = _url_to_fs(self._filepath, self._storage_options)
+        paths = [path, _url_to_fs(self._delta_dir, self._storage_options)[1]]
+        if self._legacy_filepath:
+            paths.append(_url_to_fs(self._legacy_filepath, self._storage_options)[1])
+        return _fingerprint(fs, paths)
+
+    def _range_filters(self, schema: Optional[pa.Schema]) -> Optional[List[Any]]:
+        return _with_predicates(self._load_args.get('filters'), _range_predicates(schema, *self._date_range))
+
+    def _load(self) -> pd.DataFrame:
+        if self._delta_log is not None:
+            return self._load_delta_log()
+
+        if self._path_exists(self._filepath):
+            fs, path = _url_to_fs(self._filepath, self._storage_options)
+            return _typed_dates(self._read_object(fs, path, self._load_args.get('columns')))
+
+        return self._project(_filter_date_range(_typed_dates(self._load_legacy()), 'dat_ref', *self._date_range))
+
+    def _local(self, fs: Any, object_path: str) -> Tuple[Any, str]:
+        """Sistema de arquivos e caminho de leitura de um objeto: a cópia do `local_cache`, se configurado"""
+        cache = _cache_for(self._local_cache)
+        if cache is None:
+            return fs, object_path
+        return None, cache.fetch(fs, object_path)
+
+    def _read_object(self, fs: Any, object_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Lê um Parquet com os filtros de `load_args` e do intervalo, no tipo de `dat_ref` do próprio arquivo"""
+        fs, object_path = self._local(fs, object_path)
+        load_kwargs = {key: value for key, value in self._load_args.items() if key not in ('columns', 'storage_options')}
+        if self._date_range != (None, None):
+            # os arquivos anteriores à tipagem guardam dat_ref como texto
+            load_kwargs['filters'] = self._range_filters(pq.read_schema(object_path, filesystem=fs))
+        return pd.read_parquet(object_path, engine='pyarrow', filesystem=fs, columns=columns, **load_kwargs)
+
+    def _project(self, data: pd.DataFrame) -> pd.DataFrame:
+        columns = self._load_args.get('columns')
+        return data[[col for col in columns if col in data.columns]] if columns and not data.empty else data
+
+    def _load_history(self) -> pd.DataFrame:
+        """Histórico completo (todas as colunas) usado no append"""
+        if self._path_exists(self._filepath):
+            return pd.read_parquet(self._filepath, engine='pyarrow', storage_options=self._storage_options)
+        return self._load_legacy()
+
+    def _load_legacy(self) -> pd.DataFrame:
+        if self._legacy_filepath and self._path_exists(self._legacy_filepath):
+            logger.info("Parquet ainda não existe, lendo o histórico do CSV: %s", self._legacy_filepath)
+            return pd.read_csv(self._legacy_filepath, storage_options=self._storage_options)
+        return pd.DataFrame()
+
+    def _save(self, data: pd.DataFrame) -> None:
+        if self._delta_log is not None:
+            self._save_delta(data)
+            return
+
+        fs, path = _url_to_fs(self._filepath, self._storage_options)
+        use_index = self._key_index and 'fonte' in data.columns
+        for attempt in range(1, self.MAX_WRITE_ATTEMPTS + 1):
+            payload, version = _read_versioned(fs, path)
+            if use_index:
+                index, index_version = _read_key_index(fs, self._keys_path())
+                if index is not None and index_version is not None and index_version == version \
+                        and _unseen(data, NEWS_KEYS, index)[0].empty:
+                    logger.info("%s: nenhuma linha nova (índice de chaves)", self._filepath)
+                    return
+            history = pd.read_parquet(io.BytesIO(payload), engine='pyarrow') if payload else self._load_legacy()
+            combined = _append_dedup(history, data)
+            try:
+                written = _conditional_put(fs, path, self._serialize(combined), version)
+            except _WriteConflict:
+                logger.info("Gravação concorrente em %s (tentativa %d de %d): relendo e mesclando",
+                            self._filepath, attempt, self.MAX_WRITE_ATTEMPTS)
+                time.sleep(random.uniform(0, min(2.0, 0.05 * 2 ** attempt)))
+                continue
+            if use_index:
+                _write_key_index(fs, self._keys_path(), _build_key_index(combined, NEWS_KEYS), written)
+            return
+        raise DatasetError(f"Gravação de {self._filepath} não concluída: {self.MAX_WRITE_ATTEMPTS} conflitos com gravações concorrentes")
+
+    def _fs(self) -> Tuple[Any, str]:
+        """Sistema de arquivos e caminho (sem protocolo) do diretório de deltas"""
+        return _url_to_fs(self._delta_dir, self._storage_options)
+
+    def _serialize(self, data: pd.DataFrame) -> bytes:
+        save_kwargs = {key: value for key, value in self._save_args.items() if key != 'storage_options'}
+        buffer = io.BytesIO()
+        data.reset_index(drop=True).to_parquet(buffer, engine='pyarrow', **save_kwargs)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _put_object(fs: Any, path: str, payload: bytes) -> int:
+        """Grava um objeto imutável; no disco local, via arquivo temporário e rename"""
+        if 'file' in fs.protocol:
+            fs.makedirs(posixpath.dirname(path), exist_ok=True)
+            tmp_path = posixpath.join(posixpath.dirname(path), f"_tmp-{uuid.uuid4().hex}")
+            fs.pipe_file(tmp_path, payload)
+            fs.mv(tmp_path, path)
+        else:
+            fs.pipe_file(path, payload)  # PUT em object store é atômico
+        return len(payload)
+
+    def _list_log(self, fs: Any, path: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Lista o diretório de deltas
+
+        Returns:
+            Tuple: Base compactada vigente (ou `None`), deltas mais novos que ela e bases antigas.
+        """
+        try:
+            entries = fs.ls(path, detail=True, refresh=True)
+        except FileNotFoundError:
+            return None, [], []
+
+        objects = sorted(({'name': posixpath.basename(entry['name'].rstrip('/')), 'path': entry['name'],
+                           'size': entry.get('size') or 0} for entry in entries), key=lambda item: item['name'])
+        bases = [item for item in objects if item['name'].startswith('base-') and item['name'].endswith('.parquet')]
+        base = bases[-1] if bases else None
+        mark = _log_mark(base['name']) if base else ''
+        deltas = [item for item in objects
+                  if item['name'].startswith('delta-') and item['name'].endswith('.parquet') and _log_mark(item['name']) > mark]
+        return base, deltas, bases[:-1]
+
+    def _read_log(self, fs: Any, path: str,
+                  columns: Optional[List[str]] = None) -> Tuple[pd.DataFrame, Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Lê a base e os deltas pendentes e aplica a regra de duplicatas"""
+        for attempt in range(3):
+            base, deltas, _ = self._list_log(fs, path)
+            try:
+                if base is not None:
+                    frames = [self._read_object(fs, base['path'], columns)]
+                elif self._path_exists(self._filepath):
+                    frames = [self._read_object(fs, _url_to_fs(self._filepath, self._storage_options)[1], columns)]
+                else:
+                    frames = [self._load_legacy()]
+                frames += [self._read_object(fs, delta['path'], columns) for delta in deltas]
+            except FileNotFoundError:
+                # uma compactação concorrente removeu objetos já consolidados: lista de novo
+                logger.info("Log de deltas alterado durante a leitura de %s (tentativa %d)", self._filepath, attempt + 1)
+                continue
+            return _keep_latest([frame for frame in frames if not frame.empty]), base, deltas
+        raise FileNotFoundError(f"Log de deltas instável durante a leitura: {self._delta_dir}")
+
+    def _load_delta_log(self) -> pd.DataFrame:
+        fs, path = self._fs()
+        columns = self._load_args.get('columns')
+        if columns:
+            # as chaves de duplicata são lidas junto com a projeção e descartadas depois
+            base, deltas, _ = self._list_log(fs, path)
+            first = base or (deltas[0] if deltas else None)
+            names: List[str] = []
+            if first:
+                schema_fs, schema_path = self._local(fs, first['path'])
+                names = pq.read_schema(schema_path, filesystem=schema_fs).names
+            keys = NEWS_KEYS if 'fonte' in names else ['dat_ref']
+            columns = list(dict.fromkeys([*keys, *columns])) if first else None
+        data, _, _ = self._read_log(fs, path, columns)
+        # a base ainda pode ser o CSV legado, lido sem os filtros do log
+        return self._project(_filter_date_range(data, 'dat_ref', *self._date_range))
+
+    def _save_delta(self, data: pd.DataFrame) -> None:
+        fs, path = self._fs()
+        data = _keep_latest([data])
+        index: Optional[KeyIndex] = None
+        if self._key_index and 'fonte' in data.columns:
+            try:
+                data, _, index = _unseen(data, NEWS_KEYS, self._log_index(fs, path))
+            except FileNotFoundError:
+                logger.info("Log de deltas alterado durante a leitura do índice de %s", self._filepath)
+            if data.empty:
+                logger.info("%s: nenhuma linha nova (índice de chaves)", self._filepath)
+                return
+        payload = self._serialize(data)
+        # o instante do nome é tomado logo antes do upload: `grace_seconds` cobre só a gravação
+        name = f"delta-{time.time_ns():020d}-{uuid.uuid4().hex[:12]}.parquet"
+        size = self._put_object(fs, posixpath.join(path, name), payload)
+        logger.info("Delta gravado em %s: %d registros, %d bytes", self._delta_dir, len(data), size)
+        if index is not None:
+            _write_key_index(fs, self._keys_path(), index, self._log_version(fs, path))
+
+        _, deltas, _ = self._list_log(fs, path)
+        if len(deltas) >= self._delta_log['max_deltas'] or sum(delta['size'] for delta in deltas) >= self._delta_log['max_bytes']:
+            if self._delta_log['background'] and not _compaction_lock(self._delta_dir).locked():
+                # daemon: uma compactação interrompida não altera o log (a base é imutável e os
+                # deltas só são removidos depois dela); `release` aguarda as pendentes
+                thread = threading.Thread(target=self.compact, name=f"compact-{posixpath.basename(path)}", daemon=True)
+                with _COMPACTION_REGISTRY_LOCK:
+                    _COMPACTION_THREADS[self._delta_dir] = thread
+                thread.start()
+            elif not self._delta_log['background']:
+                self.compact()
+
+    def _keys_path(self) -> str:
+        return _url_to_fs(f"{self._filepath}.keys", self._storage_options)[1]
+
+    def _log_version(self, fs: Any, path: str) -> Optional[str]:
+        return _fingerprint(fs, [_url_to_fs(self._filepath, self._storage_options)[1], path])
+
+    def _log_index(self, fs: Any, path: str) -> KeyIndex:
+        """Índice de chaves do log, reconstruído a partir da base e dos deltas se estiver desatualizado"""
+        index, version = _read_key_index(fs, self._keys_path())
+        if index is not None and version is not None and version == self._log_version(fs, path):
+            return index
+
+        logger.info("%s: índice de chaves desatualizado, reconstruindo", self._filepath)
+        base, deltas, _ = self._list_log(fs, path)
+        objects = [item['path'] for item in ([base] if base is not None else []) + deltas]
+        if base is None and self._path_exists(self._filepath):
+            objects.insert(0, _url_to_fs(self._filepath, self._storage_options)[1])
+        frames = [pq.read_table(item, filesystem=fs).to_pandas() for item in objects]
+        return _build_key_index(_keep_latest(frames), NEWS_KEYS)
+
+    def compact(self) -> int:
+        """
+        Consolida na nova base os deltas gravados há mais de `grace_seconds`
+
+        `grace_seconds` deve cobrir o tempo de upload de um delta mais a diferença de
+        relógio entre os workers: um delta que aparece depois de uma compactação com marca
+        maior que a dele não seria aplicado.
+
+        A nova base é um objeto imutável cuja marca é o último delta incluído. Depois de
+        gravada, são removidos os deltas e as bases cobertos pela base vigente (a de maior
+        marca), o que torna seguras compactações concorrentes.
+
+        Returns:
+            int: Deltas consolidados (0 quando não há o que compactar ou outra compactação está em curso).
+        """
+        lock = _compaction_lock(self._delta_dir)
+        if self._delta_log is None or not lock.acquire(blocking=False):
+            return 0
+        try:
+            fs, path = self._fs()
+            cutoff = time.time_ns() - int(self._delta_log['grace_seconds'] * 1e9)
+            base, deltas, _ = self._list_log(fs, path)
+            folded = [delta for delta in deltas if int(_log_mark(delta['name']).split('-')[0]) <= cutoff]
+            if not folded:
+                return 0
+
+            frames = [pd.read_parquet(base['path'], engine='pyarrow', filesystem=fs)] if base is not None else [self._load_history()]
+            frames += [pd.read_parquet(delta['path'], engine='pyarrow', filesystem=fs) for delta in folded]
+            compacted = _keep_latest([frame for frame in frames if not frame.empty])
+            name = f"base-{_log_mark(folded[-1]['name'])}.{uuid.uuid4().hex[:12]}.parquet"  # nunca sobrescreve outra base
+            self._put_object(fs, posixpath.join(path, name), self._serialize(compacted))
+            logger.info("Compactação de %s: %d deltas em %s (%d registros)", self._delta_dir, len(folded), name, len(compacted))
+
+            self._remove_covered(fs, path)
+            return len(folded)
+        except FileNotFoundError as error_compaction:
+            logger.info("Compactação de %s abortada (log alterado por outra compactação): %s", self._delta_dir, error_compaction)
+            return 0
+        finally:
+            lock.release()
+
+    def _remove_covered(self, fs: Any, path: str) -> None:
+        """Remove os deltas e as bases antigas cobertos pela base vigente"""
+        base, _, old_bases = self._list_log(fs, path)
+        if base is None:
+            return
+        mark = _log_mark(base['name'])
+        covered = [item['path'] for item in old_bases]
+        covered += [entry for entry in fs.ls(path, detail=False, refresh=True)
+                    if posixpath.basename(entry).startswith('delta-') and _log_mark(posixpath.basename(entry)) <= mark]
+        for entry in covered:
+            try:
+                fs.rm_file(entry)
+            except FileNotFoundError:
+                pass
+
+    def migrate(self) -> int:
+        """
+        Converte o CSV de `legacy_filepath` para Parquet, se o Parquet ainda não existir
+
+        Returns:
+            int: Linhas migradas (0 quando não há o que migrar).
+        """
+        if self._path_exists(self._filepath):
+            logger.info("Parquet já existe, migração ignorada: %s", self._filepath)
+            return 0
+
+        legacy = self._load_legacy()
+        if legacy.empty:
+            return 0
+
+        fs, path = _url_to_fs(self._filepath, self._storage_options)
+        try:
+            _conditional_put(fs, path, self._serialize(_append_dedup(pd.DataFrame(), legacy)), None)
+        except _WriteConflict:
+            logger.info("Parquet criado por outra execução durante a migração: %s", self._filepath)
+            return 0
+        logger.info("Migrados %d registros de %s para %s", len(legacy), self._legacy_filepath, self._filepath)
+        return len(legacy)
+
+    def _path_exists(self, filepath: str) -> bool:
+        fs, path = _url_to_fs(filepath, self._storage_options)
+        try:
+            return fs.exists(path)
+        except Exception as error_file_empty:
+            logger.info("Arquivo não existe: %s", error_file_empty)
+            return False
+
+    def _exists(self) -> bool:
+        if self._delta_log is not None:
+            base, deltas, _ = self._list_log(*self._fs())
+            if base is not None or deltas:
+                return True
+        # enquanto não houver Parquet, o histórico é lido do CSV legado
+        return self._path_exists(self._filepath) or bool(self._legacy_filepath and self._path_exists(self._legacy_filepath))
+
+    def _release(self) -> None:
+        super()._release()
+        _join_compactions(self._delta_dir)
+
+    def _describe(self) -> Dict[str, Any]:
+        return {'filepath': self._filepath, 'legacy_filepath': self._legacy_filepath, 'delta_log': self._delta_log}
+
+
+def _log_mark(name: str) -> str:
+    """Marca de ordenação de um objeto do log (`delta-<marca>.parquet` ou `base-<marca>.<id>.parquet`)"""
+    return name.split('-', 1)[1].split('.', 1)[0]
+
+
+class DatePartitionedDataset(AbstractDataset):
+    """
+    Dataset particionado por data (`mes=YYYY-MM/` ou `dat_ref=YYYY-MM-DD/`), uma partição por mês ou dia
+
+    Cada partição é um `AppendParquetDataset` (mesma regra de duplicatas e, com `delta_log`,
+    o mesmo log de deltas), de modo que uma gravação diária lê e grava só as partições das
+    linhas recebidas. `load_range` (ou `set_date_range` seguido de `load`) abre apenas as
+    partições do intervalo.
+
+    As linhas sem valor em `partition_column` vão para `default_partition` (o `odate` da
+    execução, definido pelo `DataPartitioningHook`). Enquanto não houver partições, o
+    histórico é lido de `legacy_filepath` (o Parquet anterior, com seus deltas e o CSV
+    legado) e é particionado na primeira gravação (ou em `migrate`).
+
+    `local_cache` e `key_index` são repassados às partições (cópias locais dos objetos
+    lidos e índice de chaves das notícias, por partição). As garantias de gravação são as
+    do `AppendParquetDataset`: deltas imutáveis com `delta_log`; sem ele, gravação
+    condicional de cada partição, sem perder as linhas de execuções paralelas.
+    """
+
+    PREFIXES: Dict[str, str] = {'day': 'dat_ref', 'month': 'mes'}
+    FORMATS: Dict[str, str] = {'day': '%Y-%m-%d', 'month': '%Y-%m'}
+
+    def __init__(self, filepath: str, granularity: str = 'month', partition_column: str = 'dat_ref',
+                 load_args: Optional[Dict[str, Any]] = None, save_args: Optional[Dict[str, Any]] = None,
+                 credentials: Optional[Dict[str, Any]] = None, fs_args: Optional[Dict[str, Any]] = None,
+                 delta_log: Optional[Dict[str, Any]] = None, legacy_filepath: Optional[str] = None,
+                 local_cache: Optional[Dict[str, Any]] = None, key_index: bool = False):
+        if granularity not in self.PREFIXES:
+            raise ValueError(f"granularity inválida: {granularity} (esperado um de {tuple(self.PREFIXES)})")
+        self._filepath: str = filepath.rstrip('/')
+        self._granularity: str = granularity
+        self._partition_column: str = partition_column
+        self._load_args: Dict[str, Any] = load_args or {}
+        self._save_args: Optional[Dict[str, Any]] = save_args
+        self._credentials: Optional[Dict[str, Any]] = credentials
+        self._fs_args: Optional[Dict[str, Any]] = fs_args
+        self._delta_log: Optional[Dict[str, Any]] = delta_log
+        self._legacy_filepath: Optional[str] = legacy_filepath
+        self._local_cache: Optional[Dict[str, Any]] = local_cache
+        self._key_index: bool = key_index
+        self._date_range: DateRange = (None, None)
+        self.default_partition: Optional[str] = None
+
+        self._storage_options: Dict[str, Any] = {}
+        if credentials:
+            self._storage_options.update(credentials)
+        if fs_args:
+            self._storage_options.update(fs_args)
+
+    def _partition_dataset(self, key: str) -> AppendParquetDataset:
+        return AppendParquetDataset(
+            posixpath.join(self._filepath, f"{self.PREFIXES[self._granularity]}={key}", 'data.parquet'),
+            load_args=self._load_args, save_args=self._save_args, credentials=self._credentials,
+            fs_args=self._fs_args, delta_log=self._delta_log, local_cache=self._local_cache, key_index=self._key_index)
+
+    def _legacy_dataset(self) -> Optional[AppendParquetDataset]:
+        if not self._legacy_filepath:
+            return None
+        # o log de deltas é lido sempre: a base vale mesmo sem deltas e o CSV é o último recurso
+        return AppendParquetDataset(self._legacy_filepath, load_args=self._load_args, credentials=self._credentials,
+                                    fs_args=self._fs_args, delta_log={**(self._delta_log or {}), 'enabled': True},
+                                    legacy_filepath=re.sub(r'\.parquet$', '.csv', self._legacy_filepath),
+                                    local_cache=self._local_cache)
+
+    def partition_key(self, value: Any) -> Optional[str]:
+        """Chave da partição de uma data (`YYYY-MM` ou `YYYY-MM-DD`)"""
+        if value is None:
+            return None
+        date = pd.to_datetime(value, errors='coerce')
+        return None if pd.isna(date) else date.strftime(self.FORMATS[self._granularity])
+
+    def partition_keys(self, data: pd.DataFrame) -> pd.Series:
+        """Chave da partição de cada linha; linhas sem data usam `default_partition`"""
+        dates = pd.to_datetime(data[self._partition_column], errors='coerce') \
+            if self._partition_column in data.columns else pd.Series(pd.NaT, index=data.index)
+        keys = dates.dt.strftime(self.FORMATS[self._granularity])
+        missing = keys.isna()
+        if missing.any():
+            default = self.partition_key(self.default_partition)
+            if default is None:
+                raise ValueError(f"{missing.sum()} linhas sem {self._partition_column} e sem partição padrão (odate)")
+            keys = keys.where(~missing, default)
+        return keys
+
+    def partitions(self) -> List[str]:
+        """Chaves das partições existentes, em ordem crescente"""
+        fs, path = _url_to_fs(self._filepath, self._storage_options)
+        prefix = f"{self.PREFIXES[self._granularity]}="
+        try:
+            entries = fs.ls(path, detail=False, refresh=True)
+        except FileNotFoundError:
+            return []
+        names = (posixpath.basename(entry.rstrip('/')) for entry in entries)
+        return sorted(name[len(prefix):] for name in names if name.startswith(prefix))
+
+    def set_date_range(self, start: Optional[str] = None, end: Optional[str] = None) -> None:
+        """Restringe os próximos `load` ao intervalo `[start, end]` (`None`: sem limite)"""
+        self._date_range = (start, end)
+
+    @property
+    def date_range(self) -> DateRange:
+        return self._date_range
+
+    def merge_appended(self, current: pd.DataFrame, data: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Resultado de `load` após gravar `data`, sem reler: `current` é o `load` anterior"""
+        return _merge_appended(current, data, self._date_range)
+
+    def fingerprint(self) -> Optional[str]:
+        """
+        Identificador do conteúdo das partições do intervalo de `set_date_range` (ou do histórico legado)
+
+        Lista a raiz e apenas os arquivos das partições do intervalo (as mesmas que `load`
+        abre): gravações em partições fora dele não mudam o que é lido.
+        """
+        keys = self.partitions()
+        if not keys:
+            legacy = self._legacy_dataset()
+            return legacy.fingerprint() if legacy is not None else None
+        fs, path = _url_to_fs(self._filepath, self._storage_options)
+        selected = self._in_range(keys, *self._date_range)
+        return _fingerprint(fs, [posixpath.join(path, f"{self.PREFIXES[self._granularity]}={key}") for key in selected])
+
+    def _in_range(self, keys: List[str], start: Optional[str], end: Optional[str]) -> List[str]:
+        """Partições de `keys` que cobrem o intervalo `[start, end]`"""
+        first, last = self.partition_key(start), self.partition_key(end)
+        return [key for key in keys if (first is None or key >= first) and (last is None or key <= last)]
+
+    def load_range(self, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+        """
+        Lê apenas as partições que cobrem o intervalo `[start, end]` de `partition_column`
+
+        Args:
+            start (Optional[str]): Data inicial (inclusiva); `None` sem limite.
+            end (Optional[str]): Data final (inclusiva); `None` sem limite.
+
+        Returns:
+            pd.DataFrame: Linhas do intervalo, em ordem decrescente de data.
+        """
+        keys = self.partitions()
+        if not keys:
+            legacy = self._legacy_dataset()
+            if legacy is None or not legacy.exists():
+                return pd.DataFrame()
+            if self._partition_column == 'dat_ref':
+                legacy.set_date_range(start, end)
+            return _filter_date_range(legacy.load(), self._partition_column, start, end)
+
+        selected = self._in_range(keys, start, end)
+        logger.info("%s: %d de %d partições no intervalo %s a %s", self._filepath, len(selected), len(keys), start, end)
+
+        frames = []
+        for key in reversed(selected):
+            partition = self._partition_dataset(key)
+            if self._partition_column == 'dat_ref':
+                partition.set_date_range(start, end)  # poda também os row groups das partições das pontas
+            frames.append(partition.load())
+        frames = [frame for frame in frames if not frame.empty]
+        data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return _filter_date_range(data, self._partition_column, start, end)
+
+    def _load(self) -> pd.DataFrame:
+        return self.load_range(*self._date_range)
+
+    def _save(self, data: pd.DataFrame) -> None:
+        if data.empty:
+            return
+        if self._legacy_filepath and not self.partitions():
+            self.migrate()
+
+        keys = self.partition_keys(data)
+        for key, rows in data.groupby(keys, sort=True):
+            self._partition_dataset(key).save(rows)
+        logger.info("%s: %d registros gravados nas partições %s", self._filepath, len(data), sorted(keys.unique()))
+
+    def migrate(self) -> int:
+        """
+        Particiona o histórico de `legacy_filepath`, se ainda não houver partições
+
+        Returns:
+            int: Linhas migradas (0 quando não há o que migrar).
+        """
+        legacy = self._legacy_dataset()
+        if legacy is None or self.partitions() or not legacy.exists():
+            return 0
+
+        history = legacy.load()
+        if history.empty:
+            return 0
+        keys = self.partition_keys(history)
+        for key, rows in history.groupby(keys, sort=True):
+            self._partition_dataset(key).save(rows)
+        logger.info("Migrados %d registros de %s para %d partições em %s", len(history), self._legacy_filepath,
+                    keys.nunique(), self._filepath)
+        return len(history)
+
+    def _exists(self) -> bool:
+        if self.partitions():
+            return True
+        legacy = self._legacy_dataset()
+        return legacy is not None and legacy.exists()
+
+    def _release(self) -> None:
+        super()._release()
+        _join_compactions(f"{self._filepath}/")  # compactações das partições em segundo plano
+
+    def _describe(self) -> Dict[str, Any]:
+        return {'filepath': self._filepath, 'granularity': self._granularity, 'partition_column': self._partition_column,
+                'date_range': self._date_range, 'delta_log': self._delta_log}
+
+
+def migrate_csv_datasets(catalog: Any) -> Dict[str, int]:
+    """
+    Migração única dos datasets `AppendParquetDataset` e `DatePartitionedDataset` do catálogo
+
+    Uso (no `kedro ipython`): `from factory.datasets import migrate_csv_datasets; migrate_csv_datasets(catalog)`
+
+    Returns:
+        Dict[str, int]: Linhas migradas por dataset.
+    """
+    migrated: Dict[str, int] = {}
+    for name in catalog.list():
+        dataset = catalog._get_dataset(name)  # pylint: disable=protected-access
+        if isinstance(dataset, (AppendParquetDataset, DatePartitionedDataset)):
+            migrated[name] = dataset.migrate()
+    return migrated
@@ -1,31 +1,205 @@
 """
-Hooks personalizados para particionamento por data
+Hooks personalizados para particionamento por data, leitura por janela de lookback, marcas d'água
+e identificação da execução da ingestão
 """
+import re
 import logging
-from typing import Any
+from typing import Any, Dict, Optional, Tuple
 from kedro.framework.hooks import hook_impl
 import pandas as pd
+from factory.datasets import DatePartitionedDataset
+from factory.pipelines.data_ingestion.stores import WatermarkStore
 
 logger = logging.getLogger(__name__)
 
 
 class DataPartitioningHook:
-    """Hook para salvar dados particionados por odate"""
+    """Hook que encaminha as gravações dos datasets particionados por data para a partição da execução"""
+
+    def __init__(self):
+        self._params: Dict[str, Any] = {}
+        self._catalog: Any = None
+
+    @hook_impl
+    def after_context_created(self, context) -> None:
+        """
+        Guarda os parâmetros da execução (odate)
+        """
+        self._params = context.params
+
+    @hook_impl
+    def after_catalog_created(self, catalog) -> None:
+        """
+        Guarda o catálogo para localizar os datasets particionados
+        """
+        self._catalog = catalog
+
+    def _partitioned(self, dataset_name: str) -> Optional[DatePartitionedDataset]:
+        try:
+            dataset = self._catalog._get_dataset(dataset_name) if self._catalog is not None else None  # pylint: disable=protected-access
+        except Exception:  # pylint: disable=broad-except
+            return None
+        return dataset if isinstance(dataset, DatePartitionedDataset) else None
 
     @hook_impl
     def before_dataset_saved(self, dataset_name: str, data: Any, node: Any = None) -> None:
         """
-        Modifica o caminho do arquivo para incluir partição por odate
+        Define a partição padrão (odate) do dataset e remove a coluna `odate` antes de salvar
         """
-        # Verifica se o dataset tem particionamento habilitado
-        if (hasattr(data, 'columns') and 'odate' in data.columns and isinstance(data, pd.DataFrame) and not data.empty):
+        if not isinstance(data, pd.DataFrame) or data.empty:
+            return
 
-            # Pega a data da primeira linha (assumindo que todas as linhas têm a mesma data)
+        odate = self._params.get("odate")
+        if 'odate' in data.columns:
+            # a coluna odate, quando presente, prevalece sobre o parâmetro da execução
             odate = str(data['odate'].iloc[0])
+            data.drop(columns=['odate'], inplace=True)
+            logger.info("Coluna 'odate' removida do DataFrame %s", dataset_name)
+
+        dataset = self._partitioned(dataset_name)
+        if dataset is None:
+            return
+
+        dataset.default_partition = odate
+        logger.info("Particionamento de %s: partições %s (padrão %s)", dataset_name,
+                    sorted(dataset.partition_keys(data).unique()), odate)
+
+
+class LookbackPushdownHook:
+    """
+    Hook que restringe a leitura das entradas ao histórico declarado pelo nó (`lookback`)
+
+    Antes de cada leitura, define no dataset (`set_date_range`) o intervalo
+    `[odate - lookback, odate]` dos nós que o consomem: a união das janelas de todos os
+    consumidores do pipeline, de modo que as leituras do mesmo dataset coincidem (e são
+    servidas uma única vez pelo `CachedDataCatalog`). Os consumidores sem a declaração, as
+    execuções com `process_full_data` e os backends sem `set_date_range` leem tudo.
+    """
+
+    def __init__(self):
+        self._params: Dict[str, Any] = {}
+        self._catalog: Any = None
+        self._windows: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+    @hook_impl
+    def after_context_created(self, context) -> None:
+        """
+        Guarda os parâmetros da execução (odate, process_full_data e parâmetros dos indicadores)
+        """
+        self._params = context.params
+
+    @hook_impl
+    def after_catalog_created(self, catalog) -> None:
+        """
+        Guarda o catálogo para localizar os datasets de entrada
+        """
+        self._catalog = catalog
+
+    def date_range(self, node: Any) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Intervalo de dat_ref lido pelo nó: `(odate - lookback, odate)`, ou sem limites
+
+        Args:
+            node: Nó do Kedro; a função declara o histórico com `lookback`.
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: Data inicial e final (YYYY-MM-DD).
+        """
+        lookback_days = getattr(getattr(node, 'func', None), 'lookback_days', None)
+        odate = self._params.get("odate")
+        if lookback_days is None or not odate or self._params.get("process_full_data", False):
+            return None, None
+
+        # parâmetros do indicador: a primeira entrada `params:` do nó
+        parms_indicador: Dict[str, Any] = {}
+        names = [name for name in node.inputs if name.startswith("params:")]
+        if names:
+            parms_indicador = self._params
+            for key in names[0][len("params:"):].split("."):
+                parms_indicador = parms_indicador.get(key) or {}
+        start = (pd.Timestamp(odate) - pd.Timedelta(days=lookback_days(parms_indicador))).strftime('%Y-%m-%d')
+        return start, pd.Timestamp(odate).strftime('%Y-%m-%d')
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: Dict[str, Any], pipeline: Any, catalog: Any) -> None:
+        """
+        Calcula a janela de cada dataset: a união das janelas dos nós que o consomem
+        """
+        self._windows = {}
+        for consumer in pipeline.nodes:
+            start, end = self.date_range(consumer)
+            for name in consumer.inputs:
+                if name not in self._windows:
+                    self._windows[name] = (start, end)
+                    continue
+                current_start, current_end = self._windows[name]
+                self._windows[name] = (None if start is None or current_start is None else min(start, current_start),
+                                       None if end is None or current_end is None else max(end, current_end))
+
+    @hook_impl
+    def before_dataset_loaded(self, dataset_name: str, node: Any) -> None:
+        """
+        Define a janela de leitura do dataset para o nó que vai consumi-lo
+        """
+        if self._catalog is None or node is None:
+            return
+        try:
+            dataset = self._catalog._get_dataset(dataset_name)  # pylint: disable=protected-access
+        except Exception:  # pylint: disable=broad-except
+            return
+        if not hasattr(dataset, 'set_date_range'):
+            return
+
+        # sempre redefine: o mesmo dataset pode ser lido fora do pipeline calculado
+        start, end = self._windows.get(dataset_name) or self.date_range(node)
+        dataset.set_date_range(start, end)
+        if start is not None:
+            logger.info("Leitura de %s restrita a %s a %s (nó %s)", dataset_name, start, end, node.name)
+
+
+class WatermarkHook:
+    """Hook que registra a marca d'água (último dat_ref e hash do conteúdo) dos datasets de staging"""
+
+    STAGE_DATASET = re.compile(r"^rw_\w+_stage$")
 
-            logger.info("Particionamento detectado: %s para data %s", dataset_name, odate)
+    def __init__(self):
+        self._params: Dict[str, Any] = {}
 
-            # Remove a coluna odate do DataFrame antes de salvar
-            if 'odate' in data.columns:
-                data.drop(columns=['odate'], inplace=True)
-                logger.info("Coluna 'odate' removida do DataFrame %s", dataset_name)
+    @hook_impl
+    def after_context_created(self, context) -> None:
+        """
+        Guarda os parâmetros da execução (odate, environment, watermark_parms)
+        """
+        self._params = context.params
+
+    @hook_impl
+    def after_dataset_saved(self, dataset_name: str, data: Any, node: Any = None) -> None:
+        """
+        Avança a marca d'água do dataset de staging após a gravação
+        """
+        if not self.STAGE_DATASET.match(dataset_name) or self._params.get("environment") in ("test", "replay"):
+            return
+        if not isinstance(data, pd.DataFrame) or data.empty or 'dat_ref' not in data.columns:
+            return
+
+        watermark_parms = self._params.get("watermark_parms") or {}
+        store = WatermarkStore(watermark_parms.get("path", "data/watermarks"))
+        changed = store.advance(dataset_name, data)
+        logger.info("Marca d'água de %s: %s (conteúdo alterado: %s)", dataset_name, store.get(dataset_name).get("dat_ref"), changed)
+
+
+class IngestionRunHook:
+    """Hook que identifica a sessão do Kedro nos parâmetros da execução (`session_id`)"""
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: Dict[str, Any], pipeline: Any, catalog: Any) -> None:
+        """
+        Injeta o `session_id` nos parâmetros: fora do Airflow (sem `run_id`), o orçamento de
+        tempo do estágio conta a partir do primeiro nó da sessão, não da primeira execução do odate
+        """
+        if "parameters" not in catalog.list():
+            return
+        parameters = catalog.load("parameters")
+        if not isinstance(parameters, dict) or parameters.get("session_id") or not run_params.get("session_id"):
+            return
+        catalog.add_feed_dict({"parameters": {**parameters, "session_id": run_params["session_id"]}}, replace=True)
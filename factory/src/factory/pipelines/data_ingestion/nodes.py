@@ -1,82 +1,172 @@
 """
 This is a boilerplate pipeline 'data_ingestion' generated using Kedro 0.19.14
 """
-from typing import Dict
+import os
+from functools import partial
+from contextlib import closing
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
+from time import monotonic
+from xml.etree.ElementTree import ParseError
 import pandas as pd
+import requests
 import yfinance as yf
 from .utils import (
     scraping,
+    scraping_range,
     scraping_infomoney,
     scraping_valorinveste,
-    scraping_seudinheiro,
-    scraping_moneytimes,
+    scraping_feed,
+    parse_seudinheiro,
+    parse_moneytimes,
+    get_http_client,
+    get_payload_recorder,
+    get_source_failover,
+    ingestion_deadline,
+    deadline_exceeded,
+    finish_ingestion,
+    until_deadline,
+    DeadlineExceeded,
+    HttpClient,
+    PayloadRecorder,
+    log_cache_stats,
+    paginate_urls,
+    pagination_stop_date,
+    page_older_than,
+    ingestion_mode,
+    resolve_date_window,
+    FEED_MODES,
+    filter_date_window,
 )
+from .stores import BackfillCheckpoint, YahooHistoryStore
 from .utils import (
-    extrair_campos,
-    extrair_data_url,
     parse_data_portugues,
     data_relativa_para_absoluta,
     select_cast_midia,
     logger,
 )
-
+from .parsing import (
+    extrair_campos_vetorizado,
+    extrair_data_url_vetorizado,
+    parse_data_portugues_vetorizado,
+    data_relativa_para_absoluta_vetorizado,
+    converter_numerico,
+)
 
 def extract_transform_html_table(scraping_mapping: dict, columns_order: list, parameters: dict) -> pd.DataFrame:
     """Função para extrair tabelas HTML."""
     odate = parameters.get("odate")
     environment = parameters.get("environment", "production")
-    process_full_data = parameters.get("process_full_data", False)
-    logger.info("Parameters - Odate: %s, Environment: %s, Full Data: %s", odate, environment, process_full_data)
-
-    have_replace = scraping_mapping.get("replace_decimal", False)
-    dat_ref_format = scraping_mapping.get("dat_ref_format")
+    mode = ingestion_mode(parameters)
+    logger.info("Parameters - Odate: %s, Environment: %s, Mode: %s", odate, environment, mode)
 
     if environment == "test":
         return _make_dataframe_test_wbf(odate)
 
-    data = scraping(
-        scraping_mapping.get("url", None), scraping_mapping.get("headers", None)
-    )
-
-    if (not data or len(data) == 0) and scraping_mapping.get("scraping_except", None):
-        logger.info("Data scraping failed. Try extracting data from another source.")
-        data = scraping(scraping_mapping.get("scraping_except").get('url'),
-                        scraping_mapping.get("headers"))
-
-        have_replace = scraping_mapping.get("scraping_except", False).get('replace_decimal')
-        columns_order = scraping_mapping.get("scraping_except").get('columns_order')
-        dat_ref_format = scraping_mapping.get("scraping_except").get('dat_ref_format')
-
-    df = pd.DataFrame(data)
-
-    df_transformed = _transform_html_table(df, columns_order, dat_ref_format, have_replace)
-    logger.info("Data transformed successfully")
-
-    if not process_full_data:
-        df_transformed = df_transformed[df_transformed["dat_ref"] == odate]
-
-        if len(df_transformed) == 0 and scraping_mapping.get("scraping_except", None):
-            df_transformed = _retry_scraping_odate(odate, scraping_mapping.get("scraping_except"), scraping_mapping.get("headers"))
-
-        logger.info("Filtered data for date '%s': %d records", odate, len(df_transformed))
-
-    return df_transformed
-
-
-def _retry_scraping_odate(odate, scraping_mapping, headers):
-    """Tenta re-extrair dados para uma data específica."""
-    logger.info("Retrying data extraction for date: %s", odate)
-
-    data = scraping(scraping_mapping.get('url'), headers)
-    df = pd.DataFrame(data)
+    cache_before = get_http_client(parameters.get("http_parms"), get_payload_recorder(parameters)).cache_stats()
+    ttl, parser = scraping_mapping.get("cache_ttl"), scraping_mapping.get("parser")
+    deadline = ingestion_deadline(parameters)
+
+    range_parms = scraping_mapping.get("range_fetch") or {}
+    if range_parms and range_parms.get("enabled", True) and mode != "daily":
+        df_range, complete = _extract_html_table_range(scraping_mapping, columns_order, parameters, deadline)
+        if not df_range.empty or deadline_exceeded(deadline):
+            log_cache_stats(scraping_mapping.get("csv_read", scraping_mapping.get("url")), cache_before)
+            return finish_ingestion(df_range, scraping_mapping.get("csv_read"), complete, parameters)
+        logger.info("Range fetch returned no data. Falling back to the default page.")
+
+    failover = get_source_failover(parameters)
+    window = None if mode == "full" else resolve_date_window(scraping_mapping.get("csv_read"), parameters)
+    df_transformed, error, collected, complete = pd.DataFrame(), None, False, True
+
+    sources = failover.order(_table_sources(scraping_mapping, columns_order))
+    if not sources:
+        raise ValueError(f"Todas as fontes de {scraping_mapping.get('csv_read')} estão com o circuito aberto")
+
+    for source in sources:
+        try:
+            data = failover.fetch(source["url"], partial(scraping, source["url"], scraping_mapping.get("headers"),
+                                                         ttl=ttl, parser=parser, deadline=deadline,
+                                                         stream_parms=scraping_mapping.get("stream")))
+        except DeadlineExceeded:
+            complete = False
+            break
+        except ValueError as error_source:
+            logger.info("Data scraping failed for %s: %s", source["url"], error_source)
+            error = error_source
+            continue
+        if not data:
+            logger.info("Data scraping failed. Try extracting data from another source.")
+            continue
 
-    df_transformed = _transform_html_table(df,
-                                           scraping_mapping.get('columns_order'),
-                                           scraping_mapping.get('dat_ref_format'),
-                                           scraping_mapping.get('replace_decimal'))
+        collected = True
+        df_transformed = _transform_html_table(pd.DataFrame(data), source["columns_order"],
+                                               source["dat_ref_format"], source["replace_decimal"])
+        logger.info("Data transformed successfully")
 
-    return df_transformed[df_transformed["dat_ref"] == odate]
+        if window is not None:
+            df_transformed = filter_date_window(df_transformed, window)
+            logger.info("Filtered data for window %s: %d records", window, len(df_transformed))
+        if not df_transformed.empty:
+            break
+    else:
+        if not collected and error is not None:
+            raise error
+
+    logger.info("Source health: %s", failover.stats().to_dict("records"))
+    log_cache_stats(scraping_mapping.get("csv_read", scraping_mapping.get("url")), cache_before)
+    return finish_ingestion(df_transformed, scraping_mapping.get("csv_read"), complete, parameters)
+
+
+def _table_sources(scraping_mapping: dict, columns_order: list) -> List[Dict[str, Any]]:
+    """Fonte primária e alternativa (`scraping_except`) da tabela, com o layout de cada uma."""
+    sources = [{"url": scraping_mapping.get("url"),
+                "columns_order": columns_order,
+                "dat_ref_format": scraping_mapping.get("dat_ref_format"),
+                "replace_decimal": scraping_mapping.get("replace_decimal", False)}]
+
+    scraping_except = scraping_mapping.get("scraping_except")
+    if scraping_except:
+        sources.append({"url": scraping_except.get("url"),
+                        "columns_order": scraping_except.get("columns_order", columns_order),
+                        "dat_ref_format": scraping_except.get("dat_ref_format"),
+                        "replace_decimal": scraping_except.get("replace_decimal", False)})
+    return sources
+
+
+def _extract_html_table_range(scraping_mapping: dict, columns_order: list, parameters: dict,
+                              deadline: Optional[float] = None) -> Tuple[pd.DataFrame, bool]:
+    """
+    Extrai o histórico da tabela para o intervalo da execução (`range_fetch` da fonte).
+
+    O intervalo é o de `resolve_date_window`; no modo `full` vai de `range_fetch.start_date`
+    até o `odate`. Falhas na busca são registradas e resultam em um DataFrame vazio; se o
+    `deadline` passar, retorna as janelas já buscadas e `False` como completude.
+    """
+    range_parms = scraping_mapping.get("range_fetch")
+    start, end = resolve_date_window(scraping_mapping.get("csv_read"), parameters)
+    start = start or range_parms.get("start_date", "2017-01-01")
+    end = end or parameters.get("odate") or datetime.today().strftime("%Y-%m-%d")
+
+    try:
+        data, complete = scraping_range(range_parms, scraping_mapping.get("headers"), start, end,
+                                        ttl=scraping_mapping.get("cache_ttl"), parser=scraping_mapping.get("parser"),
+                                        deadline=deadline, stream_parms=scraping_mapping.get("stream"),
+                                        dat_ref_format=range_parms.get("dat_ref_format", scraping_mapping.get("dat_ref_format")))
+    except (ValueError, requests.exceptions.RequestException) as error_range:
+        logger.info("Range fetch failed for %s: %s", scraping_mapping.get("csv_read"), error_range)
+        return pd.DataFrame(), True
+
+    if not data:
+        return pd.DataFrame(), complete
+
+    df = _transform_html_table(pd.DataFrame(data),
+                               range_parms.get("columns_order", columns_order),
+                               range_parms.get("dat_ref_format", scraping_mapping.get("dat_ref_format")),
+                               range_parms.get("replace_decimal", scraping_mapping.get("replace_decimal", False)))
+    df = filter_date_window(df, (start, end))
+    logger.info("Range fetch %s to %s: %d records", start, end, len(df))
+    return df, complete
 
 
 def _transform_html_table(raw_data: pd.DataFrame, columns_order: list, dat_format: str, replace_decimal: bool = False) -> pd.DataFrame:
@@ -86,198 +176,451 @@ def _transform_html_table(raw_data: pd.DataFrame, columns_order: list, dat_forma
         df.drop(columns=5, inplace=True)
 
     df.columns = columns_order
-    df["dat_ref"] = pd.to_datetime(df["dat_ref"], format=dat_format).dt.strftime("%Y-%m-%d")
+    df["dat_ref"] = pd.to_datetime(df["dat_ref"], format=dat_format)
     df = df.sort_values("dat_ref", ascending=False).reset_index(drop=True)
-    df["change_percentage"] = df["change_percentage"].str.replace("%", "", regex=False)
-
-    columns_order.remove("dat_ref")
 
-    for col in columns_order:
-        if replace_decimal:
-            df[col] = (
-                df[col]
-                .str.replace(".", "", regex=False)
-                .str.replace(",", ".", regex=False)
-            )
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return converter_numerico(df, [col for col in columns_order if col != "dat_ref"], replace_decimal)
 
-    return df
 
+def extract_transform_api_yf(tickers: Dict[str, str], columns_mapping: Dict[str, str], history_parms: dict,
+                             parameters: dict) -> Dict[str, pd.DataFrame]:
+    """
+    Extrai e transforma dados de ações usando a API do yfinance.
 
-def extract_transform_api_yf(ticker: str, columns_mapping: Dict[str, str], parameters: dict) -> pd.DataFrame:
-    """Extrai e transforma dados de ações usando a API do yfinance."""
+    Todos os tickers de `yf_tickers` (dataset de saída -> ticker) são baixados em uma única
+    requisição, apenas a partir do que falta no histórico local (`YahooHistoryStore`); o
+    resultado é separado por dataset de saída.
+    """
     odate = parameters.get("odate")
     environment = parameters.get("environment", "production")
-    process_full_data = parameters.get("process_full_data", False)
-    logger.info("Yahoo Finance - Ticker: %s, Data: %s, Environment: %s, Full Data: %s", ticker, odate, environment, process_full_data)
+    mode = ingestion_mode(parameters)
+    logger.info("Yahoo Finance - Tickers: %s, Data: %s, Environment: %s, Mode: %s",
+                list(tickers.values()), odate, environment, mode)
 
     if environment == "test":
-        return _make_dataframe_test_yf(odate)
+        return {output: _make_dataframe_test_yf(odate) for output in tickers}
+
+    start_date = history_parms.get("start_date", "2017-01-01")
+    recorder = get_payload_recorder(parameters)
+    history_path = history_parms.get("path", "data/yf_history")
+    if recorder is not None and recorder.replaying:
+        history_path = os.path.join(recorder.path, "yf_history")  # não mistura a reprodução com o histórico real
+    store = YahooHistoryStore(history_path, history_parms.get("overlap_days", 7))
+    starts = {ticker: store.next_start(ticker) or start_date for ticker in tickers.values()}
+
+    deadline = ingestion_deadline(parameters)
+    complete = not deadline_exceeded(deadline)
+    if complete:
+        revised = _download_yf_tail(store, list(starts), min(starts.values()), recorder=recorder, deadline=deadline)
+        if revised and not deadline_exceeded(deadline):
+            _download_yf_tail(store, revised, start_date, replace=True, recorder=recorder, deadline=deadline)
+        complete = not deadline_exceeded(deadline)
+
+    outputs = {}
+    for output, ticker in tickers.items():
+        window = resolve_date_window(output, parameters)
+        df = store.history(ticker, window[0] or start_date)
+        logger.info("Data collected successfully for %s: %d", ticker, len(df))
+
+        df = df.reset_index(inplace=False)
+        df = df.rename(columns=columns_mapping)
+        logger.info("Data transformed successfully")
 
-    start_date = "2017-01-01" if process_full_data is True else odate
-    df = yf.download(ticker, start=start_date, auto_adjust=False)
-    logger.info("Data collected successfully: %d", len(df))
+        if mode != "full":
+            df = filter_date_window(df, window)
+            logger.info("Filtered Yahoo Finance data for window %s: %d records", window, len(df))
 
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = [col[0] for col in df.columns]
+        outputs[output] = finish_ingestion(df, output, complete, parameters)
 
-    df = df.reset_index(inplace=False)
-    df = df.rename(columns=columns_mapping)
-    logger.info("Data transformed successfully")
+    return outputs
 
-    if not process_full_data:
-        df["dat_ref"] = df["dat_ref"].dt.strftime("%Y-%m-%d")
-        df = df[df["dat_ref"] == odate]
-        logger.info("Filtered Yahoo Finance data for date '%s': %d records", odate, len(df))
 
-    return df
+def _download_yf_tail(store: YahooHistoryStore, tickers: List[str], start: str, replace: bool = False,
+                      recorder: Optional[PayloadRecorder] = None, deadline: Optional[float] = None) -> List[str]:
+    """Baixa os tickers em lote a partir de `start` e grava no histórico; retorna os que foram revisados."""
+    timeout = max(deadline - monotonic(), 1) if deadline is not None else 10
+
+    def download() -> pd.DataFrame:
+        return yf.download(tickers, start=start, auto_adjust=False, group_by="ticker", progress=False, timeout=timeout)
+
+    df = recorder.frame("yf_download", download) if recorder is not None else download()
+    logger.info("Yahoo Finance batch download from %s for %s: %d rows", start, tickers, len(df))
+
+    revised = []
+    for ticker in tickers:
+        tail = df[ticker] if isinstance(df.columns, pd.MultiIndex) else df
+        if not store.update(ticker, tail, replace=replace):
+            revised.append(ticker)
+    return revised
 
 
 def extract_transform_infomoney(mapping_class: Dict[str, str], parameters: dict) -> pd.DataFrame:
     """Extrai e transforma dados do InfoMoney."""
     odate = parameters.get("odate")
     environment = parameters.get("environment", "production")
-    process_full_data = parameters.get("process_full_data", False)
-    logger.info("InfoMoney - Odate: %s, Environment: %s, Full Data: %s", odate, environment, process_full_data)
+    mode = ingestion_mode(parameters)
+    logger.info("InfoMoney - Odate: %s, Environment: %s, Mode: %s", odate, environment, mode)
 
     if environment == "test":
         return _make_dataframe_test_news(odate, "InfoMoney")
 
-    df = pd.DataFrame(
-        scraping_infomoney(mapping_class.get("url"), mapping_class.get("class_"))
-    )
+    feed = _ingest_feed("InfoMoney", mapping_class, parameters)
+    if feed is not None:
+        return feed
+
+    cache_before = get_http_client(parameters.get("http_parms"), get_payload_recorder(parameters)).cache_stats()
+    try:
+        df = pd.DataFrame(
+            scraping_infomoney(mapping_class.get("url"), mapping_class.get("class_"), ttl=mapping_class.get("cache_ttl"),
+                               parser=mapping_class.get("parser"), deadline=ingestion_deadline(parameters))
+        )
+    except DeadlineExceeded:
+        return finish_ingestion(pd.DataFrame(), mapping_class.get("csv_read"), False, parameters)
+    log_cache_stats("InfoMoney", cache_before)
     logger.info("Data collected successfully from URL: %s - Data collected: %d", mapping_class.get("url"), len(df))
 
-    df[["categoria", "titulo", "data_publicacao"]] = df["titulo"].apply(extrair_campos)
-    df["dat_ref"] = pd.to_datetime(df["dat_ref"]).dt.strftime("%Y-%m-%d")
+    df[["categoria", "titulo", "data_publicacao"]] = extrair_campos_vetorizado(df["titulo"])
+    df["dat_ref"] = pd.to_datetime(df["dat_ref"]).dt.tz_localize(None).dt.normalize()  # dia local da publicação
     df = df[df["categoria"] != "Esportes"]
     df = select_cast_midia(df)
     logger.info("Data transformed successfully")
 
-    if not process_full_data:
-        df = df[df["dat_ref"] == odate]
-        logger.info("Filtered InfoMoney data for date '%s': %d records", odate, len(df))
+    if mode != "full":
+        window = resolve_date_window(mapping_class.get("csv_read"), parameters)
+        df = filter_date_window(df, window)
+        logger.info("Filtered InfoMoney data for window %s: %d records", window, len(df))
 
-    return df
+    return finish_ingestion(df, mapping_class.get("csv_read"), True, parameters)
 
 
 def extract_transform_valorinveste(mapping_class: Dict[str, str], parameters: dict) -> pd.DataFrame:
     """Extrai e transforma dados do Valor Investe."""
     odate = parameters.get("odate")
     environment = parameters.get("environment", "production")
-    process_full_data = parameters.get("process_full_data", False)
-    logger.info("ValorInveste - Odate: %s, Environment: %s, Full Data: %s", odate, environment, process_full_data)
+    mode = ingestion_mode(parameters)
+    logger.info("ValorInveste - Odate: %s, Environment: %s, Mode: %s", odate, environment, mode)
 
     if environment == "test":
         return _make_dataframe_test_news(odate, "ValorInveste")
 
-    df = pd.DataFrame(
-        scraping_valorinveste(
-            mapping_class.get("url"),
-            mapping_class.get("class_post"),
-            mapping_class.get("class_date"),
+    feed = _ingest_feed("Valor Investe", mapping_class, parameters)
+    if feed is not None:
+        return feed
+
+    cache_before = get_http_client(parameters.get("http_parms"), get_payload_recorder(parameters)).cache_stats()
+    try:
+        df = pd.DataFrame(
+            scraping_valorinveste(
+                mapping_class.get("url"),
+                mapping_class.get("class_post"),
+                mapping_class.get("class_date"),
+                ttl=mapping_class.get("cache_ttl"),
+                parser=mapping_class.get("parser"),
+                deadline=ingestion_deadline(parameters),
+            )
         )
-    )
+    except DeadlineExceeded:
+        return finish_ingestion(pd.DataFrame(), mapping_class.get("csv_read"), False, parameters)
+    log_cache_stats("ValorInveste", cache_before)
     logger.info("Data collected successfully from URL: %s - Data collected: %d", mapping_class.get("url"), len(df))
 
-    df["dat_ref"] = df["link"].apply(extrair_data_url)
+    df["dat_ref"] = extrair_data_url_vetorizado(df["link"])
     df = select_cast_midia(df)
-    df["dat_ref"] = pd.to_datetime(df["dat_ref"], format="%Y/%m/%d").dt.strftime("%Y-%m-%d")
+    df["dat_ref"] = pd.to_datetime(df["dat_ref"], format="%Y/%m/%d")
     logger.info("Data transformed successfully")
 
-    if not process_full_data:
-        df = df[df["dat_ref"] == odate]
-        logger.info("Filtered ValorInveste data for date '%s': %d records", odate, len(df))
+    if mode != "full":
+        window = resolve_date_window(mapping_class.get("csv_read"), parameters)
+        df = filter_date_window(df, window)
+        logger.info("Filtered ValorInveste data for window %s: %d records", window, len(df))
 
-    return df
+    return finish_ingestion(df, mapping_class.get("csv_read"), True, parameters)
 
 
-def extract_transform_seudinheiro(mapping_class: Dict[str, str], parameters: dict) -> pd.DataFrame:
+def extract_transform_seudinheiro(mapping_class: Dict[str, str], parameters: dict) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
     """Extrai e transforma dados do Seu Dinheiro."""
     odate = parameters.get("odate")
     environment = parameters.get("environment", "production")
-    process_full_data = parameters.get("process_full_data", False)
-    logger.info("SeuDinheiro - Odate: %s, Environment: %s, Full Data: %s", odate, environment, process_full_data)
+    mode = ingestion_mode(parameters)
+    logger.info("SeuDinheiro - Odate: %s, Environment: %s, Mode: %s", odate, environment, mode)
 
     if environment == "test":
         return _make_dataframe_test_news(odate, "SeuDinheiro")
 
-    max_pages = mapping_class.get("max_pages_full", 10) if process_full_data else mapping_class.get("max_pages", 5)
+    feed = _ingest_feed("Seu Dinheiro", mapping_class, parameters)
+    if feed is not None:
+        return feed
+
+    def parse_page(html: str) -> List[Dict[str, str]]:
+        return parse_seudinheiro(html, mapping_class.get("class_feed"), mapping_class.get("class_title"),
+                                 mapping_class.get("class_date"), mapping_class.get("parser"))
+
+    client = get_http_client(parameters.get("http_parms"), get_payload_recorder(parameters))
+    if mode == "backfill":
+        return _backfill_news("SeuDinheiro", mapping_class, parameters, client, parse_page, parse_data_portugues,
+                              _transform_seudinheiro)
+
+    max_pages = mapping_class.get("max_pages", 5) if mode == "daily" else mapping_class.get("max_pages_full", 10)
+    cache_before = client.cache_stats()
+    stop_date = pagination_stop_date(mapping_class, parameters)
+    pages = client.iter_pages(paginate_urls(mapping_class, max_pages), ttl=mapping_class.get("cache_ttl"),
+                              lookahead=mapping_class.get("lookahead") if stop_date else None,
+                              deadline=ingestion_deadline(parameters))
+    pages_read, complete = 0, True
     all_data = []
 
-    for page in range(1, max_pages + 1):
-        url = f"{mapping_class.get('url')}{mapping_class.get('pattern_pages').replace('<number>', str(page))}"
+    for url, response in until_deadline(pages):
+        if response is None:
+            complete = False
+            break
+        pages_read += 1
         logger.info("Scraping page: %s", url)
-        data = scraping_seudinheiro(
-            url,
-            mapping_class.get("class_feed"),
-            mapping_class.get("class_title"),
-            mapping_class.get("class_date"),
-        )
+        data = parse_page(response.text)
         if not data:
             logger.info("No data found on page: %s", url)
             continue
 
         all_data.extend(data)
+        if stop_date and page_older_than(data, parse_data_portugues, stop_date):
+            logger.info("Page older than '%s', stopping pagination: %s", stop_date, url)
+            break
 
+    logger.info("SeuDinheiro - Pages read: %d, Pages skipped: %d", pages_read, max_pages - pages_read)
+    log_cache_stats("SeuDinheiro", cache_before)
     df = pd.DataFrame(all_data)
     logger.info("Data collected successfully from URL: %s - Data collected: %d", mapping_class.get("url"), len(df))
 
+    df = _transform_seudinheiro(df)
+
+    if mode != "full":
+        window = resolve_date_window(mapping_class.get("csv_read"), parameters)
+        df = filter_date_window(df, window)
+        logger.info("Filtered SeuDinheiro data for window %s: %d records", window, len(df))
+
+    return finish_ingestion(df, mapping_class.get("csv_read"), complete, parameters)
+
+
+def _transform_seudinheiro(df: pd.DataFrame) -> pd.DataFrame:
+    """Transformação das notícias do Seu Dinheiro."""
     if not df.empty:
-        df["dat_ref"] = df["dat_ref"].apply(parse_data_portugues)
+        df["dat_ref"] = parse_data_portugues_vetorizado(df["dat_ref"])
         df = select_cast_midia(df)
         logger.info("Data transformed successfully")
-
-        if not process_full_data:
-            df = df[df["dat_ref"] == odate]
-            logger.info("Filtered SeuDinheiro data for date '%s': %d records", odate, len(df))
-
-        return df
+    return df
 
 
-def extract_transform_moneytimes(mapping_class: Dict[str, str], parameters: dict) -> pd.DataFrame:
+def extract_transform_moneytimes(mapping_class: Dict[str, str], parameters: dict) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
     """Extrai e transforma dados do MoneyTimes."""
     odate = parameters.get("odate")
     environment = parameters.get("environment", "production")
-    process_full_data = parameters.get("process_full_data", False)
-    logger.info("MoneyTimes - Odate: %s, Environment: %s, Full Data: %s", odate, environment, process_full_data)
+    mode = ingestion_mode(parameters)
+    logger.info("MoneyTimes - Odate: %s, Environment: %s, Mode: %s", odate, environment, mode)
 
     if environment == "test":
         return _make_dataframe_test_news(odate, "MoneyTimes")
 
-    max_pages = mapping_class.get("max_pages_full", 10) if process_full_data else mapping_class.get("max_pages", 5)
+    feed = _ingest_feed("MoneyTimes", mapping_class, parameters)
+    if feed is not None:
+        return feed
+
+    def parse_page(html: str) -> List[Dict[str, str]]:
+        return parse_moneytimes(html, mapping_class.get("class_item"), mapping_class.get("class_title"),
+                                mapping_class.get("class_date"), mapping_class.get("parser"))
+
+    recorder = get_payload_recorder(parameters)
+    agora = recorder.recorded_at if recorder is not None else datetime.now()
+    client = get_http_client(parameters.get("http_parms"), recorder)
+    if mode == "backfill":
+        return _backfill_news("MoneyTimes", mapping_class, parameters, client, parse_page,
+                              partial(data_relativa_para_absoluta, agora=agora),
+                              partial(_transform_moneytimes, agora=agora))
+
+    max_pages = mapping_class.get("max_pages", 5) if mode == "daily" else mapping_class.get("max_pages_full", 10)
+    cache_before = client.cache_stats()
+    stop_date = pagination_stop_date(mapping_class, parameters)
+    pages = client.iter_pages(paginate_urls(mapping_class, max_pages), ttl=mapping_class.get("cache_ttl"),
+                              lookahead=mapping_class.get("lookahead") if stop_date else None,
+                              deadline=ingestion_deadline(parameters))
+    pages_read, complete = 0, True
     all_data = []
 
-    for page in range(1, max_pages + 1):
-        url = f"{mapping_class.get('url')}{mapping_class.get('pattern_pages').replace('<number>', str(page))}"
+    for url, response in until_deadline(pages):
+        if response is None:
+            complete = False
+            break
+        pages_read += 1
         logger.info("Scraping page: %s", url)
 
-        data = scraping_moneytimes(
-            url,
-            mapping_class.get("class_item"),
-            mapping_class.get("class_title"),
-            mapping_class.get("class_date"),
-        )
+        data = parse_page(response.text)
         if not data:
             logger.info("No data found on page: %s", url)
             continue
 
         all_data.extend(data)
+        if stop_date and page_older_than(data, partial(data_relativa_para_absoluta, agora=agora), stop_date):
+            logger.info("Page older than '%s', stopping pagination: %s", stop_date, url)
+            break
 
+    logger.info("MoneyTimes - Pages read: %d, Pages skipped: %d", pages_read, max_pages - pages_read)
+    log_cache_stats("MoneyTimes", cache_before)
     df = pd.DataFrame(all_data)
     logger.info("Data collected successfully from URL: %s - Data collected: %d", mapping_class.get("url"), len(df))
 
+    df = _transform_moneytimes(df, agora)
+
+    if mode != "full":
+        window = resolve_date_window(mapping_class.get("csv_read"), parameters)
+        df = filter_date_window(df, window)
+        logger.info("Filtered MoneyTimes data for window %s: %d records", window, len(df))
+
+    return finish_ingestion(df, mapping_class.get("csv_read"), complete, parameters)
+
+
+def _transform_moneytimes(df: pd.DataFrame, agora: datetime) -> pd.DataFrame:
+    """Transformação das notícias do MoneyTimes (datas relativas a `agora`)."""
     if not df.empty:
-        df["dat_ref"] = df["dat_ref"].apply(data_relativa_para_absoluta)
+        df["dat_ref"] = data_relativa_para_absoluta_vetorizado(df["dat_ref"], agora)
         df = select_cast_midia(df)
-        df['dat_ref'].fillna(datetime.today().strftime('%Y-%m-%d'), inplace=True)  # para notícias recém publicadas
+        df['dat_ref'] = df['dat_ref'].fillna(agora.strftime('%Y-%m-%d'))  # para notícias recém publicadas
         logger.info("Data transformed successfully")
+    return df
 
-    if not process_full_data:
-        df = df[df["dat_ref"] == odate]
-        logger.info("Filtered MoneyTimes data for date '%s': %d records", odate, len(df))
 
-    return df
+def _ingest_feed(fonte: str, mapping_class: Dict[str, Any], parameters: dict) -> Optional[pd.DataFrame]:
+    """
+    Ingestão alternativa pelo feed RSS/Atom ou sitemap de notícias da fonte (`feed.url`).
+
+    Desativada por padrão: vale apenas com `feed.enabled` e nos modos `daily` e
+    `incremental` (os modos `full` e `backfill` precisam da paginação HTML). Categorias em
+    `feed.exclude_categories` são descartadas.
+
+    Args:
+        fonte (str): Nome da fonte gravado na coluna `fonte`.
+        mapping_class (Dict[str, Any]): Parâmetros da fonte.
+        parameters (dict): Parâmetros da execução.
+
+    Returns:
+        Optional[pd.DataFrame]: Notícias no esquema do staging, ou `None` quando o feed da
+        fonte não está ativado, falha ou não alcança o início da janela (o nó segue pelo
+        scraping HTML).
+
+    """
+    feed_parms = mapping_class.get("feed") or {}
+    url = feed_parms.get("url")
+    if not feed_parms.get("enabled", False) or not url or ingestion_mode(parameters) not in FEED_MODES:
+        return None
+
+    dataset_name = mapping_class.get("csv_read")
+    try:
+        data = scraping_feed(url, fonte, ttl=mapping_class.get("cache_ttl"), deadline=ingestion_deadline(parameters))
+    except DeadlineExceeded:
+        return finish_ingestion(pd.DataFrame(), dataset_name, False, parameters)
+    except (requests.exceptions.RequestException, ParseError) as error:
+        logger.warning("Feed unavailable for %s (%s), falling back to HTML scraping: %s", fonte, url, error)
+        return None
+
+    df = pd.DataFrame(data, columns=["fonte", "titulo", "dat_ref", "link", "categoria"])
+    window = resolve_date_window(dataset_name, parameters)
+    oldest = df["dat_ref"].dropna().min() if not df.empty else None
+    if oldest is None or pd.isna(oldest) or oldest > window[0]:
+        logger.info("Feed for %s does not reach %s (oldest item: %s), falling back to HTML scraping", fonte, window[0], oldest)
+        return None
+    logger.info("Data collected successfully from feed: %s - Data collected: %d", url, len(df))
+
+    df = df[~df["categoria"].isin(feed_parms.get("exclude_categories") or [])]
+    df = filter_date_window(select_cast_midia(df), window)
+    logger.info("Filtered %s feed data for window %s: %d records", fonte, window, len(df))
+    return finish_ingestion(df, dataset_name, True, parameters)
+
+
+def _backfill_news(source: str, mapping_class: Dict[str, Any], parameters: dict, client: HttpClient,
+                   parse_page: Callable[[str], List[Dict[str, str]]], parse_date: Callable[[str], Optional[str]],
+                   transform: Callable[[pd.DataFrame], pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """
+    Backfill de uma fonte paginada entre `backfill_start` e `backfill_end`.
+
+    Percorre até `max_pages_backfill` páginas com até `backfill_lookahead` requisições em
+    paralelo, parando na primeira página mais antiga que `backfill_start` (ou após
+    `backfill_empty_pages` páginas vazias seguidas). Cada página é salva em um
+    `BackfillCheckpoint`, e o resultado sai em blocos de `backfill_chunk_pages` páginas,
+    gravados pelo Kedro no dataset de staging a cada `yield`. Uma nova tentativa retoma da
+    última página buscada, sem regravar os blocos já salvos. Se o orçamento de tempo
+    (`ingestion_deadline`) se esgotar, o último bloco sai com `coleta_completa` falso e o
+    backfill fica pendente para a próxima execução.
+
+    Args:
+        source (str): Nome da fonte nos logs.
+        mapping_class (Dict[str, Any]): Parâmetros da fonte.
+        parameters (dict): Parâmetros da execução.
+        client (HttpClient): Cliente HTTP compartilhado.
+        parse_page (Callable[[str], List[Dict[str, str]]]): Extrai as notícias do HTML de uma página.
+        parse_date (Callable[[str], Optional[str]]): Converte a data de uma notícia para `YYYY-MM-DD`.
+        transform (Callable[[pd.DataFrame], pd.DataFrame]): Transformação das notícias coletadas.
+
+    Yields:
+        pd.DataFrame: Notícias do intervalo, em blocos.
+
+    """
+    window = resolve_date_window(mapping_class.get("csv_read"), parameters)
+    backfill_parms = parameters.get("backfill_parms") or {}
+    checkpoint = BackfillCheckpoint(backfill_parms.get("path", "data/backfill"), mapping_class.get("csv_read", source), *window)
+    if checkpoint.finished:
+        logger.info("%s - Backfill %s already finished (%d pages)", source, window, checkpoint.written)
+        return
+
+    max_pages = mapping_class.get("max_pages_backfill", 1000)
+    chunk_pages = mapping_class.get("backfill_chunk_pages", 50)
+    empty_limit = mapping_class.get("backfill_empty_pages", 3)
+    logger.info("%s - Backfill %s resuming at page %d (written: %d)", source, window, checkpoint.fetched + 1, checkpoint.written)
+
+    deadline = ingestion_deadline(parameters)
+    interrupted = False
+
+    def pages() -> Iterator[Tuple[int, List[Dict[str, str]]]]:
+        nonlocal interrupted
+        for number in range(checkpoint.written + 1, checkpoint.fetched + 1):
+            yield number, checkpoint.page(number)
+
+        first = checkpoint.fetched + 1
+        urls = paginate_urls(mapping_class, max_pages)[first - 1:]
+        for number, (url, response) in enumerate(until_deadline(
+                client.iter_pages(urls, ttl=mapping_class.get("cache_ttl"),
+                                  lookahead=mapping_class.get("backfill_lookahead"), deadline=deadline)), start=first):
+            if response is None:
+                interrupted = True
+                return
+            items = parse_page(response.text) if response.ok else []
+            checkpoint.save_page(number, items)
+            logger.info("%s - Backfill page %d: %d items (%s)", source, number, len(items), url)
+            yield number, items
+
+    pending: List[Dict[str, str]] = []
+    empty_run, number, finished = 0, checkpoint.written, False
+    with closing(pages()) as crawl:
+        for number, items in crawl:
+            pending.extend(items)
+            empty_run = 0 if items else empty_run + 1
+            finished = (bool(items) and page_older_than(items, parse_date, window[0])) or empty_run >= empty_limit
+            if number - checkpoint.written < chunk_pages and not finished:
+                continue
+
+            chunk = finish_ingestion(filter_date_window(transform(pd.DataFrame(pending)), window),
+                                     mapping_class.get("csv_read"), True, parameters)
+            pending = []
+            if not chunk.empty:
+                logger.info("%s - Backfill chunk up to page %d: %d records", source, number, len(chunk))
+                yield chunk
+            checkpoint.mark_written(number, finished)
+            if finished:
+                break
+
+    if not finished:
+        chunk = finish_ingestion(filter_date_window(transform(pd.DataFrame(pending)), window),
+                                 mapping_class.get("csv_read"), not interrupted, parameters)
+        if not chunk.empty:
+            yield chunk
+        checkpoint.mark_written(number, finished=not interrupted)
+    logger.info("%s - Backfill %s %s at page %d", source, window, "interrupted" if interrupted else "finished", number)
 
 
 def _make_dataframe_test_news(odate: str, context) -> pd.DataFrame:
@@ -0,0 +1,131 @@
+""" Versões vetorizadas dos parsers de texto usados nas transformações
+de ingestão. Produzem o mesmo resultado das funções linha a linha de `utils`
+(`extrair_campos`, `extrair_data_url`, `parse_data_portugues`,
+`data_relativa_para_absoluta`), mas operam sobre a coluna inteira.
+
+Pipeline: data_ingestion
+"""
+import io
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+import pandas as pd
+from .utils import data_relativa_para_absoluta
+
+CAMPOS_PATTERN = re.compile(r"^(.+?)\s{2,}(.+?)\s{2,}(.+?)(?=\s{2,}|$)", re.DOTALL)
+DATA_URL_PATTERN = re.compile(r"/(\d{4}/\d{2}/\d{2})/")
+DATA_PORTUGUES_PATTERN = re.compile(r"(\d{1,2}) de (\w+) de (\d{4})")
+
+MESES: Dict[str, str] = {
+    "janeiro": "01", "fevereiro": "02", "março": "03", "abril": "04",
+    "maio": "05", "junho": "06", "julho": "07", "agosto": "08",
+    "setembro": "09", "outubro": "10", "novembro": "11", "dezembro": "12"
+}
+
+
+def extrair_campos_vetorizado(textos: pd.Series) -> pd.DataFrame:
+    """
+    Separa categoria, título e data de publicação dos blocos do InfoMoney.
+
+    Blocos com três ou mais partes separadas por dois ou mais espaços usam as três
+    primeiras; os demais usam a primeira palavra como categoria e as três últimas
+    como data.
+
+    Args:
+        textos (pd.Series): Texto bruto de cada bloco.
+
+    Returns:
+        pd.DataFrame: Colunas `categoria`, `titulo` e `data_publicacao`, no índice de `textos`.
+
+    """
+    textos = textos.str.strip()
+    campos = textos.str.extract(CAMPOS_PATTERN)
+    campos.columns = ["categoria", "titulo", "data_publicacao"]
+
+    sem_partes = campos["categoria"].isna()
+    if sem_partes.any():
+        palavras = textos[sem_partes].str.split()
+        campos.loc[sem_partes, "categoria"] = palavras.str[0]
+        campos.loc[sem_partes, "titulo"] = palavras.str[1:-3].str.join(" ")
+        campos.loc[sem_partes, "data_publicacao"] = palavras.str[-3:].str.join(" ")
+
+    return campos
+
+
+def extrair_data_url_vetorizado(links: pd.Series) -> pd.Series:
+    """Extrai `YYYY/MM/DD` do caminho de cada link (`None` quando não houver)."""
+    datas = links.str.extract(DATA_URL_PATTERN, expand=False)
+    return datas.astype(object).where(datas.notna(), None)
+
+
+def parse_data_portugues_vetorizado(textos: pd.Series) -> pd.Series:
+    """
+    Converte datas como `3 de março de 2025` para `YYYY-MM-DD` (`None` quando inválidas).
+
+    Cada texto distinto é convertido uma única vez.
+    """
+    unicos = pd.Series(textos.unique())
+    partes = unicos.str.extract(DATA_PORTUGUES_PATTERN)
+    meses = partes[1].str.lower().map(MESES)
+    datas = partes[2] + "-" + meses + "-" + partes[0].str.zfill(2)
+    convertidas = dict(zip(unicos, datas.astype(object).where(datas.notna(), None)))
+    return textos.map(convertidas).astype(object)
+
+
+def data_relativa_para_absoluta_vetorizado(textos: pd.Series, agora: Optional[datetime] = None) -> pd.Series:
+    """
+    Converte datas relativas (`há 3 horas`, `há 2 dias`) para `YYYY-MM-DD`.
+
+    Cada texto distinto é convertido uma única vez, com o mesmo `agora` para toda a coluna.
+    """
+    agora = agora or datetime.now()
+    convertidas = {texto: data_relativa_para_absoluta(texto, agora) for texto in textos.unique()}
+    return textos.map(convertidas).astype(object)
+
+
+def _converter_coluna(valores: pd.Series, percentual: bool, replace_decimal: bool) -> pd.Series:
+    """Conversão coluna a coluna, usada quando o parser de CSV não reconhece todos os valores."""
+    valores = valores.astype(str).where(valores.notna())
+    if percentual:
+        valores = valores.str.replace("%", "", regex=False)
+    if replace_decimal:
+        valores = valores.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    return pd.to_numeric(valores, errors="coerce")
+
+
+def converter_numerico(df: pd.DataFrame, columns: List[str], replace_decimal: bool = False) -> pd.DataFrame:
+    """
+    Converte as colunas textuais da tabela para número em uma única leitura.
+
+    As colunas são lidas de uma vez pelo parser C do pandas (`decimal=","` e
+    `thousands="."` quando `replace_decimal`), depois de remover o `%` de
+    `change_percentage`. Colunas que o parser não converte por inteiro caem na
+    conversão coluna a coluna, em que valores inválidos viram `NaN`.
+
+    Args:
+        df (pd.DataFrame): Tabela com as colunas em texto.
+        columns (List[str]): Colunas a converter.
+        replace_decimal (bool): Indica se os números usam o formato brasileiro (`1.234,56`).
+
+    Returns:
+        pd.DataFrame: A mesma tabela com `columns` numéricas.
+
+    """
+    df = df.copy()
+    if not columns or df.empty:
+        return df
+
+    texto = df[columns].to_csv(sep=";", header=False, index=False)
+    if "change_percentage" in columns:
+        texto = texto.replace("%", "")
+    numeros = pd.read_csv(io.StringIO(texto), sep=";", header=None, names=columns,
+                          decimal="," if replace_decimal else ".", thousands="." if replace_decimal else None,
+                          keep_default_na=False, na_values=[""])
+
+    for col in columns:
+        if pd.api.types.is_numeric_dtype(numeros[col]) and not pd.api.types.is_bool_dtype(numeros[col]):
+            df[col] = numeros[col].to_numpy()
+        else:
+            df[col] = _converter_coluna(df[col], col == "change_percentage", replace_decimal)
+
+    return df
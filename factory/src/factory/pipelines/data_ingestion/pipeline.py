@@ -2,6 +2,10 @@
 This is a boilerplate pipeline 'data_ingestion'
 generated using Kedro 0.19.14
 """
+from pathlib import Path
+from typing import List
+from kedro.config import OmegaConfigLoader
+from kedro.framework.project import settings
 from kedro.pipeline import node, Pipeline, pipeline
 from .nodes import (
     extract_transform_html_table,
@@ -13,6 +17,20 @@ from .nodes import (
 )
 
 
+def yf_outputs() -> List[str]:
+    """
+    Datasets de saída do etl_yf_node: as chaves do parâmetro `yf_tickers`.
+
+    Lidas da configuração do projeto (`conf/base` e o ambiente padrão) ao montar o
+    pipeline; os parâmetros passados na execução (`--params`) não mudam as saídas.
+    """
+    loader = OmegaConfigLoader(str(Path.cwd() / settings.CONF_SOURCE), **settings.CONFIG_LOADER_ARGS)
+    tickers = loader["parameters"].get("yf_tickers")
+    if not tickers:
+        raise ValueError("Parâmetro yf_tickers ausente na configuração (dataset de saída -> ticker)")
+    return list(tickers)
+
+
 def create_pipeline(**kwargs) -> Pipeline:
     """Pipeline principal de extração e transformação."""
     return pipeline(
@@ -25,15 +43,9 @@ def create_pipeline(**kwargs) -> Pipeline:
             ),
             node(
                 func=extract_transform_api_yf,
-                inputs=["params:ibov_ticker", "params:columns_mapping_yf", "parameters"],
-                outputs="rw_ibov_stage",
-                name="etl_ibov_node",
-            ),
-            node(
-                func=extract_transform_api_yf,
-                inputs=["params:ivvb11_ticker", "params:columns_mapping_yf", "parameters"],
-                outputs="rw_ivvb_stage",
-                name="etl_ivvb11_vix_brasil_node",
+                inputs=["params:yf_tickers", "params:columns_mapping_yf", "params:yf_history_parms", "parameters"],
+                outputs={output: output for output in yf_outputs()},
+                name="etl_yf_node",
             ),
             node(
                 func=extract_transform_html_table,
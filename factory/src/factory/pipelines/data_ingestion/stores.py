@@ -0,0 +1,372 @@
+""" Armazenamentos locais usados pelos nós de ingestão para evitar
+downloads repetidos entre execuções.
+
+Pipeline: data_ingestion
+"""
+import os
+import re
+import json
+import time
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class YahooHistoryStore:
+    """
+    Histórico local por ticker do Yahoo Finance.
+
+    Cada ticker tem um CSV com as cotações e o checksum de cada linha e um JSON com a
+    última data armazenada. As execuções buscam apenas a cauda a partir de alguns dias
+    antes dessa data; as linhas sobrepostas (exceto a última, que pode ter sido gravada
+    com o pregão em andamento) são comparadas pelo checksum para detectar revisões do
+    provedor.
+
+    Args:
+        path (str): Diretório do histórico.
+        overlap_days (int): Dias antes da última data armazenada incluídos na busca.
+
+    """
+
+    PRICE_COLUMNS = ["Adj Close", "Close", "High", "Low", "Open", "Volume"]
+
+    def __init__(self, path: str, overlap_days: int = 7):
+        self.path = path
+        self.overlap_days = overlap_days
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, ticker: str, extension: str) -> str:
+        return os.path.join(self.path, f"{re.sub(r'[^A-Za-z0-9_.-]', '_', ticker)}.{extension}")
+
+    @classmethod
+    def checksums(cls, frame: pd.DataFrame) -> pd.Series:
+        """Checksum de cada linha (preços arredondados para ignorar ruído de ponto flutuante)."""
+        columns = [col for col in cls.PRICE_COLUMNS if col in frame.columns]
+        hashes = pd.util.hash_pandas_object(frame[columns].astype(float).round(6), index=False)
+        return hashes.map("{:016x}".format)
+
+    def metadata(self, ticker: str) -> Dict[str, Any]:
+        """Metadados do ticker (`last_date`, `rows`) ou `{}` se ainda não houver histórico."""
+        if not os.path.exists(self._file(ticker, "json")):
+            return {}
+        with open(self._file(ticker, "json"), encoding="utf-8") as meta:
+            return json.load(meta)
+
+    def next_start(self, ticker: str) -> Optional[str]:
+        """Data a partir da qual buscar a cauda (com `overlap_days` de sobreposição) ou `None`."""
+        last_date = self.metadata(ticker).get("last_date")
+        if last_date is None:
+            return None
+        return (pd.Timestamp(last_date) - pd.Timedelta(days=self.overlap_days)).strftime("%Y-%m-%d")
+
+    def history(self, ticker: str, start: Optional[str] = None) -> pd.DataFrame:
+        """Histórico armazenado, indexado por `Date`, opcionalmente a partir de `start`."""
+        if not os.path.exists(self._file(ticker, "csv")):
+            return pd.DataFrame(columns=self.PRICE_COLUMNS, index=pd.DatetimeIndex([], name="Date"))
+
+        frame = pd.read_csv(self._file(ticker, "csv"), index_col="Date", parse_dates=["Date"])
+        frame = frame.drop(columns="checksum")
+        return frame[frame.index >= pd.Timestamp(start)] if start else frame
+
+    def update(self, ticker: str, tail: pd.DataFrame, replace: bool = False) -> bool:
+        """
+        Incorpora a cauda baixada ao histórico do ticker.
+
+        Args:
+            ticker (str): Ticker do Yahoo Finance.
+            tail (pd.DataFrame): Cotações indexadas por data (colunas de `PRICE_COLUMNS`).
+            replace (bool): Substitui o histórico inteiro em vez de anexar.
+
+        Returns:
+            bool: `False` se alguma linha sobreposta divergir do checksum armazenado
+            (histórico revisado pelo provedor); nesse caso nada é gravado.
+
+        """
+        tail = tail.dropna(how="all")
+        tail = tail[[col for col in self.PRICE_COLUMNS if col in tail.columns]]
+        tail.index = pd.DatetimeIndex(tail.index, name="Date").tz_localize(None)
+        tail = tail.assign(checksum=self.checksums(tail).values)
+
+        if not replace and os.path.exists(self._file(ticker, "csv")):
+            stored = pd.read_csv(self._file(ticker, "csv"), index_col="Date", parse_dates=["Date"])
+            overlap = stored.index.intersection(tail.index).drop(stored.index.max(), errors="ignore")
+            if (stored.loc[overlap, "checksum"] != tail.loc[overlap, "checksum"]).any():
+                logger.info("Histórico de %s revisado pelo provedor em %s", ticker, list(overlap.strftime("%Y-%m-%d")))
+                return False
+            tail = pd.concat([stored[~stored.index.isin(tail.index)], tail]).sort_index()
+
+        if tail.empty:
+            return True
+
+        tail.to_csv(self._file(ticker, "csv"), index_label="Date", date_format="%Y-%m-%d")
+        with open(self._file(ticker, "json"), "w", encoding="utf-8") as meta:
+            json.dump({"last_date": tail.index.max().strftime("%Y-%m-%d"), "rows": len(tail)}, meta)
+        return True
+
+
+class WatermarkStore:
+    """
+    Registro das marcas d'água de ingestão por dataset de staging.
+
+    Cada dataset tem um JSON com o `dat_ref` mais recente já gravado e o hash do
+    conteúdo da última gravação. O modo `incremental` busca apenas o intervalo entre
+    essa data e o `odate`, o que permite recuperar dias perdidos em uma única execução.
+
+    Args:
+        path (str): Diretório das marcas d'água.
+
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, dataset_name: str) -> str:
+        return os.path.join(self.path, f"{re.sub(r'[^A-Za-z0-9_.-]', '_', dataset_name)}.json")
+
+    @staticmethod
+    def content_hash(frame: pd.DataFrame) -> str:
+        """Hash do conteúdo do DataFrame, independente da ordem das linhas."""
+        hashes = pd.util.hash_pandas_object(frame.astype(str), index=False)
+        return f"{int(hashes.sort_values().sum()) & 0xFFFFFFFFFFFFFFFF:016x}"
+
+    def get(self, dataset_name: str) -> Dict[str, Any]:
+        """Marca d'água do dataset (`dat_ref`, `content_hash`, `rows`, `updated_at`) ou `{}`."""
+        if not os.path.exists(self._file(dataset_name)):
+            return {}
+        with open(self._file(dataset_name), encoding="utf-8") as mark:
+            return json.load(mark)
+
+    def advance(self, dataset_name: str, frame: pd.DataFrame) -> bool:
+        """
+        Avança a marca d'água com os dados gravados no dataset.
+
+        A data nunca retrocede: gravações de intervalos antigos (reprocessamentos) apenas
+        atualizam o hash quando alcançam a data registrada.
+
+        Args:
+            dataset_name (str): Nome do dataset no catálogo.
+            frame (pd.DataFrame): Dados gravados, com a coluna `dat_ref`.
+
+        Returns:
+            bool: `True` se o conteúdo difere da última gravação registrada.
+
+        """
+        dat_ref = pd.to_datetime(frame["dat_ref"], errors="coerce").max()
+        if pd.isna(dat_ref):
+            return False
+
+        current = self.get(dataset_name)
+        content_hash = self.content_hash(frame)
+        changed = content_hash != current.get("content_hash")
+        if current.get("dat_ref") and dat_ref.strftime("%Y-%m-%d") < current["dat_ref"]:
+            return changed
+
+        mark = {
+            "dat_ref": dat_ref.strftime("%Y-%m-%d"),
+            "content_hash": content_hash,
+            "rows": len(frame),
+            "updated_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+        }
+        tmp_file = f"{self._file(dataset_name)}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as tmp:
+            json.dump(mark, tmp)
+        os.replace(tmp_file, self._file(dataset_name))
+        return changed
+
+    def partial_dates(self, dataset_name: str) -> List[str]:
+        """Datas (`YYYY-MM-DD`) cuja coleta mais recente do dataset foi parcial."""
+        if not os.path.exists(self._file(f"{dataset_name}.partial")):
+            return []
+        with open(self._file(f"{dataset_name}.partial"), encoding="utf-8") as partial:
+            return json.load(partial)
+
+    def mark_completeness(self, dataset_name: str, dat_refs: Iterable[str], complete: bool) -> None:
+        """
+        Registra se a coleta de cada `dat_ref` do dataset foi completa.
+
+        Fica fora do dataset de staging, cuja deduplicação pode descartar as linhas de uma
+        nova coleta: uma coleta completa posterior sempre remove a marca de parcial da data.
+
+        Args:
+            dataset_name (str): Nome do dataset no catálogo.
+            dat_refs (Iterable[str]): Datas coletadas (`YYYY-MM-DD`).
+            complete (bool): `False` quando o orçamento de tempo interrompeu a coleta.
+
+        """
+        dates = set(self.partial_dates(dataset_name))
+        dates = dates - set(dat_refs) if complete else dates | set(dat_refs)
+        tmp_file = f"{self._file(f'{dataset_name}.partial')}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as tmp:
+            json.dump(sorted(dates), tmp)
+        os.replace(tmp_file, self._file(f"{dataset_name}.partial"))
+
+
+class BackfillCheckpoint:
+    """
+    Checkpoints por página do backfill de uma fonte paginada.
+
+    Cada página buscada é gravada em disco com as notícias extraídas, e o estado guarda
+    quantas páginas já foram buscadas (`fetched`) e quantas já foram gravadas no dataset
+    de staging (`written`). Uma nova tentativa do mesmo intervalo retoma da página
+    seguinte à última buscada, sem repetir as já gravadas.
+
+    Args:
+        path (str): Diretório raiz dos checkpoints.
+        dataset_name (str): Dataset de staging da fonte.
+        start (str): Data inicial do backfill (`YYYY-MM-DD`).
+        end (str): Data final do backfill (`YYYY-MM-DD`).
+
+    """
+
+    def __init__(self, path: str, dataset_name: str, start: str, end: str):
+        self.path = os.path.join(path, re.sub(r'[^A-Za-z0-9_.-]', '_', dataset_name), f"{start}_{end}")
+        os.makedirs(self.path, exist_ok=True)
+        self.state: Dict[str, Any] = {"fetched": 0, "written": 0, "finished": False}
+        if os.path.exists(self._file("state")):
+            with open(self._file("state"), encoding="utf-8") as state:
+                self.state.update(json.load(state))
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.json")
+
+    def _dump(self, name: str, content: Any) -> None:
+        tmp_file = f"{self._file(name)}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as tmp:
+            json.dump(content, tmp, ensure_ascii=False)
+        os.replace(tmp_file, self._file(name))
+
+    @property
+    def fetched(self) -> int:
+        """Última página buscada (as anteriores também estão em disco)."""
+        return self.state["fetched"]
+
+    @property
+    def written(self) -> int:
+        """Última página cujas notícias já foram gravadas no dataset."""
+        return self.state["written"]
+
+    @property
+    def finished(self) -> bool:
+        """Indica se o intervalo já foi totalmente coletado e gravado."""
+        return self.state["finished"]
+
+    def page(self, number: int) -> List[Dict[str, str]]:
+        """Notícias extraídas de uma página já buscada."""
+        with open(self._file(f"page-{number:05d}"), encoding="utf-8") as page:
+            return json.load(page)
+
+    def save_page(self, number: int, items: List[Dict[str, str]]) -> None:
+        """Grava as notícias da página e avança `fetched`."""
+        self._dump(f"page-{number:05d}", items)
+        self.state["fetched"] = max(self.state["fetched"], number)
+        self._dump("state", self.state)
+
+    def mark_written(self, number: int, finished: bool = False) -> None:
+        """Registra que as páginas até `number` já estão no dataset de staging."""
+        self.state["written"] = max(self.state["written"], number)
+        self.state["finished"] = finished
+        self._dump("state", self.state)
+
+
+class SourceHealthStore:
+    """
+    Saúde de cada fonte de dados entre execuções.
+
+    Cada fonte (identificada pela URL) tem um JSON com sucessos, falhas, falhas
+    consecutivas, latência média e o instante em que o circuito foi aberto, usado pelo
+    `SourceFailover` para ordenar as fontes e pular as que estão fora do ar.
+
+    Args:
+        path (str): Diretório dos arquivos de saúde.
+
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, source: str) -> str:
+        return os.path.join(self.path, f"{hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]}.json")
+
+    def get(self, source: str) -> Dict[str, Any]:
+        """Saúde registrada da fonte (com os valores iniciais se ainda não houver registro)."""
+        health = {"source": source, "successes": 0, "failures": 0, "consecutive_failures": 0,
+                  "success_rate": 1.0, "latency": None, "last_success": None, "last_failure": None, "opened_at": None}
+        if os.path.exists(self._file(source)):
+            with open(self._file(source), encoding="utf-8") as stored:
+                health.update(json.load(stored))
+        return health
+
+    def put(self, source: str, health: Dict[str, Any]) -> None:
+        """Grava a saúde da fonte."""
+        tmp_file = f"{self._file(source)}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as tmp:
+            json.dump(health, tmp)
+        os.replace(tmp_file, self._file(source))
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Saúde de todas as fontes registradas."""
+        health = []
+        for name in sorted(os.listdir(self.path)):
+            if name.endswith(".json"):
+                with open(os.path.join(self.path, name), encoding="utf-8") as stored:
+                    health.append(json.load(stored))
+        return health
+
+
+class IngestionRunStore:
+    """
+    Estado de uma execução do estágio de ingestão, compartilhado entre os nós (tasks).
+
+    Guarda o instante em que o primeiro nó do estágio começou (base do orçamento do
+    estágio) e, por dataset de staging, se a coleta foi completa ou interrompida pelo
+    orçamento de tempo. A completude por `dat_ref`, consultada pelos indicadores, fica no
+    `WatermarkStore`, que persiste entre execuções.
+
+    Args:
+        path (str): Diretório raiz das execuções.
+        run_id (str): Identificador da tentativa (`ingestion_run_id`: `run_id` e `try_number`
+            do Airflow ou `odate` e sessão do Kedro).
+
+    """
+
+    def __init__(self, path: str, run_id: str):
+        self.path = os.path.join(path, re.sub(r'[^A-Za-z0-9_.-]', '_', str(run_id)))
+        os.makedirs(self.path, exist_ok=True)
+
+    def started_at(self) -> float:
+        """Início do estágio (`time.time`), registrado pelo primeiro nó que o consultar."""
+        start_file = os.path.join(self.path, "_started")
+        tmp_file = f"{start_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as tmp:
+            tmp.write(repr(time.time()))
+        try:
+            os.link(tmp_file, start_file)  # cria apenas se ainda não existir, já com o conteúdo
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp_file)
+        with open(start_file, encoding="utf-8") as start:
+            return float(start.read())
+
+    def mark(self, dataset_name: str, complete: bool, rows: int) -> None:
+        """Registra o resultado da coleta de um dataset."""
+        tmp_file = os.path.join(self.path, f"{dataset_name}.json.{os.getpid()}.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as tmp:
+            json.dump({"dataset": dataset_name, "complete": complete, "rows": rows}, tmp)
+        os.replace(tmp_file, os.path.join(self.path, f"{dataset_name}.json"))
+
+    def partial(self) -> List[str]:
+        """Datasets cuja coleta foi interrompida pelo orçamento de tempo."""
+        partial = []
+        for name in sorted(os.listdir(self.path)):
+            if name.endswith(".json"):
+                with open(os.path.join(self.path, name), encoding="utf-8") as status_file:
+                    status = json.load(status_file)
+                if not status["complete"]:
+                    partial.append(status["dataset"])
+        return partial
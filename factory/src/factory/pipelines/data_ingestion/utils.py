@@ -3,55 +3,1050 @@ de páginas web, bem como para transformar esses dados em um formato adequado pa
 
 Pipeline: data_ingestion
 """
+import io
+import os
+import codecs
 import re
-from typing import Dict, List
-from time import sleep as time_sleep
+import json
+import random
+import sqlite3
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from time import monotonic, time as time_now, sleep as time_sleep
+from urllib.parse import urlparse
+from email.utils import parsedate_to_datetime
+from xml.etree.ElementTree import iterparse
+from html.parser import HTMLParser
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.request import ACCEPT_ENCODING
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+from datetime import datetime, timedelta, timezone
 import pandas as pd
 import logging
+from .stores import IngestionRunStore, SourceHealthStore, WatermarkStore
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_HTML_PARSER = "html.parser"
+TABLE_SIGNATURES = ({'Date', 'Price'}, {'Data', 'Último'})
+INGESTION_MODES = ("daily", "incremental", "full", "backfill")
+FEED_MODES = ("daily", "incremental")
+STREAM_CHUNK_SIZE = 16 * 1024
+FUSO_BRASILIA = timezone(timedelta(hours=-3))
+# sessão dos nós executados fora de uma sessão do Kedro (sem `session_id` nos parâmetros)
+PROCESS_SESSION = f"{datetime.now():%Y%m%dT%H%M%S}-{os.getpid()}"
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """O prazo da execução (`ingestion_deadline`: orçamento do nó ou do estágio) se esgotou."""
+
+
+class SourceBudgetExceeded(requests.exceptions.Timeout):
+    """
+    O orçamento de tempo de uma fonte (`source_budget`) se esgotou.
+
+    É uma falha da fonte (lenta ou instável), tratada como erro de coleta e não como o fim
+    do prazo da execução: não é um `DeadlineExceeded`.
+    """
+
+
+class TokenBucket:
+    """
+    Limitador de taxa no modelo token bucket, seguro para uso entre threads.
+
+    Args:
+        rate (float): Tokens repostos por segundo.
+        capacity (float): Quantidade máxima de tokens acumulados (rajada permitida).
+
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate = float(rate)
+        self._capacity = max(float(capacity), 1.0)
+        self._tokens = self._capacity
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Bloqueia até que um token esteja disponível e o consome."""
+        if self._rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time_sleep(wait)
+
+
+class ResponseCache:
+    """
+    Cache persistente de respostas HTTP em disco, compartilhável entre execuções.
+
+    Os corpos ficam em arquivos sob `path` e o índice em SQLite, o que permite que várias
+    tasks do Airflow no mesmo worker usem o mesmo cache. A chave é a URL mais os
+    cabeçalhos da requisição; a remoção é LRU quando o total ultrapassa `max_bytes`.
+
+    Args:
+        path (str): Diretório do cache.
+        max_bytes (int): Tamanho máximo dos corpos armazenados.
+        offline (bool): Serve qualquer entrada armazenada, sem rede e sem checar TTL.
+
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, offline: bool = False):
+        self.path = path
+        self.max_bytes = int(max_bytes)
+        self.offline = bool(offline)
+        self.stats: Dict[str, int] = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, url TEXT, size INTEGER, "
+                "etag TEXT, last_modified TEXT, encoding TEXT, headers TEXT, stored_at REAL, last_access REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(os.path.join(self.path, "index.sqlite"), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def key(url: str, headers: Optional[Dict[str, str]] = None) -> str:
+        """Chave da entrada: hash da URL e dos cabeçalhos ordenados."""
+        raw = json.dumps([url, sorted((headers or {}).items())], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key)
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retorna os metadados da entrada (com `age` em segundos) ou `None`."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT url, etag, last_modified, encoding, headers, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or not os.path.exists(self._body_path(key)):
+            return None
+
+        url, etag, last_modified, encoding, headers, stored_at = row
+        return {"key": key, "url": url, "etag": etag, "last_modified": last_modified, "encoding": encoding,
+                "headers": json.loads(headers), "age": time_now() - stored_at}
+
+    def load(self, entry: Dict[str, Any]) -> requests.Response:
+        """Reconstrói um `requests.Response` a partir de uma entrada e atualiza seu último acesso."""
+        with open(self._body_path(entry["key"]), "rb") as body:
+            content = body.read()
+        with self._connect() as conn:
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time_now(), entry["key"]))
+
+        response = requests.Response()
+        response._content = content  # pylint: disable=protected-access
+        response.status_code = 200
+        response.url = entry["url"]
+        response.encoding = entry["encoding"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        return response
+
+    def refresh(self, entry: Dict[str, Any]) -> None:
+        """Marca uma entrada revalidada (HTTP 304) como recém-armazenada."""
+        with self._connect() as conn:
+            conn.execute("UPDATE entries SET stored_at = ? WHERE key = ?", (time_now(), entry["key"]))
+
+    def store(self, key: str, response: requests.Response) -> None:
+        """Armazena uma resposta 200 e aplica a remoção LRU se o limite for excedido."""
+        body_path = self._body_path(key)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        tmp_path = f"{body_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as body:
+            body.write(response.content)
+        os.replace(tmp_path, body_path)
+
+        now = time_now()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, len(response.content), response.headers.get("ETag"),
+                 response.headers.get("Last-Modified"), response.encoding,
+                 json.dumps(dict(response.headers)), now, now),
+            )
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._connect() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                try:
+                    os.remove(self._body_path(key))
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def count(self, event: str) -> None:
+        """Incrementa um contador de `stats` (hits, revalidated, misses)."""
+        with self._lock:
+            self.stats[event] += 1
+
+
+class PayloadRecorder:
+    """
+    Gravação e reprodução dos payloads brutos de uma execução de ingestão.
+
+    No modo `record` cada resposta HTTP e cada DataFrame do yfinance é salvo sob `path`;
+    no modo `replay` os mesmos payloads são devolvidos sem acesso à rede, passando pelos
+    mesmos parsers e transformações da execução real. As respostas HTTP são indexadas
+    pela URL e cabeçalhos (como no `ResponseCache`) e os DataFrames pela ordem das chamadas.
+    O instante da gravação (`recorded_at`) é a referência para as datas relativas na reprodução.
+
+    Args:
+        path (str): Diretório da gravação.
+        mode (str): `record` ou `replay`.
 
-def scraping(url: str, headers: Dict[str, str]) -> List[List[str]]:
+    """
+
+    MODES = ("record", "replay")
+
+    def __init__(self, path: str, mode: str):
+        if mode not in self.MODES:
+            raise ValueError(f"Modo de gravação inválido: {mode} (esperado um de {self.MODES})")
+        self.path = path
+        self.mode = mode
+        self._calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(path, "http"), exist_ok=True)
+        os.makedirs(os.path.join(path, "frames"), exist_ok=True)
+
+        manifest_path = os.path.join(path, "recording.json")
+        if self.replaying and os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as manifest:
+                self.recorded_at = datetime.fromisoformat(json.load(manifest)["recorded_at"])
+        else:
+            self.recorded_at = datetime.now()
+        if not self.replaying:
+            with open(manifest_path, "w", encoding="utf-8") as manifest:
+                json.dump({"recorded_at": self.recorded_at.isoformat(timespec="seconds")}, manifest)
+
+    @property
+    def replaying(self) -> bool:
+        """Indica se os payloads vêm da gravação em vez da rede."""
+        return self.mode == "replay"
+
+    def _http_path(self, url: str, headers: Optional[Dict[str, str]], extension: str) -> str:
+        return os.path.join(self.path, "http", f"{ResponseCache.key(url, headers)}.{extension}")
+
+    def record_response(self, url: str, headers: Optional[Dict[str, str]], response: requests.Response) -> None:
+        """Salva o corpo e os metadados de uma resposta HTTP."""
+        with open(self._http_path(url, headers, "body"), "wb") as body:
+            body.write(response.content)
+        with open(self._http_path(url, headers, "json"), "w", encoding="utf-8") as meta:
+            json.dump({"url": response.url or url, "status_code": response.status_code, "encoding": response.encoding,
+                       "headers": dict(response.headers)}, meta)
+
+    def replay_response(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        Reconstrói a resposta gravada para a URL.
+
+        Raises:
+            requests.exceptions.ConnectionError: Se a URL não foi gravada.
+
+        """
+        if not os.path.exists(self._http_path(url, headers, "json")):
+            raise requests.exceptions.ConnectionError(f"Gravação sem resposta para: {url}")
+
+        with open(self._http_path(url, headers, "json"), encoding="utf-8") as meta:
+            entry = json.load(meta)
+        with open(self._http_path(url, headers, "body"), "rb") as body:
+            content = body.read()
+
+        response = requests.Response()
+        response._content = content  # pylint: disable=protected-access
+        response.status_code = entry["status_code"]
+        response.url = entry["url"]
+        response.encoding = entry["encoding"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        return response
+
+    def frame(self, name: str, fetch: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Executa `fetch` gravando o resultado ou devolve o DataFrame gravado na mesma posição.
+
+        Args:
+            name (str): Nome da chamada (ex.: `yf_download`); cada chamada recebe um sequencial.
+            fetch (Callable[[], pd.DataFrame]): Chamada real, usada apenas no modo `record`.
+
+        Returns:
+            pd.DataFrame: Resultado da chamada real ou da gravação.
+
+        """
+        with self._lock:
+            sequence = self._calls.get(name, 0)
+            self._calls[name] = sequence + 1
+        frame_path = os.path.join(self.path, "frames", f"{name}-{sequence:04d}.pkl")
+
+        if self.replaying:
+            if not os.path.exists(frame_path):
+                raise requests.exceptions.ConnectionError(f"Gravação sem payload para: {name} #{sequence}")
+            return pd.read_pickle(frame_path)
+
+        frame = fetch()
+        frame.to_pickle(frame_path)
+        return frame
+
+
+_RECORDER: Optional[PayloadRecorder] = None
+_RECORDER_KEY: Optional[Tuple[str, str, str]] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_payload_recorder(parameters: Dict[str, Any]) -> Optional[PayloadRecorder]:
+    """
+    Gravador de payloads da execução quando `environment` é `record` ou `replay`.
+
+    A gravação fica em `recording_parms.path/<name>`, onde `name` é `recording_parms.name`
+    ou, por padrão, o `odate` (uma gravação por data de referência). O gravador vale para
+    a execução corrente (`ingestion_run_id`), como o cliente de `get_http_client`: uma nova
+    execução no mesmo processo recria o gravador e recomeça a sequência dos DataFrames.
+
+    Returns:
+        Optional[PayloadRecorder]: Gravador compartilhado pelos nós da execução ou `None`.
+
+    """
+    global _RECORDER, _RECORDER_KEY  # pylint: disable=global-statement
+    mode = parameters.get("environment")
+    if mode not in PayloadRecorder.MODES:
+        return None
+
+    recording_parms = parameters.get("recording_parms") or {}
+    path = os.path.join(recording_parms.get("path", "data/recordings"), str(recording_parms.get("name") or parameters.get("odate")))
+    key = (path, mode, ingestion_run_id(parameters))
+    with _REGISTRY_LOCK:
+        if _RECORDER is None or _RECORDER_KEY != key:
+            _RECORDER, _RECORDER_KEY = PayloadRecorder(path, mode), key
+            logger.info("Payload recording (%s) at: %s", mode, path)
+        return _RECORDER
+
+
+class HttpClient:
+    """
+    Cliente HTTP compartilhado pelos helpers de ingestão.
+
+    Mantém uma `requests.Session` com pool de conexões keep-alive, limita a concorrência
+    por host e a taxa global de requisições (token bucket), refaz requisições com
+    backoff exponencial e jitter e permite buscar várias páginas de uma mesma fonte
+    em paralelo, preservando a ordem.
+
+    Args:
+        http_parms (Dict[str, Any]): Configuração `http_parms` de `parameters_data_ingestion.yml`.
+        recorder (Optional[PayloadRecorder]): Grava as respostas (`record`) ou as serve sem rede (`replay`).
+
+    """
+
+    def __init__(self, http_parms: Optional[Dict[str, Any]] = None, recorder: Optional[PayloadRecorder] = None):
+        http_parms = http_parms or {}
+        self.recorder = recorder
+        retry_parms = http_parms.get("retry", {}) or {}
+        self._max_workers: int = max(int(http_parms.get("max_workers", 4)), 1)
+        self._max_per_host: int = max(int(http_parms.get("max_per_host", 2)), 1)
+        self._timeout: float = http_parms.get("timeout", 60)
+        self._bucket = TokenBucket(http_parms.get("rate_per_second", 2.0), http_parms.get("burst", self._max_per_host))
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+        self._retries: int = max(int(retry_parms.get("total", 3)), 0)
+        self._backoff_base: float = float(retry_parms.get("backoff_base", 1.0))
+        self._backoff_max: float = float(retry_parms.get("backoff_max", 30.0))
+        self._retry_status = frozenset(retry_parms.get("status_forcelist", [429, 500, 502, 503, 504]))
+        self._budget: float = float(http_parms.get("source_budget", 300))
+
+        cache_parms = http_parms.get("cache", {}) or {}
+        self._cache_ttl: float = float(cache_parms.get("ttl", 3600))
+        self._cache: Optional[ResponseCache] = None
+        if cache_parms.get("enabled", False):
+            self._cache = ResponseCache(cache_parms.get("path", "data/http_cache"),
+                                        cache_parms.get("max_bytes", 256 * 1024 * 1024),
+                                        cache_parms.get("offline", False))
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self._max_workers, pool_maxsize=self._max_workers, max_retries=0)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self._max_per_host)
+            return self._host_slots[host]
+
+    def deadline(self) -> float:
+        """Retorna o instante (`time.monotonic`) em que se esgota o orçamento de uma fonte."""
+        return monotonic() + self._budget
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Backoff exponencial com jitter completo, respeitando `Retry-After` quando houver."""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self._backoff_max)
+        return random.uniform(0, min(self._backoff_max, self._backoff_base * (2 ** attempt)))
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Contadores acumulados do cache de respostas (vazio se o cache estiver desligado)."""
+        return dict(self._cache.stats) if self._cache else {}
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, deadline: Optional[float] = None,
+            ttl: Optional[float] = None, until: Optional[Callable[[Optional[str]], Callable[[bytes], bool]]] = None,
+            budget: Optional[float] = None) -> requests.Response:
+        """
+        Executa um GET passando pelo cache de respostas, quando habilitado.
+
+        Entradas mais novas que `ttl` são servidas do disco; entradas expiradas são
+        revalidadas com `If-None-Match`/`If-Modified-Since`. No modo offline qualquer
+        entrada é servida e a ausência dela é tratada como erro de conexão. Com um
+        `PayloadRecorder`, a resposta é gravada (`record`) ou lida da gravação (`replay`).
+
+        Com `until`, o corpo é baixado em streaming e a conexão é encerrada assim que o
+        detector indicar que o conteúdo de interesse terminou; o corpo truncado é o que
+        vai para o cache e para a gravação.
+
+        Args:
+            url (str): URL da requisição.
+            headers (Optional[Dict[str, str]]): Cabeçalhos HTTP da requisição.
+            deadline (Optional[float]): Prazo da execução em `time.monotonic` (`ingestion_deadline`).
+            ttl (Optional[float]): Validade da entrada em segundos; quando omitido usa `cache.ttl`.
+            until (Optional[Callable]): Fábrica do detector de fim (recebe o encoding da resposta e
+                devolve uma função que consome cada bloco e retorna `True` para encerrar o download).
+            budget (Optional[float]): Fim do orçamento da fonte em `time.monotonic`; quando omitido,
+                `source_budget` a partir de agora.
+
+        Returns:
+            requests.Response: Resposta da requisição (ou reconstruída do cache).
+
+        """
+        if self.recorder is not None:
+            if self.recorder.replaying:
+                return self.recorder.replay_response(url, headers)
+            response = self._cached_get(url, headers, deadline, ttl, until, budget)
+            self.recorder.record_response(url, headers, response)
+            return response
+
+        return self._cached_get(url, headers, deadline, ttl, until, budget)
+
+    def _cached_get(self, url: str, headers: Optional[Dict[str, str]] = None, deadline: Optional[float] = None,
+                    ttl: Optional[float] = None, until: Optional[Callable[[Optional[str]], Callable[[bytes], bool]]] = None,
+                    budget: Optional[float] = None) -> requests.Response:
+        """GET pelo cache de respostas (ou direto na rede, se o cache estiver desligado)."""
+        if self._cache is None:
+            return self._fetch(url, headers, deadline, until, budget)
+
+        key = self._cache.key(url, headers)
+        entry = self._cache.lookup(key)
+        if entry and (self._cache.offline or entry["age"] < (self._cache_ttl if ttl is None else ttl)):
+            self._cache.count("hits")
+            return self._cache.load(entry)
+
+        if self._cache.offline:
+            self._cache.count("misses")
+            raise requests.exceptions.ConnectionError(f"Cache offline sem entrada para: {url}")
+
+        conditional = dict(headers or {})
+        if entry and entry["etag"]:
+            conditional["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            conditional["If-Modified-Since"] = entry["last_modified"]
+
+        response = self._fetch(url, conditional, deadline, until, budget)
+        if response.status_code == 304 and entry:
+            self._cache.count("revalidated")
+            self._cache.refresh(entry)
+            return self._cache.load(entry)
+
+        self._cache.count("misses")
+        if response.status_code == 200:
+            self._cache.store(key, response)
+        return response
+
+    def _fetch(self, url: str, headers: Optional[Dict[str, str]] = None, deadline: Optional[float] = None,
+               until: Optional[Callable[[Optional[str]], Callable[[bytes], bool]]] = None,
+               budget: Optional[float] = None) -> requests.Response:
+        """
+        Executa um GET respeitando o limite por host, o token bucket, o orçamento da fonte e
+        o prazo da execução.
+
+        Erros de conexão/timeout e respostas com status em `status_forcelist` são refeitos
+        com backoff exponencial até `retry.total` vezes, desde que a espera caiba no limite
+        mais próximo (orçamento da fonte ou prazo da execução).
+        Com `until`, a resposta 200 é lida em streaming (comprimida) por `_read_until`.
+
+        Args:
+            url (str): URL da requisição.
+            headers (Optional[Dict[str, str]]): Cabeçalhos HTTP da requisição.
+            deadline (Optional[float]): Prazo da execução em `time.monotonic` (`ingestion_deadline`).
+            until (Optional[Callable]): Fábrica do detector de fim do streaming (ver `get`).
+            budget (Optional[float]): Fim do orçamento da fonte; quando omitido usa `source_budget`.
+
+        Returns:
+            requests.Response: Resposta da requisição.
+
+        Raises:
+            DeadlineExceeded: Se o prazo da execução se esgotar.
+            SourceBudgetExceeded: Se o orçamento da fonte se esgotar antes do prazo da execução.
+            requests.exceptions.RequestException: Se as tentativas se esgotarem.
+
+        """
+        budget = self.deadline() if budget is None else budget
+        limit = budget if deadline is None else min(deadline, budget)
+
+        def exhausted() -> requests.exceptions.Timeout:
+            if deadline is not None and deadline <= budget:
+                return DeadlineExceeded(f"Prazo da execução esgotado para: {url}")
+            return SourceBudgetExceeded(f"Orçamento de tempo da fonte esgotado para: {url}")
+
+        if until is not None:
+            headers = {"Accept-Encoding": ACCEPT_ENCODING, **(headers or {})}
+        attempt = 0
+        while True:
+            response, error = None, None
+            remaining = limit - monotonic()
+            if remaining <= 0:
+                raise exhausted()
+
+            try:
+                with self._host_slot(url):
+                    self._bucket.acquire()
+                    remaining = limit - monotonic()  # a espera pelo host e pelo token conta no orçamento
+                    if remaining <= 0:
+                        raise exhausted()
+                    response = self._session.get(url, headers=headers, timeout=min(self._timeout, remaining),
+                                                 stream=until is not None)
+                    if until is not None and response.status_code == 200:
+                        self._read_until(response, until(response.encoding))
+                if response.status_code not in self._retry_status:
+                    return response
+            except (DeadlineExceeded, SourceBudgetExceeded):
+                raise
+            except requests.exceptions.RequestException as error_request:
+                error = error_request
+
+            wait = self._backoff(attempt, response)
+            if monotonic() >= limit or (attempt < self._retries and monotonic() + wait >= limit):
+                raise exhausted() from error
+            if attempt >= self._retries:
+                if error is not None:
+                    raise error
+                response.raise_for_status()
+                return response
+
+            attempt += 1
+            logger.info("Tentativa %d/%d para %s em %.1fs (%s)", attempt, self._retries, url, wait,
+                        error or f"status {response.status_code}")
+            time_sleep(wait)
+
+    @staticmethod
+    def _read_until(response: requests.Response, stop: Callable[[bytes], bool]) -> None:
+        """Lê o corpo em blocos até `stop` retornar `True` e fecha a conexão, mantendo apenas o que foi lido."""
+        chunks = []
+        try:
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                chunks.append(chunk)
+                if stop(chunk):
+                    logger.info("Streaming stopped early for %s: %d KB on the wire, %d KB decoded", response.url,
+                                response.raw.tell() // 1024, sum(map(len, chunks)) // 1024)
+                    break
+        finally:
+            response.close()
+        response._content = b"".join(chunks)  # pylint: disable=protected-access
+
+    def iter_pages(self, urls: List[str], headers: Optional[Dict[str, str]] = None, ttl: Optional[float] = None,
+                   lookahead: Optional[int] = None, deadline: Optional[float] = None,
+                   until: Optional[Callable[[Optional[str]], Callable[[bytes], bool]]] = None
+                   ) -> Iterator[Tuple[str, requests.Response]]:
+        """
+        Busca as páginas concorrentemente e as devolve na mesma ordem de `urls`.
+
+        No máximo `lookahead` (padrão `max_workers`) requisições ficam em voo; as demais são
+        submetidas conforme o consumidor avança. Interromper a iteração cancela as pendentes.
+        Todas as páginas compartilham o mesmo orçamento da fonte (`source_budget`) e o prazo da
+        execução (`deadline`).
+
+        Args:
+            urls (List[str]): URLs a buscar.
+            headers (Optional[Dict[str, str]]): Cabeçalhos HTTP da requisição.
+            ttl (Optional[float]): Validade das entradas do cache para esta fonte.
+            lookahead (Optional[int]): Páginas buscadas à frente da que está sendo consumida.
+            deadline (Optional[float]): Prazo da execução em `time.monotonic` (`ingestion_deadline`).
+            until (Optional[Callable]): Fábrica do detector de fim do streaming (ver `get`).
+
+        Yields:
+            Tuple[str, requests.Response]: URL e resposta, na ordem original.
+
+        """
+        pending_urls = iter(urls)
+        in_flight: deque = deque()
+        budget = self.deadline()
+        window = max(min(lookahead or self._max_workers, self._max_workers), 1)
+
+        with ThreadPoolExecutor(max_workers=window) as executor:
+            try:
+                for url in pending_urls:
+                    in_flight.append((url, executor.submit(self.get, url, headers, deadline, ttl, until, budget)))
+                    if len(in_flight) >= window:
+                        break
+
+                while in_flight:
+                    url, future = in_flight.popleft()
+                    response = future.result()
+                    next_url = next(pending_urls, None)
+                    if next_url is not None:
+                        in_flight.append((next_url, executor.submit(self.get, next_url, headers, deadline, ttl, until, budget)))
+                    yield url, response
+            finally:
+                for _, future in in_flight:
+                    future.cancel()
+
+
+def until_deadline(pages: Iterator[Tuple[str, requests.Response]]) -> Iterator[Tuple[Optional[str], Optional[requests.Response]]]:
+    """Repassa as páginas de `iter_pages`; quando o prazo da execução se esgota, emite `(None, None)` e encerra."""
+    try:
+        yield from pages
+    except DeadlineExceeded as error_deadline:
+        logger.info("Pagination interrupted by the time budget: %s", error_deadline)
+        yield None, None
+
+
+_HTTP_CLIENT: Optional[HttpClient] = None
+_HTTP_CLIENT_PARMS: Optional[Dict[str, Any]] = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def get_http_client(http_parms: Optional[Dict[str, Any]] = None, recorder: Optional[PayloadRecorder] = None) -> HttpClient:
+    """
+    Retorna o cliente HTTP do processo, recriando-o apenas se a configuração mudar.
+
+    Args:
+        http_parms (Optional[Dict[str, Any]]): Configuração `http_parms`. Quando `None`,
+            reutiliza o cliente atual (ou cria um com os valores padrão).
+        recorder (Optional[PayloadRecorder]): Gravador da execução (`get_payload_recorder`);
+            considerado apenas quando `http_parms` é informado.
+
+    Returns:
+        HttpClient: Cliente compartilhado entre os helpers de ingestão.
+
+    """
+    global _HTTP_CLIENT, _HTTP_CLIENT_PARMS  # pylint: disable=global-statement
+    with _HTTP_CLIENT_LOCK:
+        if _HTTP_CLIENT is None or (http_parms is not None and (http_parms != _HTTP_CLIENT_PARMS
+                                                                  or recorder is not _HTTP_CLIENT.recorder)):
+            _HTTP_CLIENT = HttpClient(http_parms, recorder)
+            _HTTP_CLIENT_PARMS = dict(http_parms or {})
+        return _HTTP_CLIENT
+
+
+def log_cache_stats(source: str, before: Dict[str, int]) -> None:
+    """Registra os hits/misses do cache de respostas de uma fonte desde `before`."""
+    after = get_http_client().cache_stats()
+    if after:
+        delta = {event: count - before.get(event, 0) for event, count in after.items()}
+        logger.info("Cache HTTP %s - Hits: %d, Revalidated: %d, Misses: %d",
+                    source, delta["hits"], delta["revalidated"], delta["misses"])
+
+
+class SourceFailover:
+    """
+    Escolha entre fontes equivalentes com memoização, circuit breaker e saúde persistida.
+
+    - Cada payload buscado (ou erro) fica memorizado na instância: a mesma URL não é buscada
+      duas vezes na execução (ex.: fonte alternativa consultada de novo após o filtro por data).
+    - As fontes são ordenadas pela taxa recente de sucesso (média exponencial) e pela
+      latência média, mantendo a ordem configurada em caso de empate.
+    - Após `failure_threshold` falhas consecutivas o circuito da fonte abre e ela é pulada
+      por `cooldown_seconds`; depois disso uma nova tentativa fecha o circuito se der certo.
+    - A saúde de cada fonte é gravada em `SourceHealthStore` e exportada com `stats()`.
+
+    Args:
+        failover_parms (Optional[Dict[str, Any]]): Configuração `failover_parms`.
+
+    """
+
+    def __init__(self, failover_parms: Optional[Dict[str, Any]] = None):
+        failover_parms = failover_parms or {}
+        self._store = SourceHealthStore(failover_parms.get("health_path", "data/source_health"))
+        self._threshold: int = max(int(failover_parms.get("failure_threshold", 3)), 1)
+        self._cooldown: float = float(failover_parms.get("cooldown_seconds", 1800))
+        self._alpha: float = float(failover_parms.get("ewma_alpha", 0.3))
+        self._payloads: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def is_open(self, source: str) -> bool:
+        """Indica se o circuito da fonte está aberto (fonte pulada até o fim do cooldown)."""
+        opened_at = self._store.get(source)["opened_at"]
+        return opened_at is not None and time_now() - opened_at < self._cooldown
+
+    def order(self, sources: List[Dict[str, Any]], key: str = "url") -> List[Dict[str, Any]]:
+        """
+        Ordena as fontes pela saúde registrada, sem as que estão com o circuito aberto.
+
+        Args:
+            sources (List[Dict[str, Any]]): Fontes na ordem configurada (primária primeiro).
+            key (str): Campo que identifica cada fonte.
+
+        Returns:
+            List[Dict[str, Any]]: Fontes disponíveis, da mais saudável para a menos saudável.
+
+        """
+        available = []
+        for position, source in enumerate(sources):
+            if self.is_open(source[key]):
+                logger.info("Circuit open, skipping source: %s", source[key])
+                continue
+            health = self._store.get(source[key])
+            available.append((-round(health["success_rate"], 1), health["latency"] or 0.0, position, source))
+        return [source for *_, source in sorted(available, key=lambda item: item[:3])]
+
+    def fetch(self, source: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Busca o payload da fonte uma única vez por execução, registrando sucesso e latência.
+
+        Payloads vazios contam como falha. Erros são registrados, memorizados e propagados.
+
+        Args:
+            source (str): Identificador da fonte (URL).
+            fetch (Callable[[], Any]): Busca e extração do payload.
+
+        Returns:
+            Any: Payload da fonte (memorizado nas chamadas seguintes).
+
+        """
+        with self._lock:
+            if source in self._payloads:
+                logger.info("Payload memoized for source: %s", source)
+                if isinstance(self._payloads[source], Exception):
+                    raise self._payloads[source]
+                return self._payloads[source]
+
+        started = monotonic()
+        try:
+            payload = fetch()
+        except DeadlineExceeded:
+            raise
+        except Exception as error_fetch:
+            self._record(source, False, monotonic() - started)
+            with self._lock:
+                self._payloads[source] = error_fetch
+            raise
+
+        self._record(source, bool(payload), monotonic() - started)
+        with self._lock:
+            self._payloads[source] = payload
+        return payload
+
+    def _record(self, source: str, success: bool, latency: float) -> None:
+        health = self._store.get(source)
+        health["success_rate"] = (1 - self._alpha) * health["success_rate"] + self._alpha * float(success)
+        if success:
+            health["successes"] += 1
+            health["consecutive_failures"] = 0
+            health["opened_at"] = None
+            health["last_success"] = time_now()
+            health["latency"] = latency if health["latency"] is None else (
+                (1 - self._alpha) * health["latency"] + self._alpha * latency)
+        else:
+            health["failures"] += 1
+            health["consecutive_failures"] += 1
+            health["last_failure"] = time_now()
+            if health["consecutive_failures"] >= self._threshold:
+                health["opened_at"] = time_now()
+                logger.info("Circuit opened for source after %d failures: %s", health["consecutive_failures"], source)
+        self._store.put(source, health)
+
+    def stats(self) -> pd.DataFrame:
+        """Saúde de todas as fontes registradas, com o estado atual do circuito."""
+        stats = pd.DataFrame(self._store.all())
+        if not stats.empty:
+            stats["circuit_open"] = stats["source"].map(self.is_open)
+        return stats
+
+
+_FAILOVER: Optional[SourceFailover] = None
+_FAILOVER_KEY: Optional[Tuple[str, str]] = None
+
+
+def get_source_failover(parameters: Dict[str, Any]) -> SourceFailover:
+    """
+    Retorna o `SourceFailover` da execução corrente (memoização compartilhada entre os nós).
+
+    Como o gravador de `get_payload_recorder`, vale para a execução (`ingestion_run_id`) e
+    a configuração `failover_parms`: uma nova execução no mesmo processo começa sem os
+    payloads e erros memorizados pela anterior.
+    """
+    global _FAILOVER, _FAILOVER_KEY  # pylint: disable=global-statement
+    failover_parms = parameters.get("failover_parms")
+    key = (json.dumps(failover_parms or {}, sort_keys=True), ingestion_run_id(parameters))
+    with _REGISTRY_LOCK:
+        if _FAILOVER is None or _FAILOVER_KEY != key:
+            _FAILOVER, _FAILOVER_KEY = SourceFailover(failover_parms), key
+        return _FAILOVER
+
+
+def paginate_urls(mapping_class: Dict[str, Any], max_pages: int) -> List[str]:
+    """Monta as URLs paginadas de uma fonte a partir de `url` e `pattern_pages`."""
+    return [
+        f"{mapping_class.get('url')}{mapping_class.get('pattern_pages').replace('<number>', str(page))}"
+        for page in range(1, max_pages + 1)
+    ]
+
+
+def scraping(url: str, headers: Dict[str, str], ttl: Optional[float] = None, parser: Optional[str] = None,
+             deadline: Optional[float] = None, stream_parms: Optional[Dict[str, Any]] = None) -> List[List[str]]:
     """
     Web scraping.
 
     Esta função executa web scraping procurando por tabelas HTML que contenham as colunas
-    'Date' e 'Price'.
+    'Date' e 'Price'. Com `stream_parms.enabled`, a página é baixada em streaming e a
+    conexão é encerrada no `</table>` da tabela histórica.
 
     Args:
         url (str): URL da página web para fazer scraping.
         headers (Dict[str, str]): Cabeçalhos HTTP para incluir na requisição.
+        ttl (Optional[float]): Validade da resposta no cache HTTP (segundos).
+        parser (Optional[str]): Backend do BeautifulSoup (`html.parser`, `lxml`, ...).
+        deadline (Optional[float]): Limite em `time.monotonic` (`ingestion_deadline`).
+        stream_parms (Optional[Dict[str, Any]]): Bloco `stream` da fonte (`enabled`, `header_kb`).
 
     Returns:
         List[List[str]]: Uma lista com os dados obtidos.
 
+    Raises:
+        DeadlineExceeded: Se o prazo da execução se esgotar.
+
     """
     validate_url_and_headers(url=url, headers=headers)
 
-    tentativa = 0
-    while tentativa < 3:
-        try:
-            response = requests.get(url, headers=headers, timeout=60)
-            soup = BeautifulSoup(response.content, "html.parser")
-            tables = soup.find_all("table")
-
-            for table in tables:
-                hdrs = [th.get_text(strip=True) for th in table.find_all("th")]
-                if ('Date' in hdrs and 'Price' in hdrs) or ('Data' in hdrs and 'Último' in hdrs):
-                    logging.info("scraping: Tabela encontrada")
-                    break
-            else:
-                raise ValueError("Tabela não encontrada")
+    try:
+        response = get_http_client().get(url, headers=headers, ttl=ttl, deadline=deadline,
+                                         until=table_stream_detector(stream_parms))
+    except DeadlineExceeded:
+        raise
+    except requests.exceptions.RequestException as error_web_scraping:
+        raise ValueError(f"Erro ao coletar dados da página: {url}") from error_web_scraping
+
+    return parse_html_table(response.content, parser)
+
+
+def date_windows(start: str, end: str, window_days: int) -> List[Tuple[str, str]]:
+    """Divide o intervalo `[start, end]` em janelas consecutivas de até `window_days` dias."""
+    windows = []
+    window_start, last = pd.Timestamp(start), pd.Timestamp(end)
+    while window_start <= last:
+        window_end = min(window_start + pd.Timedelta(days=window_days - 1), last)
+        windows.append((window_start.strftime("%Y-%m-%d"), window_end.strftime("%Y-%m-%d")))
+        window_start = window_end + pd.Timedelta(days=1)
+    return windows
+
+
+def scraping_range(range_parms: Dict[str, Any], headers: Dict[str, str], start: str, end: str,
+                   ttl: Optional[float] = None, parser: Optional[str] = None, deadline: Optional[float] = None,
+                   stream_parms: Optional[Dict[str, Any]] = None,
+                   dat_ref_format: Optional[str] = None) -> Tuple[List[List[str]], bool]:
+    """
+    Extrai a tabela histórica de um intervalo de datas, janela por janela.
+
+    O intervalo é dividido em janelas de `window_days` dias, cada uma montada a partir de
+    `url_template` (`{start}`/`{end}` no formato `date_format`). As janelas são buscadas em
+    paralelo pelo cliente HTTP compartilhado (limite por host e token bucket); janelas que
+    terminam antes de hoje não mudam mais e usam `history_ttl` no cache. Linhas repetidas
+    entre janelas (mesma data) são mantidas apenas uma vez.
+
+    Com `dat_ref_format`, cada janela é conferida pelas datas das linhas: uma resposta com
+    linhas fora da janela (a fonte ignorou `{start}`/`{end}` e devolveu a página padrão) é
+    descartada e a coleta é marcada como incompleta.
+
+    Args:
+        range_parms (Dict[str, Any]): Configuração `range_fetch` da fonte.
+        headers (Dict[str, str]): Cabeçalhos HTTP para incluir nas requisições.
+        start (str): Data inicial (`YYYY-MM-DD`).
+        end (str): Data final (`YYYY-MM-DD`).
+        ttl (Optional[float]): Validade no cache da janela que inclui hoje.
+        parser (Optional[str]): Backend do BeautifulSoup.
+        deadline (Optional[float]): Limite em `time.monotonic` (`ingestion_deadline`).
+        stream_parms (Optional[Dict[str, Any]]): Bloco `stream` da fonte (ver `scraping`).
+        dat_ref_format (Optional[str]): Formato da data na primeira coluna da tabela.
+
+    Returns:
+        Tuple[List[List[str]], bool]: Linhas de todas as janelas, sem datas repetidas, e se
+        todas as janelas foram buscadas antes do `deadline` e respeitaram o intervalo pedido.
+
+    """
+    date_format = range_parms.get("date_format", "%m/%d/%Y")
+    today = datetime.today().strftime("%Y-%m-%d")
+    windows = date_windows(start, end, int(range_parms.get("window_days", 90)))
+    logger.info("Range fetch %s to %s: %d windows", start, end, len(windows))
+
+    def urls(closed: bool) -> Dict[str, Tuple[str, str]]:
+        return {range_parms["url_template"].format(start=pd.Timestamp(window_start).strftime(date_format),
+                                                   end=pd.Timestamp(window_end).strftime(date_format)): (window_start, window_end)
+                for window_start, window_end in windows if (window_end < today) == closed}
+
+    def outside(rows: List[List[str]], window: Tuple[str, str]) -> bool:
+        dates = pd.to_datetime(pd.Series([row[0] for row in rows if row], dtype=object), format=dat_ref_format, errors="coerce")
+        return bool(((dates < pd.Timestamp(window[0])) | (dates > pd.Timestamp(window[1]))).any())
+
+    data, seen, complete = [], set(), True
+    client = get_http_client()
+    try:
+        for closed, window_ttl in ((False, ttl), (True, range_parms.get("history_ttl", ttl))):
+            window_urls = urls(closed)
+            for url, response in client.iter_pages(list(window_urls), headers=headers, ttl=window_ttl, deadline=deadline,
+                                                   until=table_stream_detector(stream_parms)):
+                response.raise_for_status()
+                rows = parse_html_table(response.content, parser)
+                if dat_ref_format and outside(rows, window_urls[url]):
+                    logger.info("Range fetch window %s to %s returned rows outside it, discarded: %s",
+                                *window_urls[url], url)
+                    complete = False
+                    continue
+                for row in rows:
+                    if row and row[0] not in seen:
+                        seen.add(row[0])
+                        data.append(row)
+    except DeadlineExceeded as error_deadline:
+        logger.info("Range fetch interrupted by the time budget: %s", error_deadline)
+        return data, False
+
+    return data, complete
+
+
+def make_soup(markup: Any, parser: Optional[str] = None, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Constrói o BeautifulSoup com o backend escolhido, restrito a `parse_only` quando informado.
+
+    Args:
+        markup (Any): HTML em `str` ou `bytes`.
+        parser (Optional[str]): Backend do BeautifulSoup; `None` usa `DEFAULT_HTML_PARSER`.
+        parse_only (Optional[SoupStrainer]): Restringe a árvore aos elementos de interesse.
+
+    Returns:
+        BeautifulSoup: Árvore (parcial) do documento.
+
+    """
+    parser = parser or DEFAULT_HTML_PARSER
+    try:
+        return BeautifulSoup(markup, parser, parse_only=parse_only)
+    except FeatureNotFound:
+        logger.warning("Parser '%s' indisponível, usando '%s'", parser, DEFAULT_HTML_PARSER)
+        return BeautifulSoup(markup, DEFAULT_HTML_PARSER, parse_only=parse_only)
+
+
+class TableStreamDetector(HTMLParser):
+    """
+    Acompanha em streaming o HTML de uma página de histórico e indica quando a tabela
+    com uma das `TABLE_SIGNATURES` no cabeçalho foi fechada (`</table>`).
+
+    Usado como detector de fim de `HttpClient.get(until=...)`: cada bloco recebido é
+    decodificado e passado ao parser incremental, sem montar árvore.
+
+    Args:
+        encoding (Optional[str]): Encoding da resposta (padrão `utf-8`).
+        header_limit (int): Bytes lidos sem encontrar o cabeçalho esperado antes de desistir.
+
+    Raises:
+        ValueError: Se o cabeçalho não aparecer nos primeiros `header_limit` bytes.
+
+    """
+
+    def __init__(self, encoding: Optional[str] = None, header_limit: int = 512 * 1024):
+        super().__init__(convert_charrefs=True)
+        self.header_limit = header_limit
+        self.matched = False
+        self.done = False
+        self._decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+        self._received = 0
+        self._depth = 0
+        self._headers: set = set()
+        self._th_text: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self._depth += 1
+            if self._depth == 1:
+                self._headers = set()
+        elif tag == "th" and self._depth:
+            self._th_text = []
+
+    def handle_endtag(self, tag):
+        if tag == "th" and self._th_text is not None:
+            self._headers.add("".join(self._th_text))
+            self._th_text = None
+            self.matched = self.matched or any(signature <= self._headers for signature in TABLE_SIGNATURES)
+        elif tag == "table" and self._depth:
+            self._depth -= 1
+            self.done = self._depth == 0 and self.matched
+
+    def handle_data(self, data):
+        if self._th_text is not None and data.strip():
+            self._th_text.append(data.strip())
+
+    def __call__(self, chunk: bytes) -> bool:
+        if self.done:
+            return True
+        self._received += len(chunk)
+        self.feed(self._decoder.decode(chunk))
+        if not self.matched and self._received > self.header_limit:
+            raise ValueError(f"Cabeçalho da tabela não encontrado nos primeiros {self.header_limit // 1024} KB")
+        return self.done
+
+
+def table_stream_detector(stream_parms: Optional[Dict[str, Any]]) -> Optional[Callable[[Optional[str]], TableStreamDetector]]:
+    """Fábrica de `TableStreamDetector` conforme o bloco `stream` da fonte (`None` se desligado)."""
+    if not stream_parms or not stream_parms.get("enabled", False):
+        return None
+    return partial(TableStreamDetector, header_limit=int(stream_parms.get("header_kb", 512)) * 1024)
+
+
+def parse_html_table(content: Any, parser: Optional[str] = None) -> List[List[str]]:
+    """
+    Extrai as linhas da tabela histórica cujo cabeçalho contém uma das `TABLE_SIGNATURES`.
+
+    Apenas os elementos `<table>` são construídos; o restante do documento é descartado
+    durante o parse.
+
+    Args:
+        content (Any): HTML da página.
+        parser (Optional[str]): Backend do BeautifulSoup.
+
+    Returns:
+        List[List[str]]: Linhas da tabela (textos das células `<td>`).
+
+    Raises:
+        ValueError: Se nenhuma tabela com o cabeçalho esperado for encontrada.
+
+    """
+    soup = make_soup(content, parser, SoupStrainer("table"))
+
+    for table in soup.find_all("table"):
+        hdrs = {th.get_text(strip=True) for th in table.find_all("th")}
+        if any(signature <= hdrs for signature in TABLE_SIGNATURES):
+            logging.info("scraping: Tabela encontrada")
             break
-        except requests.exceptions.RequestException as error_web_scraping:
-            tentativa += 1
-            if tentativa == 3:
-                raise ValueError(f"Erro ao coletar dados da página: {url}") from error_web_scraping
-            time_sleep(3600)
+    else:
+        raise ValueError("Tabela não encontrada")
 
     data = []
     for row in table.find("tbody").find_all("tr"):
@@ -82,28 +1077,78 @@ def validate_url_and_headers(url: str, headers: Dict[str, str]) -> None:
         raise ValueError("Headers devem ser um dicionário não vazio")
 
 
-def scraping_infomoney(url: str, class_: str) -> List[Dict[str, str]]:
-    r = requests.get(url, timeout=60)
-    soup = BeautifulSoup(r.text, "html.parser")
-    blocos = soup.find_all("div", class_=class_)
+def scraping_infomoney(url: str, class_: str, ttl: Optional[float] = None, parser: Optional[str] = None,
+                       deadline: Optional[float] = None) -> List[Dict[str, str]]:
+    r = get_http_client().get(url, ttl=ttl, deadline=deadline)
+    return parse_infomoney(r.text, class_, parser)
+
+
+class _HeadlineStrainer(SoupStrainer):
+    """Mantém apenas os blocos de manchete (`div` com a classe informada) e os elementos `<time>`."""
+
+    def __init__(self, class_: str):
+        super().__init__("div", class_=class_)
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return name == "time" or super().allow_tag_creation(nsprefix, name, attrs)
+
+
+def _has_class(tag, class_: str) -> bool:
+    """Mesma regra do `class_` do BeautifulSoup: uma das classes ou o atributo inteiro."""
+    classes = tag.get("class") or []
+    return class_ in classes or " ".join(classes) == class_
+
+
+def parse_infomoney(html: str, class_: str, parser: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Extrai as manchetes do InfoMoney em uma única passada pelo documento.
+
+    Cada bloco é pareado com o primeiro `<time>` que aparece depois do seu início e antes
+    do bloco seguinte; sem `<time>` no intervalo, usa a data atual.
+
+    Args:
+        html (str): HTML da página de últimas notícias.
+        class_ (str): Classe dos blocos de manchete.
+        parser (Optional[str]): Backend do BeautifulSoup.
+
+    Returns:
+        List[Dict[str, str]]: Registros `fonte/titulo/dat_ref/link`.
+
+    """
+    soup = make_soup(html, parser, _HeadlineStrainer(class_))
+    elementos = soup.find_all(lambda tag: tag.name == "time" or (tag.name == "div" and _has_class(tag, class_)))
     noticias = []
+    atual = None
 
-    for bloco in blocos:
-        titulo = bloco.text.strip()
-        h2 = bloco.find("h2")
+    for elemento in elementos:
+        if elemento.name == "time":
+            if atual is not None and atual["dat_ref"] is None and elemento.has_attr("datetime"):
+                atual["dat_ref"] = elemento["datetime"]
+            continue
+
+        atual = None
+        h2 = elemento.find("h2")
         if h2:
             a_tag = h2.find("a")
             link = a_tag["href"] if a_tag and a_tag.has_attr("href") else None
-            data_el = bloco.find_next("time")
-            data = data_el["datetime"] if data_el else datetime.today().isoformat()
-            noticias.append({"fonte": "InfoMoney", "titulo": titulo, "dat_ref": data, "link": link})
+            atual = {"fonte": "InfoMoney", "titulo": elemento.text.strip(), "dat_ref": None, "link": link}
+            noticias.append(atual)
+
+    hoje = datetime.today().isoformat()
+    for noticia in noticias:
+        noticia["dat_ref"] = noticia["dat_ref"] or hoje
 
     return noticias
 
 
-def scraping_valorinveste(url, class_post, class_date) -> List[Dict[str, str]]:
-    r = requests.get(url, timeout=60)
-    soup = BeautifulSoup(r.text, "html.parser")
+def scraping_valorinveste(url, class_post, class_date, ttl: Optional[float] = None,
+                          parser: Optional[str] = None, deadline: Optional[float] = None) -> List[Dict[str, str]]:
+    r = get_http_client().get(url, ttl=ttl, deadline=deadline)
+    return parse_valorinveste(r.text, class_post, class_date, parser)
+
+
+def parse_valorinveste(html: str, class_post: str, class_date: str, parser: Optional[str] = None) -> List[Dict[str, str]]:
+    soup = make_soup(html, parser, SoupStrainer(["a", "span"], class_=[class_post, class_date]))
     blocos = soup.find_all("a", class_=class_post)
     datas = soup.find_all("span", class_=class_date)
     noticias = []
@@ -115,9 +1160,15 @@ def scraping_valorinveste(url, class_post, class_date) -> List[Dict[str, str]]:
     return noticias
 
 
-def scraping_seudinheiro(url: str, class_feed: str, class_title: str, class_date: str) -> List[Dict[str, str]]:
-    r = requests.get(url, timeout=60)
-    soup = BeautifulSoup(r.text, "html.parser")
+def scraping_seudinheiro(url: str, class_feed: str, class_title: str, class_date: str,
+                         ttl: Optional[float] = None, parser: Optional[str] = None) -> List[Dict[str, str]]:
+    r = get_http_client().get(url, ttl=ttl)
+    return parse_seudinheiro(r.text, class_feed, class_title, class_date, parser)
+
+
+def parse_seudinheiro(html: str, class_feed: str, class_title: str, class_date: str,
+                      parser: Optional[str] = None) -> List[Dict[str, str]]:
+    soup = make_soup(html, parser, SoupStrainer("div", class_=class_feed))
     blocos = soup.find_all("div", class_=class_feed)
     noticias = []
 
@@ -136,9 +1187,15 @@ def scraping_seudinheiro(url: str, class_feed: str, class_title: str, class_date
     return noticias
 
 
-def scraping_moneytimes(url: str, class_item: str, class_title: str, class_date: str) -> List[Dict[str, str]]:
-    r = requests.get(url, timeout=60)
-    soup = BeautifulSoup(r.text, "html.parser")
+def scraping_moneytimes(url: str, class_item: str, class_title: str, class_date: str,
+                        ttl: Optional[float] = None, parser: Optional[str] = None) -> List[Dict[str, str]]:
+    r = get_http_client().get(url, ttl=ttl)
+    return parse_moneytimes(r.text, class_item, class_title, class_date, parser)
+
+
+def parse_moneytimes(html: str, class_item: str, class_title: str, class_date: str,
+                     parser: Optional[str] = None) -> List[Dict[str, str]]:
+    soup = make_soup(html, parser, SoupStrainer("div", class_=class_item))
     blocos = soup.find_all("div", class_=class_item)
     noticias = []
 
@@ -157,6 +1214,274 @@ def scraping_moneytimes(url: str, class_item: str, class_title: str, class_date:
     return noticias
 
 
+def scraping_feed(url: str, fonte: str, ttl: Optional[float] = None, deadline: Optional[float] = None) -> List[Dict[str, str]]:
+    """
+    Coleta as notícias do feed RSS/Atom ou do sitemap de notícias da fonte.
+
+    Args:
+        url (str): URL do feed (`feed.url` da fonte).
+        fonte (str): Nome da fonte gravado na coluna `fonte`.
+        ttl (Optional[float]): Validade da resposta no cache HTTP (segundos).
+        deadline (Optional[float]): Limite em `time.monotonic` (`ingestion_deadline`).
+
+    Returns:
+        List[Dict[str, str]]: Registros `fonte/titulo/dat_ref/link/categoria`.
+
+    Raises:
+        DeadlineExceeded: Se o prazo da execução se esgotar.
+        requests.exceptions.RequestException: Se o feed não puder ser baixado.
+        xml.etree.ElementTree.ParseError: Se o conteúdo não for XML válido.
+
+    """
+    response = get_http_client().get(url, ttl=ttl, deadline=deadline)
+    response.raise_for_status()
+    return parse_feed(response.content, fonte)
+
+
+def _local_name(tag: str) -> str:
+    """Nome do elemento sem o namespace (`{http://...}title` -> `title`)."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def data_feed(texto: Optional[str]) -> Optional[str]:
+    """
+    Converte a data de publicação do feed para `YYYY-MM-DD` no horário de Brasília.
+
+    Aceita o formato RFC 822 do RSS (`Tue, 14 Jan 2025 10:00:00 +0000`) e o ISO 8601 do
+    Atom e do sitemap de notícias (`2025-01-14T10:00:00-03:00` ou `2025-01-14`).
+    """
+    if not texto:
+        return None
+    texto = texto.strip()
+    try:
+        data = parsedate_to_datetime(texto)
+    except (TypeError, ValueError, IndexError):
+        try:
+            data = datetime.fromisoformat(texto.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if data.tzinfo is not None:
+        data = data.astimezone(FUSO_BRASILIA)
+    return data.strftime("%Y-%m-%d")
+
+
+def parse_feed(content: bytes, fonte: str) -> List[Dict[str, str]]:
+    """
+    Extrai as notícias de um feed RSS 2.0, Atom ou sitemap de notícias (`<news:news>`).
+
+    O XML é lido em streaming com `iterparse`: cada item é convertido assim que
+    termina e descartado em seguida, sem montar a árvore do documento inteiro.
+
+    Args:
+        content (bytes): Corpo da resposta do feed.
+        fonte (str): Nome da fonte gravado na coluna `fonte`.
+
+    Returns:
+        List[Dict[str, str]]: Registros `fonte/titulo/dat_ref/link/categoria`, na ordem do feed.
+
+    Raises:
+        xml.etree.ElementTree.ParseError: Se o conteúdo não for XML válido.
+
+    """
+    noticias = []
+    campos: Dict[str, str] = {}
+    for evento, elemento in iterparse(io.BytesIO(content), events=("start", "end")):
+        nome = _local_name(elemento.tag)
+        if evento == "start":
+            if nome in ("item", "entry", "url"):
+                campos = {}  # descarta título e link do canal
+            continue
+
+        texto = (elemento.text or "").strip()
+        if nome in ("title", "pubDate", "published", "updated", "publication_date", "date", "category", "loc"):
+            campos.setdefault(nome, texto or elemento.get("term", ""))
+        elif nome == "link" and elemento.get("rel", "alternate") == "alternate":
+            campos.setdefault("link", texto or elemento.get("href", ""))
+        elif nome in ("item", "entry", "url"):
+            titulo, link = campos.get("title"), campos.get("link") or campos.get("loc")
+            if titulo and link:
+                publicacao = campos.get("pubDate") or campos.get("publication_date") or campos.get("published") \
+                    or campos.get("updated") or campos.get("date")
+                noticias.append({"fonte": fonte, "titulo": titulo, "dat_ref": data_feed(publicacao),
+                                 "link": link, "categoria": campos.get("category")})
+            campos = {}
+            elemento.clear()
+        elif nome == "channel":
+            elemento.clear()
+
+    return noticias
+
+
+def ingestion_mode(parameters: Dict[str, Any]) -> str:
+    """
+    Modo de ingestão da execução: `daily`, `incremental`, `full` ou `backfill`.
+
+    `process_full_data` continua valendo como atalho para `full`.
+    """
+    if parameters.get("process_full_data", False):
+        return "full"
+    mode = parameters.get("ingestion_mode") or "daily"
+    if mode not in INGESTION_MODES:
+        raise ValueError(f"ingestion_mode inválido: {mode} (esperado um de {INGESTION_MODES})")
+    return mode
+
+
+def resolve_date_window(dataset_name: Optional[str], parameters: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Intervalo de `dat_ref` que a execução deve buscar e emitir para o dataset.
+
+    - `daily`: apenas o `odate`.
+    - `incremental`: do dia seguinte à marca d'água do dataset até o `odate`; sem marca
+      d'água, os últimos `watermark_parms.max_gap_days` dias.
+    - `full`: sem limites.
+    - `backfill`: de `backfill_start` até `backfill_end` (padrão: `odate`).
+
+    Args:
+        dataset_name (Optional[str]): Dataset de staging da fonte (chave da marca d'água).
+        parameters (Dict[str, Any]): Parâmetros da execução.
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: Datas `YYYY-MM-DD` inicial e final (inclusivas).
+
+    """
+    odate = parameters.get("odate")
+    mode = ingestion_mode(parameters)
+    if mode == "full":
+        return None, None
+    if mode == "backfill":
+        if not parameters.get("backfill_start"):
+            raise ValueError("ingestion_mode backfill requer o parâmetro backfill_start")
+        return parameters["backfill_start"], parameters.get("backfill_end") or odate
+    if mode == "daily" or not dataset_name:
+        return odate, odate
+
+    watermark_parms = parameters.get("watermark_parms") or {}
+    mark = WatermarkStore(watermark_parms.get("path", "data/watermarks")).get(dataset_name)
+    if mark.get("dat_ref"):
+        start = pd.Timestamp(mark["dat_ref"]) + pd.Timedelta(days=1)
+    else:
+        start = pd.Timestamp(odate) - pd.Timedelta(days=watermark_parms.get("max_gap_days", 30))
+
+    start = start.strftime("%Y-%m-%d")
+    logger.info("Incremental window for %s: %s to %s (watermark: %s)", dataset_name, start, odate, mark.get("dat_ref"))
+    return start, odate
+
+
+def ingestion_run_id(parameters: Dict[str, Any]) -> str:
+    """
+    Identificador da tentativa corrente do estágio de ingestão.
+
+    No Airflow é o `run_id` com o `try_number` da task (uma nova tentativa recomeça o
+    orçamento do estágio); fora dele, o `odate` com o `session_id` da sessão do Kedro
+    (injetado pelo `IngestionRunHook`), de modo que uma nova execução da mesma data não
+    herda o início da anterior.
+    """
+    if parameters.get("run_id"):
+        try_number = parameters.get("try_number")
+        return f"{parameters['run_id']}.try{try_number}" if try_number else str(parameters["run_id"])
+    return f"{parameters.get('odate')}.{parameters.get('session_id') or PROCESS_SESSION}"
+
+
+def ingestion_run_store(parameters: Dict[str, Any]) -> IngestionRunStore:
+    """Registro da tentativa corrente (`ingestion_run_id`)."""
+    deadline_parms = parameters.get("deadline_parms") or {}
+    return IngestionRunStore(deadline_parms.get("path", "data/ingestion_runs"), ingestion_run_id(parameters))
+
+
+def ingestion_deadline(parameters: Dict[str, Any]) -> Optional[float]:
+    """
+    Limite de tempo do nó de ingestão, em `time.monotonic`.
+
+    É o menor entre o início do nó mais `deadline_parms.node_budget_seconds` e o início do
+    estágio (primeiro nó da execução) mais `deadline_parms.stage_budget_seconds`.
+
+    Returns:
+        Optional[float]: Limite do nó ou `None` quando nenhum orçamento estiver configurado.
+
+    """
+    deadline_parms = parameters.get("deadline_parms") or {}
+    node_budget, stage_budget = deadline_parms.get("node_budget_seconds"), deadline_parms.get("stage_budget_seconds")
+    now = time_now()
+    limits = []
+    if node_budget:
+        limits.append(now + float(node_budget))
+    if stage_budget:
+        limits.append(ingestion_run_store(parameters).started_at() + float(stage_budget))
+    if not limits:
+        return None
+    return monotonic() + (min(limits) - now)
+
+
+def deadline_exceeded(deadline: Optional[float]) -> bool:
+    """Indica se o limite de `ingestion_deadline` já passou."""
+    return deadline is not None and monotonic() >= deadline
+
+
+def finish_ingestion(df: pd.DataFrame, dataset_name: Optional[str], complete: bool, parameters: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Adiciona a coluna `coleta_completa`, converte `dat_ref` para data e registra o resultado
+    da coleta na execução e, por `dat_ref` (as datas emitidas e o `odate`), no `WatermarkStore`.
+
+    Args:
+        df (pd.DataFrame): Dados emitidos pelo nó.
+        dataset_name (Optional[str]): Dataset de staging da fonte.
+        complete (bool): `False` quando o orçamento de tempo interrompeu a coleta.
+        parameters (Dict[str, Any]): Parâmetros da execução.
+
+    Returns:
+        pd.DataFrame: `df` com a coluna `coleta_completa` e `dat_ref` como `datetime64`.
+
+    """
+    if not complete:
+        logger.info("Time budget exhausted for %s: emitting %d partial records", dataset_name, len(df))
+    if "dat_ref" in df.columns:
+        df = df.assign(dat_ref=pd.to_datetime(df["dat_ref"], errors="coerce"))
+    if dataset_name:
+        ingestion_run_store(parameters).mark(dataset_name, complete, len(df))
+        dat_refs = set(df["dat_ref"].dropna().dt.strftime("%Y-%m-%d")) if "dat_ref" in df.columns else set()
+        if parameters.get("odate"):
+            dat_refs.add(parameters["odate"])
+        watermark_parms = parameters.get("watermark_parms") or {}
+        WatermarkStore(watermark_parms.get("path", "data/watermarks")).mark_completeness(dataset_name, dat_refs, complete)
+    return df.assign(coleta_completa=complete)
+
+
+def filter_date_window(df: pd.DataFrame, window: Tuple[Optional[str], Optional[str]]) -> pd.DataFrame:
+    """Mantém as linhas com `dat_ref` (data ou texto `YYYY-MM-DD`) dentro do intervalo de `resolve_date_window`."""
+    start, end = window
+    if "dat_ref" not in df.columns:
+        return df
+    if start is not None:
+        df = df[df["dat_ref"] >= start]
+    if end is not None:
+        df = df[df["dat_ref"] <= end]
+    return df
+
+
+def pagination_stop_date(mapping_class: Dict[str, Any], parameters: Dict[str, Any]) -> Optional[str]:
+    """
+    Data limite da paginação orientada por data (`early_stop` da fonte).
+
+    No modo diário é o próprio `odate`; no incremental, o início do intervalo desde a
+    marca d'água; no modo completo é `backfill_start`, se informado.
+
+    Returns:
+        Optional[str]: Data `YYYY-MM-DD` ou `None` quando a paginação deve ir até `max_pages`.
+
+    """
+    if not mapping_class.get("early_stop", False):
+        return None
+    if ingestion_mode(parameters) == "full":
+        return parameters.get("backfill_start")
+    return resolve_date_window(mapping_class.get("csv_read"), parameters)[0]
+
+
+def page_older_than(data: List[Dict[str, str]], parse_date: Callable[[str], Optional[str]], stop_date: str) -> bool:
+    """Indica se a notícia mais recente da página é anterior a `stop_date`."""
+    datas = [dat_ref for dat_ref in (parse_date(item["dat_ref"]) for item in data) if dat_ref]
+    return bool(datas) and max(datas) < stop_date
+
+
 def extrair_campos(texto):
     partes = re.split(r'\s{2,}', texto.strip())
     if len(partes) >= 3:
@@ -7,10 +7,15 @@ from .utils import (
     ewma_volatility,
     normalizar_escala,
     analisar_sentimento,
+    fontes_parciais,
+    lookback,
+    janela_lookback,
+    janela_datas,
     logger
 )
 
 
+@lookback(lambda parms: max(int(parms.get("window", 30) * 1.4 * 6), 252))  # 252 = dias úteis em 1 ano
 def indicador_risco_credito(df, parms_indicador: dict, parameters: dict = None) -> pd.DataFrame:
     """
     Calcula indicador de risco de crédito baseado em volatilidade e retorno.
@@ -29,14 +34,8 @@ def indicador_risco_credito(df, parms_indicador: dict, parameters: dict = None)
     process_full_data = parameters.get("process_full_data", False)
     logger.info("Parameters - Odate: %s, Full Data: %s", odate, process_full_data)
 
-    df['dat_ref'] = pd.to_datetime(df['dat_ref'], errors='coerce').dt.strftime('%Y-%m-%d')
-    df = df.sort_values('dat_ref', ascending=True)
-    if not process_full_data:
-        lookback_days = max(int(parms_indicador.get("window", 30) * 1.4 * 6), 252)  # 252 = dias úteis em 1 ano
-        data_limite = (pd.to_datetime(odate) - pd.Timedelta(days=lookback_days)).strftime('%Y-%m-%d')
-        logger.info("Data limite: %s (lookback_days=%d)", data_limite, lookback_days)
-
-        df = df[(df['dat_ref'] >= data_limite) & (df['dat_ref'] <= odate)]
+    janela = (None, None) if process_full_data else janela_lookback(indicador_risco_credito, parms_indicador, odate)
+    df = janela_datas(df, *janela)
 
     df = ewma_volatility(df, parms_indicador.get("variacia", 21), lambda_=parms_indicador.get("lambda_ewma", 0.94))
     df['retorno_diario'] = df['close_price'].pct_change(periods=parms_indicador.get("window", 30))
@@ -52,11 +51,12 @@ def indicador_risco_credito(df, parms_indicador: dict, parameters: dict = None)
     df['score_risco_credito'] = (1 - df['risco_bruto']) * 100
 
     if not process_full_data:
-        df = df[df["dat_ref"] == odate]
+        df = df[df["dat_ref"] == pd.Timestamp(odate)]
 
     return df[['dat_ref', 'retorno_diario', 'vol_ewma', 'rank_vol', 'rank_retorno', 'risco_bruto', 'score_risco_credito']]
 
 
+@lookback(lambda parms: max(65, parms.get("lookback_days", 180)))  # 65 dias para médias + buffer para normalização
 def indicador_retorno_mercado(df_ibov: pd.DataFrame, parms_indicador: dict, parameters: dict) -> pd.DataFrame:
     """
     Calcula indicador de retorno do mercado baseado no Ibovespa.
@@ -75,15 +75,8 @@ def indicador_retorno_mercado(df_ibov: pd.DataFrame, parms_indicador: dict, para
     process_full_data = parameters.get("process_full_data", False)
     logger.info("Parameters - Odate: %s, Full Data: %s", odate, process_full_data)
 
-    df_ibov['dat_ref'] = pd.to_datetime(df_ibov['dat_ref'], errors='coerce').dt.strftime('%Y-%m-%d')
-    df_ibov = df_ibov.sort_values('dat_ref', ascending=True)
-
-    if not process_full_data:
-        lookback_days = max(65, parms_indicador.get("lookback_days", 180))  # 65 dias para médias + buffer para normalização
-        data_limite = (pd.to_datetime(odate) - pd.Timedelta(days=lookback_days)).strftime('%Y-%m-%d')
-        logger.info("Data limite: %s (lookback_days=%d)", data_limite, lookback_days)
-
-        df_ibov = df_ibov[(df_ibov['dat_ref'] >= data_limite) & (df_ibov['dat_ref'] <= odate)]
+    janela = (None, None) if process_full_data else janela_lookback(indicador_retorno_mercado, parms_indicador, odate)
+    df_ibov = janela_datas(df_ibov, *janela)
 
     #  retorno logarítmico
     df_ibov['log_ret'] = np.log(df_ibov['close'] / df_ibov['close'].shift(1))
@@ -106,11 +99,12 @@ def indicador_retorno_mercado(df_ibov: pd.DataFrame, parms_indicador: dict, para
     df_ibov['score_retorno_mercado'] = normalizar_escala(df_ibov['score_ponderado'])
 
     if not process_full_data:
-        df_ibov = df_ibov[df_ibov["dat_ref"] == odate]
+        df_ibov = df_ibov[df_ibov["dat_ref"] == pd.Timestamp(odate)]
 
     return df_ibov[['dat_ref', 'log_ret', 'media_ret', 'desvio_ret', 'z_retorno', 'media_vol', 'score_retorno_mercado']]
 
 
+@lookback(lambda parms: max(65, parms.get("lookback_days", 180)))  # 65 dias para cálculos + buffer para normalização
 def indicador_volatilidade_mercado(df_ibov: pd.DataFrame, df_ivvb: pd.DataFrame, parms_indicador: dict, parameters: dict) -> pd.DataFrame:
     """
     Calcula indicador de volatilidade do mercado.
@@ -133,18 +127,9 @@ def indicador_volatilidade_mercado(df_ibov: pd.DataFrame, df_ivvb: pd.DataFrame,
     process_full_data = parameters.get("process_full_data", False)
     logger.info("Parameters - Odate: %s, Full Data: %s", odate, process_full_data)
 
-    df_ibov['dat_ref'] = pd.to_datetime(df_ibov['dat_ref'], errors='coerce').dt.strftime('%Y-%m-%d')
-    df_ivvb['dat_ref'] = pd.to_datetime(df_ivvb['dat_ref'], errors='coerce').dt.strftime('%Y-%m-%d')
-    df_ibov = df_ibov.sort_values('dat_ref', ascending=True)
-    df_ivvb = df_ivvb.sort_values('dat_ref', ascending=True)
-
-    if not process_full_data:
-        lookback_days = max(65, parms_indicador.get("lookback_days", 180))  # 65 dias para cálculos + buffer para normalização
-        data_limite = (pd.to_datetime(odate) - pd.Timedelta(days=lookback_days)).strftime('%Y-%m-%d')
-        logger.info("Data limite: %s (lookback_days=%d)", data_limite, lookback_days)
-
-        df_ibov = df_ibov[(df_ibov['dat_ref'] >= data_limite) & (df_ibov['dat_ref'] <= odate)]
-        df_ivvb = df_ivvb[(df_ivvb['dat_ref'] >= data_limite) & (df_ivvb['dat_ref'] <= odate)]
+    janela = (None, None) if process_full_data else janela_lookback(indicador_volatilidade_mercado, parms_indicador, odate)
+    df_ibov = janela_datas(df_ibov, *janela)
+    df_ivvb = janela_datas(df_ivvb, *janela)
 
     #  retorno logarítmico
     df_ibov['log_ret'] = np.log(df_ibov['close'] / df_ibov['close'].shift(1))
@@ -184,11 +169,12 @@ def indicador_volatilidade_mercado(df_ibov: pd.DataFrame, df_ivvb: pd.DataFrame,
     )
 
     if not process_full_data:
-        df_score = df_score[df_score["dat_ref"] == odate]
+        df_score = df_score[df_score["dat_ref"] == pd.Timestamp(odate)]
 
     return df_score
 
 
+@lookback(lambda parms: max(3, parms.get("volume_mean_window", 180)))
 def indicador_atividade_mercado(df_ibov: pd.DataFrame, parms_indicador: dict, parameters: dict) -> pd.DataFrame:
     """
     Calcula indicador de atividade do mercado baseado em retorno e volume.
@@ -205,15 +191,8 @@ def indicador_atividade_mercado(df_ibov: pd.DataFrame, parms_indicador: dict, pa
     process_full_data = parameters.get("process_full_data", False)
     logger.info("Parameters - Odate: %s, Full Data: %s", odate, process_full_data)
 
-    df_ibov['dat_ref'] = pd.to_datetime(df_ibov['dat_ref'], errors='coerce').dt.strftime('%Y-%m-%d')
-    df_ibov = df_ibov.sort_values('dat_ref', ascending=True)
-
-    if not process_full_data:
-        lookback_days = max(3, parms_indicador.get("volume_mean_window", 180))
-        data_limite = (pd.to_datetime(odate) - pd.Timedelta(days=lookback_days)).strftime('%Y-%m-%d')
-        logger.info("Data limite: %s (lookback_days=%d)", data_limite, lookback_days)
-
-        df_ibov = df_ibov[(df_ibov['dat_ref'] >= data_limite) & (df_ibov['dat_ref'] <= odate)]
+    janela = (None, None) if process_full_data else janela_lookback(indicador_atividade_mercado, parms_indicador, odate)
+    df_ibov = janela_datas(df_ibov, *janela)
 
     # retorno diário
     df_ibov['retorno'] = df_ibov['close'].pct_change() * 100
@@ -232,11 +211,12 @@ def indicador_atividade_mercado(df_ibov: pd.DataFrame, parms_indicador: dict, pa
     df_ibov['score_atividade_mercado'] = normalizar_escala(df_ibov['score_atividade_mercado'])
 
     if not process_full_data:
-        df_ibov = df_ibov[df_ibov["dat_ref"] == odate]
+        df_ibov = df_ibov[df_ibov["dat_ref"] == pd.Timestamp(odate)]
 
     return df_ibov[['dat_ref', 'retorno', 'desvio_relativo', 'score', 'score_atividade_mercado']]
 
 
+@lookback(lambda parms: max(parms.get("rolling_return_window", 3), parms.get("lookback_days", 30)))
 def indicador_confianca_mercado_local(df_ifix: pd.DataFrame, parms_indicador: dict, parameters: dict) -> pd.DataFrame:
     """
     Calcula indicador de confiança do mercado local baseado no IFIX.
@@ -253,15 +233,8 @@ def indicador_confianca_mercado_local(df_ifix: pd.DataFrame, parms_indicador: di
     process_full_data = parameters.get("process_full_data", False)
     logger.info("Parameters - Odate: %s, Full Data: %s", odate, process_full_data)
 
-    df_ifix['dat_ref'] = pd.to_datetime(df_ifix['dat_ref'], errors='coerce').dt.strftime('%Y-%m-%d')
-    df_ifix = df_ifix.sort_values('dat_ref', ascending=True)
-
-    if not process_full_data:
-        lookback_days = max(parms_indicador.get("rolling_return_window", 3), parms_indicador.get("lookback_days", 30))
-        data_limite = (pd.to_datetime(odate) - pd.Timedelta(days=lookback_days)).strftime('%Y-%m-%d')
-        logger.info("Data limite: %s (lookback_days=%d)", data_limite, lookback_days)
-
-        df_ifix = df_ifix[(df_ifix['dat_ref'] >= data_limite) & (df_ifix['dat_ref'] <= odate)]
+    janela = (None, None) if process_full_data else janela_lookback(indicador_confianca_mercado_local, parms_indicador, odate)
+    df_ifix = janela_datas(df_ifix, *janela)
 
     df_ifix['retorno'] = df_ifix['close_price'].pct_change() * 100
 
@@ -275,11 +248,12 @@ def indicador_confianca_mercado_local(df_ifix: pd.DataFrame, parms_indicador: di
     df_ifix['score_confianca_mercado'] = normalizar_escala(df_ifix['desvio_relativo'])
 
     if not process_full_data:
-        df_ifix = df_ifix[df_ifix["dat_ref"] == odate]
+        df_ifix = df_ifix[df_ifix["dat_ref"] == pd.Timestamp(odate)]
 
     return df_ifix[['dat_ref', 'retorno', 'retorno_mm', 'desvio_relativo', 'score_confianca_mercado']]
 
 
+@lookback(lambda parms: 0)  # apenas as notícias do odate
 def indicador_sentimento_midia(df_rw_infomoney, df_rw_moneytimes, df_rw_seudinheiro, df_rw_valorinveste, parameters: dict):
     """
     Calcula indicador de sentimento da mídia.
@@ -292,24 +266,30 @@ def indicador_sentimento_midia(df_rw_infomoney, df_rw_moneytimes, df_rw_seudinhe
     Score próximo de 100: Sentimento muito positivo
 
     - score_noticias: Score médio diário de sentimento (0-100)
+    - fontes_parciais: Fontes com coleta interrompida pelo orçamento de tempo da ingestão
     """
     odate = parameters.get("odate")
     process_full_data = parameters.get("process_full_data", False)
     logger.info("Parameters - Odate: %s, Full Data: %s", odate, process_full_data)
 
+    parciais = fontes_parciais(["rw_infomoney_stage", "rw_moneytimes_stage", "rw_seudinheiro_stage", "rw_valorinveste_stage"],
+                               parameters)
+    if not parciais.empty:
+        logger.info("Fontes parciais: %s", parciais.to_dict())
+
     df = pd.concat([df_rw_infomoney, df_rw_moneytimes, df_rw_seudinheiro, df_rw_valorinveste], ignore_index=True)
     df = df.drop_duplicates(subset=['fonte', 'titulo', 'link'])
 
-    # padroniza dat_ref para YYYY-MM-DD
+    # padroniza dat_ref como data
     if 'dat_ref' in df.columns:
-        df['dat_ref'] = pd.to_datetime(df['dat_ref'], errors='coerce').dt.strftime('%Y-%m-%d')
+        df['dat_ref'] = pd.to_datetime(df['dat_ref'], errors='coerce')
 
     if not process_full_data:
-        df = df[df["dat_ref"] == odate]
+        df = df[df["dat_ref"] == pd.Timestamp(odate)]
 
     # nada para processar: retorna DF vazio com schema esperado
     if df.empty:
-        return pd.DataFrame(columns=['dat_ref', 'score_noticias'])
+        return pd.DataFrame(columns=['dat_ref', 'score_noticias', 'fontes_parciais'])
 
     # garante string e trata nulos para análise de sentimento
     df['titulo'] = df['titulo'].fillna('').astype(str)
@@ -329,5 +309,6 @@ def indicador_sentimento_midia(df_rw_infomoney, df_rw_moneytimes, df_rw_seudinhe
     # normalizar para 0–100 (percentis robustos)
     df['score_noticias'] = normalizar_escala(df['score_sentimento'])
     sentimento_dia = df.groupby('dat_ref', as_index=False)['score_noticias'].mean()
+    sentimento_dia['fontes_parciais'] = sentimento_dia['dat_ref'].map(parciais).fillna('')
 
     return sentimento_dia
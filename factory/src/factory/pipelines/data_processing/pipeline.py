@@ -73,8 +73,8 @@ def create_pipeline(**kwargs) -> Pipeline:
                 inputs=[
                     "rw_infomoney_stage",
                     "rw_moneytimes_stage",
-                    "rw_valorinveste_stage",
                     "rw_seudinheiro_stage",
+                    "rw_valorinveste_stage",
                     "parameters"
                 ],
                 outputs="indicador_sentimento_noticias",
@@ -1,8 +1,10 @@
+from typing import Callable, Optional, Tuple
 import pandas as pd
 import numpy as np
 import logging
 import nltk
 from nltk.sentiment import SentimentIntensityAnalyzer
+from factory.pipelines.data_ingestion.stores import WatermarkStore
 
 logger = logging.getLogger(__name__)
 
@@ -60,3 +62,81 @@ def analisar_sentimento(texto):
         "positivo": score["pos"],
         "compound": score["compound"]
     }
+
+
+def fontes_parciais(fontes: list, parameters: dict) -> pd.Series:
+    """
+    Fontes com coleta parcial (interrompida pelo orçamento de tempo da ingestão), por dat_ref.
+
+    Lê a completude por dat_ref registrada no `WatermarkStore` a cada coleta, e não a coluna
+    `coleta_completa` do staging: com a deduplicação por chave, as linhas de uma nova coleta
+    completa podem ser descartadas e a marca de parcial ficaria para sempre.
+
+    Args:
+        fontes (list): Nomes dos datasets de staging.
+        parameters (dict): Parâmetros da execução.
+
+    Returns:
+        pd.Series: Nomes dos datasets parciais separados por vírgula, indexados por dat_ref (data).
+    """
+    watermark_parms = parameters.get("watermark_parms") or {}
+    store = WatermarkStore(watermark_parms.get("path", "data/watermarks"))
+    parciais = {}
+    for nome in fontes:
+        for dat_ref in store.partial_dates(nome):
+            parciais.setdefault(pd.Timestamp(dat_ref), set()).add(nome)
+
+    return pd.Series({dat_ref: ", ".join(sorted(nomes)) for dat_ref, nomes in parciais.items()}, dtype=object)
+
+
+def lookback(dias: Callable[[dict], int]):
+    """
+    Declara o histórico de que o nó precisa, em dias corridos antes do odate.
+
+    O `LookbackPushdownHook` usa a declaração para ler do catálogo apenas o intervalo
+    `[odate - dias, odate]` dos datasets de entrada (exceto com `process_full_data`).
+
+    Args:
+        dias (Callable[[dict], int]): Recebe os parâmetros do indicador e retorna os dias de histórico.
+    """
+    def decorator(func):
+        func.lookback_days = dias
+        return func
+    return decorator
+
+
+def janela_lookback(func, parms_indicador: dict, odate: Optional[str]) -> Tuple[str, str]:
+    """
+    Intervalo `(data_limite, odate)` de dat_ref declarado pelo nó com `lookback`.
+
+    Args:
+        func: Função do nó decorada com `lookback`.
+        parms_indicador (dict): Parâmetros do indicador.
+        odate (Optional[str]): Data de referência da execução (YYYY-MM-DD).
+
+    Returns:
+        Tuple[str, str]: Data limite e odate, no formato YYYY-MM-DD.
+    """
+    lookback_days = func.lookback_days(parms_indicador or {})
+    data_limite = (pd.to_datetime(odate) - pd.Timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+    logger.info("Data limite: %s (lookback_days=%d)", data_limite, lookback_days)
+    return data_limite, odate
+
+
+def janela_datas(df: pd.DataFrame, inicio: Optional[str] = None, fim: Optional[str] = None) -> pd.DataFrame:
+    """
+    Ordena por dat_ref (como data) e recorta o intervalo `[inicio, fim]` pelo índice de datas.
+
+    Args:
+        df (pd.DataFrame): Dados com a coluna `dat_ref` (data ou texto `YYYY-MM-DD`).
+        inicio (Optional[str]): Data inicial (inclusiva); `None` sem recorte.
+        fim (Optional[str]): Data final (inclusiva); `None` sem recorte.
+
+    Returns:
+        pd.DataFrame: Dados em ordem crescente de dat_ref, com `dat_ref` como `datetime64`.
+    """
+    datas = pd.to_datetime(df['dat_ref'], errors='coerce')
+    df = df.assign(dat_ref=datas).set_index(pd.DatetimeIndex(datas)).sort_index(kind='stable')
+    if inicio is not None or fim is not None:
+        df = df[df.index.notna()].loc[inicio:fim]
+    return df.reset_index(drop=True)
@@ -30,15 +30,15 @@ def calculate_score_dim(config: dict,
     logger.info("Parameters - Odate: %s, Full Data: %s", odate, process_full_data)
 
     df = _generate_trading_days_calendar()
-    df = df.merge(df_indicador_risco_credito[['dat_ref', 'score_risco_credito']], how='left', on='dat_ref')\
-           .merge(df_indicador_retorno_mercado[['dat_ref', 'score_retorno_mercado']], how='left', on='dat_ref')\
-           .merge(df_indicador_volatilidade_mercado[['dat_ref', 'score_volatilidade_mercado']], how='left', on='dat_ref')\
-           .merge(df_indicador_atividade_mercado[['dat_ref', 'score_atividade_mercado']], how='left', on='dat_ref')\
-           .merge(df_indicador_confianca_mercado_local[['dat_ref', 'score_confianca_mercado']], how='left', on='dat_ref')\
-           .merge(df_indicador_sentimento_noticias[['dat_ref', 'score_noticias']], how='left', on='dat_ref')
+    df = df.merge(_por_data(df_indicador_risco_credito, 'score_risco_credito'), how='left', on='dat_ref')\
+           .merge(_por_data(df_indicador_retorno_mercado, 'score_retorno_mercado'), how='left', on='dat_ref')\
+           .merge(_por_data(df_indicador_volatilidade_mercado, 'score_volatilidade_mercado'), how='left', on='dat_ref')\
+           .merge(_por_data(df_indicador_atividade_mercado, 'score_atividade_mercado'), how='left', on='dat_ref')\
+           .merge(_por_data(df_indicador_confianca_mercado_local, 'score_confianca_mercado'), how='left', on='dat_ref')\
+           .merge(_por_data(df_indicador_sentimento_noticias, 'score_noticias'), how='left', on='dat_ref')
 
     if not process_full_data:
-        df = df[df["dat_ref"] == odate]
+        df = df[df["dat_ref"] == pd.Timestamp(odate)]
 
     metodo = config.get('metrica_calculo', 'ponderado')
     pesos = config.get('pesos', {})
@@ -62,16 +62,22 @@ def _generate_trading_days_calendar(start='2017-01-01'):
     years = range(pd.to_datetime(start).year, date.today().year + 1)
     feriados = [cal.holidays(y) for y in years]
     feriados = [dt for year in feriados for dt, _ in year]
-    feriados = pd.to_datetime(feriados).strftime('%Y-%m-%d')
+    feriados = pd.to_datetime(feriados)
 
     # datas úteis (excluindo finais de semana)
     dates = pd.date_range(start=start, end=date.today(), freq='B')
     df = pd.DataFrame({'dat_ref': dates})
-    df['dat_ref'] = df['dat_ref'].dt.strftime('%Y-%m-%d')
 
     return df[~df['dat_ref'].isin(feriados)]
 
 
+def _por_data(df: pd.DataFrame, coluna: str) -> pd.DataFrame:
+    """
+    Seleciona `dat_ref` (como data, para o merge com o calendário) e o score do indicador.
+    """
+    return pd.DataFrame({'dat_ref': pd.to_datetime(df['dat_ref'], errors='coerce'), coluna: df[coluna]})
+
+
 def _calc_ponderado(row, pesos):
     """
     Calcula a média ponderada dos valores de uma linha do DataFrame.
@@ -6,7 +6,9 @@ https://docs.kedro.org/en/stable/kedro_project_setup/settings.html."""
 # For example, after creating a hooks.py and defining a ProjectHooks class there, do
 # from factory.hooks import ProjectHooks
 # Hooks are executed in a Last-In-First-Out (LIFO) order.
-# HOOKS = (DataPartitioningHook(),)
+from factory.hooks import DataPartitioningHook, IngestionRunHook, LookbackPushdownHook, WatermarkHook  # noqa: E402
+
+HOOKS = (DataPartitioningHook(), LookbackPushdownHook(), WatermarkHook(), IngestionRunHook())
 
 # Installed plugins for which to disable hook auto-registration.
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
@@ -42,5 +44,7 @@ CONFIG_LOADER_ARGS = {
 # CONTEXT_CLASS = KedroContext
 
 # Class that manages the Data Catalog.
-# from kedro.io import DataCatalog
-# DATA_CATALOG_CLASS = DataCatalog
+# CachedDataCatalog serve as leituras repetidas de um dataset da memória durante a sessão.
+from factory.catalog import CachedDataCatalog  # noqa: E402
+
+DATA_CATALOG_CLASS = CachedDataCatalog
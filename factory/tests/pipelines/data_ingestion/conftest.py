@@ -0,0 +1,70 @@
+"""
+Fixtures compartilhadas dos testes de ingestão: cliente HTTP respondido sem rede e a
+listagem paginada de notícias usada pelos testes de paginação e backfill.
+"""
+import io
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import pytest
+import requests
+
+from factory.pipelines.data_ingestion import nodes, utils
+from factory.pipelines.data_ingestion.utils import HttpClient, PayloadRecorder
+
+
+def fake_response(url: str, body: Any = b"", status: int = 200, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    """Resposta HTTP em memória; o corpo vem de `raw`, como nas respostas com `stream=True`."""
+    response = requests.Response()
+    response.status_code = status
+    response.encoding = "utf-8"
+    response.url = url
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(body.encode("utf-8") if isinstance(body, str) else body)
+    return response
+
+
+def listing_page(number: int, items: int = 2) -> str:
+    """Página `number` da listagem (layout do Seu Dinheiro): a primeira tem notícias de 11/03/2025, cada página um dia antes."""
+    item = ('<div class="feed_content"><h2 class="feed_content_title"><a href="https://fonte.test/{n}-{i}">'
+            'Notícia {n}.{i}</a></h2><div class="feed_content_time">{dia} de março de 2025</div></div>')
+    return "<html><body>" + "".join(item.format(n=number, i=i, dia=12 - number) for i in range(items)) + "</body></html>"
+
+
+def page_number(url: str) -> int:
+    """Número da página de uma URL da listagem (`.../pagina/<number>/`)."""
+    return int(url.rstrip("/").rsplit("/", 1)[-1])
+
+
+@pytest.fixture
+def fake_http_client(monkeypatch) -> Callable[..., HttpClient]:
+    """
+    Fábrica de `HttpClient` cujas requisições são respondidas por `pages(url)`, sem rede.
+
+    `pages` devolve o corpo (`bytes` ou `str`) ou uma `requests.Response` pronta, ou levanta
+    a falha simulada; `recorder` é o gravador da execução, se houver. O cliente registra as
+    URLs pedidas em `calls` e os argumentos de cada requisição (`headers`, `stream`, ...) em
+    `sent`, e passa a ser o cliente do processo (`get_http_client`).
+    """
+    def make(pages: Callable[[str], Any], http_parms: Optional[Dict[str, Any]] = None,
+             recorder: Optional[PayloadRecorder] = None) -> HttpClient:
+        http_parms = {"rate_per_second": 0, **(http_parms or {})}
+        client = HttpClient(http_parms, recorder)
+        client.calls, client.sent = [], []
+        lock = threading.Lock()
+
+        def get(url, **kwargs):
+            with lock:
+                client.calls.append(url)
+                client.sent.append(kwargs)
+            page = pages(url)
+            return page if isinstance(page, requests.Response) else fake_response(url, page)
+
+        monkeypatch.setattr(client._session, "get", get)  # pylint: disable=protected-access
+        monkeypatch.setattr(utils, "_HTTP_CLIENT", client)
+        monkeypatch.setattr(utils, "_HTTP_CLIENT_PARMS", http_parms)
+        monkeypatch.setattr(utils, "get_http_client", lambda *args, **kwargs: client)
+        monkeypatch.setattr(nodes, "get_http_client", lambda *args, **kwargs: client)
+        return client
+
+    return make
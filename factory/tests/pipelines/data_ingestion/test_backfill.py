@@ -0,0 +1,112 @@
+"""
+Testes da janela de datas por modo de ingestão (`resolve_date_window`) e da retomada do
+backfill paginado pelos checkpoints por página (`BackfillCheckpoint`).
+"""
+import pandas as pd
+import pytest
+
+from factory.pipelines.data_ingestion import nodes
+from factory.pipelines.data_ingestion.stores import BackfillCheckpoint, WatermarkStore
+from factory.pipelines.data_ingestion.utils import DeadlineExceeded, HttpClient, parse_data_portugues, parse_seudinheiro, resolve_date_window
+
+from .conftest import listing_page, page_number
+
+MAPPING = {"url": "https://fonte.test/ultimas/", "pattern_pages": "pagina/<number>/", "csv_read": "rw_seudinheiro_stage",
+           "max_pages_backfill": 20, "backfill_lookahead": 1, "backfill_chunk_pages": 2, "backfill_empty_pages": 3,
+           "class_feed": "feed_content", "class_title": "feed_content_title", "class_date": "feed_content_time"}
+
+
+def _parse_page(html: str):
+    return parse_seudinheiro(html, MAPPING["class_feed"], MAPPING["class_title"], MAPPING["class_date"])
+
+
+@pytest.fixture
+def parameters(tmp_path) -> dict:
+    return {"odate": "2025-03-10", "ingestion_mode": "backfill", "backfill_start": "2025-03-04",
+            "backfill_parms": {"path": str(tmp_path / "backfill")},
+            "deadline_parms": {"path": str(tmp_path / "runs")},
+            "watermark_parms": {"path": str(tmp_path / "watermarks")}}
+
+
+def _client(fake_http_client, fail_from: int = None) -> HttpClient:
+    """Cliente cujas páginas a partir de `fail_from` esgotam o prazo da execução"""
+    def page(url: str) -> str:
+        if fail_from is not None and page_number(url) >= fail_from:
+            raise DeadlineExceeded(f"Prazo da execução esgotado para: {url}")
+        return listing_page(page_number(url))
+
+    return fake_http_client(page, {"max_workers": 2})
+
+
+def _pages(client: HttpClient) -> list:
+    return [page_number(url) for url in client.calls]
+
+
+def _backfill(client: HttpClient, parameters: dict):
+    return list(nodes._backfill_news("SeuDinheiro", MAPPING, parameters, client, _parse_page,  # pylint: disable=protected-access
+                                     parse_data_portugues, nodes._transform_seudinheiro))  # pylint: disable=protected-access
+
+
+class TestResolveDateWindow:
+    def test_daily(self, parameters):
+        assert resolve_date_window("rw_x_stage", {**parameters, "ingestion_mode": "daily"}) == ("2025-03-10", "2025-03-10")
+
+    def test_full(self, parameters):
+        assert resolve_date_window("rw_x_stage", {**parameters, "process_full_data": True}) == (None, None)
+
+    def test_backfill(self, parameters):
+        assert resolve_date_window("rw_x_stage", parameters) == ("2025-03-04", "2025-03-10")
+        assert resolve_date_window("rw_x_stage", {**parameters, "backfill_end": "2025-03-07"}) == ("2025-03-04", "2025-03-07")
+        with pytest.raises(ValueError):
+            resolve_date_window("rw_x_stage", {**parameters, "backfill_start": None})
+
+    def test_incremental(self, parameters):
+        parameters = {**parameters, "ingestion_mode": "incremental"}
+        parameters["watermark_parms"]["max_gap_days"] = 5
+        assert resolve_date_window("rw_x_stage", parameters) == ("2025-03-05", "2025-03-10")
+
+        WatermarkStore(parameters["watermark_parms"]["path"]).advance(
+            "rw_x_stage", pd.DataFrame({"dat_ref": ["2025-03-01", "2025-03-08"]}))
+        assert resolve_date_window("rw_x_stage", parameters) == ("2025-03-09", "2025-03-10")
+
+    def test_invalid_mode(self, parameters):
+        with pytest.raises(ValueError):
+            resolve_date_window("rw_x_stage", {**parameters, "ingestion_mode": "weekly"})
+
+
+class TestBackfillResume:
+    def test_resumes_after_interruption(self, fake_http_client, parameters):
+        interrupted = _client(fake_http_client, fail_from=5)
+        first = _backfill(interrupted, parameters)
+
+        assert sorted(set(_pages(interrupted))) == [1, 2, 3, 4, 5]
+        assert all(chunk["coleta_completa"].all() for chunk in first)
+        checkpoint = BackfillCheckpoint(parameters["backfill_parms"]["path"], MAPPING["csv_read"], "2025-03-04", "2025-03-10")
+        assert (checkpoint.fetched, checkpoint.written, checkpoint.finished) == (4, 4, False)
+
+        # nova tentativa: parte da página 5 e termina na primeira página anterior a backfill_start (a 9, de 03/03)
+        resumed = _client(fake_http_client)
+        second = _backfill(resumed, parameters)
+
+        assert min(_pages(resumed)) == 5
+        assert max(_pages(resumed)) <= 10
+        dates = pd.concat(first + second)["dat_ref"]
+        assert set(dates) == set(pd.date_range("2025-03-04", "2025-03-10"))
+        assert len(dates) == 2 * 7  # sem repetir as páginas já gravadas
+
+        finished = _client(fake_http_client)
+        assert _backfill(finished, parameters) == []
+        assert finished.calls == []
+
+    def test_replays_fetched_pages_not_yet_written(self, fake_http_client, parameters):
+        checkpoint = BackfillCheckpoint(parameters["backfill_parms"]["path"], MAPPING["csv_read"], "2025-03-04", "2025-03-10")
+        for number in (1, 2, 3):
+            checkpoint.save_page(number, _parse_page(listing_page(number)))
+        checkpoint.mark_written(2)  # página 3 buscada, mas o processo caiu antes de gravá-la
+
+        client = _client(fake_http_client)
+        chunks = _backfill(client, parameters)
+
+        assert min(_pages(client)) == 4
+        assert set(pd.Timestamp(f"2025-03-{12 - number:02d}") for number in (1, 2)).isdisjoint(pd.concat(chunks)["dat_ref"])
+        assert pd.Timestamp("2025-03-09") in set(pd.concat(chunks)["dat_ref"])
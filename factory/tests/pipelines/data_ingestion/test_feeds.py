@@ -0,0 +1,129 @@
+"""
+Testes da ingestão por feed: RSS 2.0, Atom e sitemap de notícias (`parse_feed`) e o
+retorno ao scraping HTML quando o feed falha ou não cobre a janela (`_ingest_feed`).
+"""
+from xml.etree.ElementTree import ParseError
+
+import pandas as pd
+import pytest
+import requests
+
+from factory.pipelines.data_ingestion import nodes
+from factory.pipelines.data_ingestion.utils import data_feed, parse_feed
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel>
+  <title>InfoMoney</title><link>https://fonte.test/</link>
+  <item>
+    <title>Ibovespa fecha em alta</title><link>https://fonte.test/mercados/ibovespa</link>
+    <pubDate>Tue, 11 Mar 2025 01:30:00 +0000</pubDate><category>Mercados</category>
+  </item>
+  <item>
+    <title>Patrocinado</title><link>https://fonte.test/publieditorial/x</link>
+    <pubDate>Mon, 10 Mar 2025 12:00:00 -0300</pubDate><category>Publieditorial</category>
+  </item>
+  <item>
+    <title>Dólar recua</title><link>https://fonte.test/mercados/dolar</link>
+    <pubDate>Sun, 09 Mar 2025 15:00:00 -0300</pubDate><category>Mercados</category>
+  </item>
+</channel></rss>""".encode("utf-8")
+
+ATOM = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Money Times</title><link rel="self" href="https://fonte.test/feed"/>
+  <entry>
+    <title>Copom mantém a Selic</title>
+    <link rel="alternate" href="https://fonte.test/copom"/><link rel="related" href="https://fonte.test/outra"/>
+    <published>2025-03-10T18:00:00-03:00</published><updated>2025-03-11T09:00:00-03:00</updated>
+    <category term="Economia"/>
+  </entry>
+</feed>""".encode("utf-8")
+
+SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+  <url>
+    <loc>https://fonte.test/ifix</loc>
+    <news:news>
+      <news:publication><news:name>Seu Dinheiro</news:name></news:publication>
+      <news:publication_date>2025-03-10</news:publication_date><news:title>IFIX renova máxima</news:title>
+    </news:news>
+  </url>
+  <url><loc>https://fonte.test/sem-titulo</loc></url>
+</urlset>""".encode("utf-8")
+
+MAPPING = {"csv_read": "rw_infomoney_stage",
+           "feed": {"enabled": True, "url": "https://fonte.test/feed/", "exclude_categories": ["Publieditorial"]}}
+
+
+@pytest.fixture
+def parameters(tmp_path) -> dict:
+    return {"odate": "2025-03-10", "ingestion_mode": "daily",
+            "deadline_parms": {"path": str(tmp_path / "runs")},
+            "watermark_parms": {"path": str(tmp_path / "watermarks")}}
+
+
+class TestParseFeed:
+    def test_rss(self):
+        noticias = parse_feed(RSS, "InfoMoney")
+
+        assert [noticia["titulo"] for noticia in noticias] == ["Ibovespa fecha em alta", "Patrocinado", "Dólar recua"]
+        assert noticias[0] == {"fonte": "InfoMoney", "titulo": "Ibovespa fecha em alta", "dat_ref": "2025-03-10",
+                               "link": "https://fonte.test/mercados/ibovespa", "categoria": "Mercados"}
+
+    def test_atom(self):
+        assert parse_feed(ATOM, "MoneyTimes") == [{"fonte": "MoneyTimes", "titulo": "Copom mantém a Selic",
+                                                   "dat_ref": "2025-03-10", "link": "https://fonte.test/copom",
+                                                   "categoria": "Economia"}]
+
+    def test_news_sitemap(self):
+        assert parse_feed(SITEMAP, "Seu Dinheiro") == [{"fonte": "Seu Dinheiro", "titulo": "IFIX renova máxima",
+                                                        "dat_ref": "2025-03-10", "link": "https://fonte.test/ifix",
+                                                        "categoria": None}]
+
+    def test_invalid_xml(self):
+        with pytest.raises(ParseError):
+            parse_feed(b"<html><body>erro</body>", "InfoMoney")
+
+    @pytest.mark.parametrize("texto, esperado", [
+        ("Tue, 11 Mar 2025 02:59:00 +0000", "2025-03-10"),
+        ("2025-03-11T03:00:00Z", "2025-03-11"),
+        ("2025-03-10", "2025-03-10"),
+        ("ontem", None),
+        (None, None),
+    ])
+    def test_data_feed(self, texto, esperado):
+        assert data_feed(texto) == esperado
+
+
+class TestIngestFeed:
+    def test_filters_window_and_categories(self, monkeypatch, parameters):
+        monkeypatch.setattr(nodes, "scraping_feed", lambda url, fonte, **kwargs: parse_feed(RSS, fonte))
+
+        df = nodes._ingest_feed("InfoMoney", MAPPING, parameters)  # pylint: disable=protected-access
+
+        assert df["titulo"].tolist() == ["Ibovespa fecha em alta"]
+        assert df["dat_ref"].tolist() == [pd.Timestamp("2025-03-10")]
+        assert df["coleta_completa"].all()
+
+    def test_falls_back_when_feed_does_not_reach_window(self, monkeypatch, parameters):
+        monkeypatch.setattr(nodes, "scraping_feed", lambda url, fonte, **kwargs: parse_feed(ATOM, fonte))
+
+        assert nodes._ingest_feed("MoneyTimes", MAPPING, {**parameters, "odate": "2025-03-09"}) is None  # pylint: disable=protected-access
+
+    @pytest.mark.parametrize("error", [ParseError("xml inválido"), requests.exceptions.ConnectionError("fora do ar")])
+    def test_falls_back_on_feed_errors(self, monkeypatch, parameters, error):
+        def scraping_feed(url, fonte, **kwargs):
+            raise error
+        monkeypatch.setattr(nodes, "scraping_feed", scraping_feed)
+
+        assert nodes._ingest_feed("InfoMoney", MAPPING, parameters) is None  # pylint: disable=protected-access
+
+    def test_disabled_by_default(self, monkeypatch, parameters):
+        monkeypatch.setattr(nodes, "scraping_feed", lambda url, fonte, **kwargs: parse_feed(RSS, fonte))
+        mapping = {**MAPPING, "feed": {key: value for key, value in MAPPING["feed"].items() if key != "enabled"}}
+
+        assert nodes._ingest_feed("InfoMoney", mapping, parameters) is None  # pylint: disable=protected-access
+        assert nodes._ingest_feed("InfoMoney", {**mapping, "feed": None}, parameters) is None  # pylint: disable=protected-access
+
+    def test_only_in_feed_modes(self, parameters):
+        assert nodes._ingest_feed("InfoMoney", MAPPING, {**parameters, "process_full_data": True}) is None  # pylint: disable=protected-access
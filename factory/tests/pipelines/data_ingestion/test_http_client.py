@@ -0,0 +1,199 @@
+"""
+Testes do HttpClient: retries com backoff, `Retry-After`, a separação entre o prazo da
+execução (`DeadlineExceeded`) e o orçamento da fonte (`SourceBudgetExceeded`) e o cache
+de respostas (`ResponseCache`).
+"""
+from time import monotonic
+
+import pytest
+import requests
+
+from factory.pipelines.data_ingestion import utils
+from factory.pipelines.data_ingestion.utils import (
+    DeadlineExceeded,
+    HttpClient,
+    ResponseCache,
+    SourceBudgetExceeded,
+    scraping,
+    until_deadline,
+)
+
+from .conftest import fake_response
+
+HTTP_PARMS = {"rate_per_second": 0, "source_budget": 60,
+              "retry": {"total": 3, "backoff_base": 1.0, "backoff_max": 30.0}}
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list:
+    waits = []
+    monkeypatch.setattr(utils, "time_sleep", waits.append)
+    return waits
+
+
+def _response(status: int, body: bytes = b"ok", headers: dict = None) -> requests.Response:
+    return fake_response("https://fonte.test/", body, status, headers)
+
+
+def _client(fake_http_client, replies, **http_parms) -> HttpClient:
+    """Cliente cujas requisições devolvem (ou levantam) `replies` em ordem"""
+    replies = list(replies)
+
+    def reply(url):
+        page = replies.pop(0)
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    return fake_http_client(reply, {**HTTP_PARMS, **http_parms})
+
+
+class TestHttpClientRetry:
+    def test_retries_status_with_backoff(self, fake_http_client, sleeps):
+        client = _client(fake_http_client, [_response(503), _response(502), _response(200)])
+
+        response = client.get("https://fonte.test/a")
+
+        assert response.status_code == 200
+        assert len(client.calls) == 3
+        assert len(sleeps) == 2
+        assert 0 <= sleeps[0] <= 1.0 and 0 <= sleeps[1] <= 2.0  # jitter completo sobre base * 2^tentativa
+
+    def test_retries_connection_errors_then_raises(self, fake_http_client, sleeps):
+        client = _client(fake_http_client, [requests.exceptions.ConnectionError("reset")] * 4)
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.get("https://fonte.test/a")
+        assert len(client.calls) == 4
+        assert len(sleeps) == 3
+
+    def test_exhausted_status_retries_raise_http_error(self, fake_http_client, sleeps):
+        client = _client(fake_http_client, [_response(500)] * 4)
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get("https://fonte.test/a")
+
+    def test_honours_retry_after(self, fake_http_client, sleeps):
+        client = _client(fake_http_client, [_response(429, headers={"Retry-After": "7"}), _response(200)])
+
+        assert client.get("https://fonte.test/a").status_code == 200
+        assert sleeps == [7.0]
+
+    def test_retry_after_is_capped(self, fake_http_client, sleeps):
+        client = _client(fake_http_client, [_response(429, headers={"Retry-After": "120"}), _response(200)])
+
+        client.get("https://fonte.test/a")
+        assert sleeps == [30.0]
+
+
+class TestDeadlineSplit:
+    def test_run_deadline_raises_deadline_exceeded(self, fake_http_client, sleeps):
+        client = _client(fake_http_client, [_response(200)])
+
+        with pytest.raises(DeadlineExceeded):
+            client.get("https://fonte.test/a", deadline=monotonic() - 1)
+        assert client.calls == []
+
+    def test_source_budget_is_not_a_deadline(self, fake_http_client, sleeps):
+        client = _client(fake_http_client, [_response(200)], source_budget=0)
+
+        with pytest.raises(SourceBudgetExceeded) as error:
+            client.get("https://fonte.test/a")
+        assert not isinstance(error.value, DeadlineExceeded)
+
+    def test_retry_wait_beyond_source_budget(self, fake_http_client, sleeps):
+        client = _client(fake_http_client, [_response(503, headers={"Retry-After": "20"})], source_budget=10)
+
+        with pytest.raises(SourceBudgetExceeded):
+            client.get("https://fonte.test/a", deadline=monotonic() + 3600)
+        assert sleeps == []
+
+    def test_retry_wait_beyond_run_deadline(self, fake_http_client, sleeps):
+        client = _client(fake_http_client, [_response(503, headers={"Retry-After": "20"})], source_budget=3600)
+
+        with pytest.raises(DeadlineExceeded):
+            client.get("https://fonte.test/a", deadline=monotonic() + 10)
+
+    def test_pagination_stops_only_on_run_deadline(self, fake_http_client, sleeps):
+        client = _client(fake_http_client, [_response(200)] * 2, source_budget=0)
+
+        with pytest.raises(SourceBudgetExceeded):
+            list(until_deadline(client.iter_pages(["https://fonte.test/1", "https://fonte.test/2"])))
+
+        client = _client(fake_http_client, [_response(200)] * 2)
+        pages = list(until_deadline(client.iter_pages(["https://fonte.test/1"], deadline=monotonic() - 1)))
+        assert pages == [(None, None)]
+
+    def test_scraping_reports_source_budget_as_failure(self, fake_http_client, sleeps):
+        _client(fake_http_client, [_response(200)], source_budget=0)
+
+        with pytest.raises(ValueError):
+            scraping("https://fonte.test/tabela", {"User-Agent": "teste"})
+
+
+class TestResponseCache:
+    @pytest.fixture
+    def cache_parms(self, tmp_path) -> dict:
+        return {"enabled": True, "path": str(tmp_path / "http_cache"), "ttl": 3600}
+
+    def test_fresh_entry_is_served_from_disk(self, fake_http_client, sleeps, cache_parms):
+        client = _client(fake_http_client, [_response(200, b"v1", {"ETag": '"v1"'})], cache=cache_parms)
+
+        assert client.get("https://fonte.test/a").content == b"v1"
+        assert client.get("https://fonte.test/a").content == b"v1"
+        assert len(client.calls) == 1
+        assert client.cache_stats() == {"hits": 1, "revalidated": 0, "misses": 1}
+
+    def test_key_includes_headers(self, fake_http_client, sleeps, cache_parms):
+        client = _client(fake_http_client, [_response(200, b"pt"), _response(200, b"en")], cache=cache_parms)
+
+        assert client.get("https://fonte.test/a", {"Accept-Language": "pt"}).content == b"pt"
+        assert client.get("https://fonte.test/a", {"Accept-Language": "en"}).content == b"en"
+        assert len(client.calls) == 2
+
+    def test_expired_entry_is_revalidated(self, fake_http_client, sleeps, cache_parms):
+        first = _response(200, b"v1", {"ETag": '"v1"', "Last-Modified": "Mon, 10 Mar 2025 10:00:00 GMT"})
+        client = _client(fake_http_client, [first, _response(304, b"")], cache=cache_parms)
+
+        client.get("https://fonte.test/a")
+        response = client.get("https://fonte.test/a", ttl=0)
+
+        assert response.status_code == 200 and response.content == b"v1"
+        assert client.sent[1]["headers"]["If-None-Match"] == '"v1"'
+        assert client.sent[1]["headers"]["If-Modified-Since"] == "Mon, 10 Mar 2025 10:00:00 GMT"
+        assert client.cache_stats()["revalidated"] == 1
+
+        assert client.get("https://fonte.test/a").content == b"v1"  # revalidada volta a ser fresca
+        assert len(client.calls) == 2
+
+    def test_changed_entry_is_replaced(self, fake_http_client, sleeps, cache_parms):
+        client = _client(fake_http_client, [_response(200, b"v1", {"ETag": '"v1"'}),
+                                            _response(200, b"v2", {"ETag": '"v2"'})], cache=cache_parms)
+
+        client.get("https://fonte.test/a")
+        assert client.get("https://fonte.test/a", ttl=0).content == b"v2"
+        assert client.get("https://fonte.test/a").content == b"v2"
+        assert client.cache_stats() == {"hits": 1, "revalidated": 0, "misses": 2}
+
+    def test_offline_serves_stale_entries_only(self, fake_http_client, sleeps, cache_parms):
+        online = _client(fake_http_client, [_response(200, b"v1")], cache=cache_parms)
+        online.get("https://fonte.test/a")
+
+        offline = _client(fake_http_client, [], cache={**cache_parms, "offline": True, "ttl": 0})
+        assert offline.get("https://fonte.test/a").content == b"v1"
+        with pytest.raises(requests.exceptions.ConnectionError):
+            offline.get("https://fonte.test/b")
+        assert offline.calls == []
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ResponseCache(str(tmp_path / "http_cache"), max_bytes=10)
+        keys = [cache.key(f"https://fonte.test/{name}") for name in "abc"]
+
+        cache.store(keys[0], _response(200, b"aaaa"))
+        cache.store(keys[1], _response(200, b"bbbb"))
+        cache.load(cache.lookup(keys[0]))  # `a` passa a ser a mais recente
+        cache.store(keys[2], _response(200, b"cccc"))
+
+        assert cache.lookup(keys[1]) is None
+        assert cache.load(cache.lookup(keys[0])).content == b"aaaa"
+        assert cache.load(cache.lookup(keys[2])).content == b"cccc"
@@ -0,0 +1,115 @@
+"""
+Testes do orçamento de tempo da ingestão (`ingestion_deadline`) e do registro de completude
+das coletas (`finish_ingestion`), consultado pelos indicadores (`fontes_parciais`).
+"""
+import os
+from time import monotonic
+
+import pandas as pd
+import pytest
+from kedro.io import DataCatalog
+
+from factory.hooks import IngestionRunHook
+from factory.pipelines.data_ingestion.stores import IngestionRunStore, WatermarkStore
+from factory.pipelines.data_ingestion.utils import (deadline_exceeded, finish_ingestion, ingestion_deadline,
+                                                     ingestion_run_id, ingestion_run_store)
+from factory.pipelines.data_processing.utils import fontes_parciais
+
+
+@pytest.fixture
+def parameters(tmp_path) -> dict:
+    return {"odate": "2025-03-10", "run_id": "manual__2025-03-10",
+            "deadline_parms": {"path": str(tmp_path / "runs")},
+            "watermark_parms": {"path": str(tmp_path / "watermarks")}}
+
+
+def _news(*dates: str) -> pd.DataFrame:
+    return pd.DataFrame({"dat_ref": list(dates), "fonte": "InfoMoney", "titulo": [f"t{i}" for i in range(len(dates))]})
+
+
+class TestIngestionDeadline:
+    def test_without_budgets(self, parameters):
+        assert ingestion_deadline(parameters) is None
+        assert not deadline_exceeded(None)
+
+    def test_node_budget(self, parameters):
+        parameters["deadline_parms"]["node_budget_seconds"] = 60
+
+        deadline = ingestion_deadline(parameters)
+        assert monotonic() + 59 < deadline <= monotonic() + 60
+        assert not deadline_exceeded(deadline)
+        assert deadline_exceeded(monotonic() - 1)
+
+    def test_stage_budget_counts_from_first_node(self, parameters):
+        parameters["deadline_parms"].update(node_budget_seconds=600, stage_budget_seconds=100)
+        store = IngestionRunStore(parameters["deadline_parms"]["path"], parameters["run_id"])
+        started_at = store.started_at()
+        with open(os.path.join(store.path, "_started"), "w", encoding="utf-8") as start:
+            start.write(repr(started_at - 90))  # o primeiro nó do estágio começou há 90 s
+
+        deadline = ingestion_deadline(parameters)
+        assert monotonic() + 5 < deadline <= monotonic() + 10
+
+
+    @pytest.mark.parametrize("first, rerun", [
+        ({"session_id": "2025-03-10T20.00.00.000Z"}, {"session_id": "2025-03-10T21.00.00.000Z"}),
+        ({"try_number": 1}, {"try_number": 2}),
+    ])
+    def test_rerun_after_budget_starts_new_clock(self, parameters, first, rerun):
+        parameters["deadline_parms"]["stage_budget_seconds"] = 100
+        if "session_id" in first:
+            del parameters["run_id"]  # `kedro run` local, sem run_id
+        store = ingestion_run_store({**parameters, **first})
+        started_at = store.started_at()
+        with open(os.path.join(store.path, "_started"), "w", encoding="utf-8") as start:
+            start.write(repr(started_at - 3600))  # a primeira execução do odate começou há uma hora
+        assert deadline_exceeded(ingestion_deadline({**parameters, **first}))
+
+        deadline = ingestion_deadline({**parameters, **rerun})
+        assert not deadline_exceeded(deadline)
+        assert deadline > monotonic() + 90
+
+    def test_run_id(self, parameters):
+        assert ingestion_run_id(parameters) == "manual__2025-03-10"
+        assert ingestion_run_id({**parameters, "try_number": 2}) == "manual__2025-03-10.try2"
+        assert ingestion_run_id({"odate": "2025-03-10", "session_id": "s1"}) == "2025-03-10.s1"
+
+    def test_hook_injects_session_id(self, parameters):
+        del parameters["run_id"]
+        catalog = DataCatalog(feed_dict={"parameters": parameters})
+
+        IngestionRunHook().before_pipeline_run({"session_id": "s1"}, None, catalog)
+
+        assert catalog.load("parameters")["session_id"] == "s1"
+        assert ingestion_run_id(catalog.load("parameters")) == "2025-03-10.s1"
+
+
+class TestFinishIngestion:
+    def test_flags_rows_and_records_run(self, parameters):
+        df = finish_ingestion(_news("2025-03-09", "2025-03-10"), "rw_infomoney_stage", False, parameters)
+
+        assert df["coleta_completa"].eq(False).all()
+        assert pd.api.types.is_datetime64_any_dtype(df["dat_ref"])
+        store = IngestionRunStore(parameters["deadline_parms"]["path"], parameters["run_id"])
+        assert store.partial() == ["rw_infomoney_stage"]
+
+    def test_partial_source_without_rows(self, parameters):
+        finish_ingestion(pd.DataFrame(), "rw_moneytimes_stage", False, parameters)
+
+        parciais = fontes_parciais(["rw_infomoney_stage", "rw_moneytimes_stage"], parameters)
+        assert parciais.to_dict() == {pd.Timestamp("2025-03-10"): "rw_moneytimes_stage"}
+
+    def test_complete_run_clears_partial_dates(self, parameters):
+        finish_ingestion(_news("2025-03-09", "2025-03-10"), "rw_infomoney_stage", False, parameters)
+        finish_ingestion(_news("2025-03-10"), "rw_moneytimes_stage", False, parameters)
+        assert set(fontes_parciais(["rw_infomoney_stage", "rw_moneytimes_stage"], parameters).index) == \
+            {pd.Timestamp("2025-03-09"), pd.Timestamp("2025-03-10")}
+
+        # nova execução completa: mesmo que o staging descarte as linhas já vistas, a marca sai
+        parameters["run_id"] = "manual__2025-03-10__retry"
+        finish_ingestion(_news("2025-03-09", "2025-03-10"), "rw_infomoney_stage", True, parameters)
+
+        parciais = fontes_parciais(["rw_infomoney_stage", "rw_moneytimes_stage"], parameters)
+        assert parciais.to_dict() == {pd.Timestamp("2025-03-10"): "rw_moneytimes_stage"}
+        store = WatermarkStore(parameters["watermark_parms"]["path"])
+        assert store.partial_dates("rw_infomoney_stage") == []
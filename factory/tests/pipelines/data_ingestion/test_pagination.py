@@ -0,0 +1,60 @@
+"""
+Testes da paginação orientada por data (`early_stop`): a fonte para de buscar páginas assim
+que encontra uma página mais antiga que `pagination_stop_date`.
+"""
+import pandas as pd
+import pytest
+
+from factory.pipelines.data_ingestion import nodes
+from factory.pipelines.data_ingestion.utils import HttpClient, page_older_than, pagination_stop_date, parse_data_portugues
+
+from .conftest import listing_page, page_number
+
+MAPPING = {"url": "https://fonte.test/ultimas/", "pattern_pages": "pagina/<number>/", "csv_read": "rw_seudinheiro_stage",
+           "max_pages": 10, "early_stop": True, "lookahead": 1, "class_feed": "feed_content",
+           "class_title": "feed_content_title", "class_date": "feed_content_time"}
+
+
+@pytest.fixture
+def parameters(tmp_path) -> dict:
+    return {"odate": "2025-03-10", "environment": "production", "ingestion_mode": "daily",
+            "http_parms": {"rate_per_second": 0},
+            "deadline_parms": {"path": str(tmp_path / "runs")},
+            "watermark_parms": {"path": str(tmp_path / "watermarks")}}
+
+
+@pytest.fixture
+def client(fake_http_client) -> HttpClient:
+    return fake_http_client(lambda url: listing_page(page_number(url), items=3), {"max_workers": 4})
+
+
+class TestPaginationStopDate:
+    def test_modes(self, parameters):
+        assert pagination_stop_date(MAPPING, parameters) == "2025-03-10"
+        assert pagination_stop_date({**MAPPING, "early_stop": False}, parameters) is None
+        assert pagination_stop_date(MAPPING, {**parameters, "process_full_data": True}) is None
+        assert pagination_stop_date(MAPPING, {**parameters, "process_full_data": True,
+                                              "backfill_start": "2024-01-01"}) == "2024-01-01"
+
+    def test_page_older_than(self):
+        older = [{"dat_ref": "9 de março de 2025"}, {"dat_ref": "8 de março de 2025"}]
+        assert page_older_than(older, parse_data_portugues, "2025-03-10")
+        assert not page_older_than(older + [{"dat_ref": "10 de março de 2025"}], parse_data_portugues, "2025-03-10")
+        assert not page_older_than([{"dat_ref": "sem data"}], parse_data_portugues, "2025-03-10")
+
+
+class TestEarlyStop:
+    def test_stops_at_first_older_page(self, client, parameters):
+        df = nodes.extract_transform_seudinheiro(MAPPING, parameters)
+
+        # página 3 (09/03) é a primeira mais antiga que o odate; com lookahead 1, no máximo a 4 já estava em voo
+        fetched = sorted(page_number(url) for url in client.calls)
+        assert fetched[:3] == [1, 2, 3]
+        assert max(fetched) <= 4
+        assert set(df["dat_ref"]) == {pd.Timestamp("2025-03-10")}
+        assert len(df) == 3 and df["coleta_completa"].all()
+
+    def test_without_early_stop_reads_max_pages(self, client, parameters):
+        nodes.extract_transform_seudinheiro({**MAPPING, "early_stop": False}, parameters)
+
+        assert len(client.calls) == MAPPING["max_pages"]
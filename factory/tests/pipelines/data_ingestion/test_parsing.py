@@ -0,0 +1,171 @@
+"""
+Testes de equivalência dos parsers otimizados com as implementações linha a linha:
+backends do BeautifulSoup (`make_soup`), extração do InfoMoney em passada única
+(`parse_infomoney`) e as versões vetorizadas de `data_ingestion.parsing`.
+"""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from bs4 import BeautifulSoup
+
+from factory.pipelines.data_ingestion import parsing, utils
+from factory.pipelines.data_ingestion.utils import (make_soup, parse_html_table, parse_infomoney, parse_moneytimes,
+                                                     parse_seudinheiro)
+
+AGORA = datetime(2025, 3, 10, 1, 30)
+HOJE = datetime.today().strftime("%Y-%m-%d")
+TABLE = ("<html><body><table><tr><td>menu</td></tr></table><table><thead><tr><th>Data</th><th>Último</th>"
+         "<th>Abertura</th></tr></thead><tbody><tr><td> 10.03.2025 </td><td>150,10</td><td>151,00</td></tr>"
+         "<tr><td>07.03.2025</td><td>1.234,56</td><td>-</td></tr></tbody></table><p>rodapé</body></html>")
+
+
+def _infomoney_page(*blocos: str) -> str:
+    return f"<html><body><main>{''.join(blocos)}</main></body></html>"
+
+
+def _headline(titulo: str, link: str, data: str = None, categoria: str = "Mercados") -> str:
+    time = f'<time datetime="{data}">{data}</time>' if data else ""
+    return (f'<div class="post-card"><span>{categoria}</span>  <h2><a href="{link}">{titulo}</a></h2>  '
+            f'<div class="meta">{time}</div></div>')
+
+
+def _infomoney_linha_a_linha(html: str, class_: str):
+    """Implementação anterior: `find_next("time")` a partir de cada bloco."""
+    soup = BeautifulSoup(html, "html.parser")
+    noticias = []
+    for bloco in soup.find_all("div", class_=class_):
+        h2 = bloco.find("h2")
+        if h2:
+            a_tag = h2.find("a")
+            link = a_tag["href"] if a_tag and a_tag.has_attr("href") else None
+            data_el = bloco.find_next("time")
+            data = data_el["datetime"] if data_el else datetime.today().isoformat()
+            noticias.append({"fonte": "InfoMoney", "titulo": bloco.text.strip(), "dat_ref": data, "link": link})
+    return noticias
+
+
+def _numerico_linha_a_linha(df: pd.DataFrame, columns: list, replace_decimal: bool) -> pd.DataFrame:
+    """Conversão anterior de `_transform_html_table`, coluna a coluna com `str.replace`."""
+    df = df.copy()
+    df["change_percentage"] = df["change_percentage"].str.replace("%", "", regex=False)
+    for col in columns:
+        if replace_decimal:
+            df[col] = df[col].str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+class TestHtmlBackends:
+    @pytest.mark.parametrize("parser", ["html.parser", "lxml"])
+    def test_table_rows_match_full_tree(self, parser):
+        esperado = [[td.get_text(strip=True) for td in tr.find_all("td")]
+                    for tr in BeautifulSoup(TABLE, "html.parser").find_all("table")[1].find("tbody").find_all("tr")]
+
+        assert parse_html_table(TABLE, parser) == esperado
+
+    def test_news_blocks_match_between_backends(self):
+        page = "".join(f'<div class="feed_content"><h2 class="feed_content_title"><a href="https://fonte.test/{i}">'
+                       f'Notícia {i}</a></h2><div class="feed_content_time">{i + 1} de março de 2025</div></div>'
+                       for i in range(3))
+        page = f"<html><body><nav><div class='feed_content'>sem título</div></nav>{page}</body></html>"
+
+        lxml = parse_seudinheiro(page, "feed_content", "feed_content_title", "feed_content_time", "lxml")
+        assert lxml == parse_seudinheiro(page, "feed_content", "feed_content_title", "feed_content_time", "html.parser")
+        assert [noticia["dat_ref"] for noticia in lxml] == ["1 de março de 2025", "2 de março de 2025", "3 de março de 2025"]
+
+    def test_missing_backend_falls_back(self):
+        assert make_soup("<p>ok</p>", "parser-inexistente").p.text == "ok"
+
+    def test_empty_page(self):
+        assert parse_moneytimes("", "news-item", "news-item__title", "date", "lxml") == []
+        with pytest.raises(ValueError):
+            parse_html_table("", "lxml")
+
+
+class TestParseInfomoney:
+    def test_matches_find_next(self):
+        page = _infomoney_page(
+            _headline("Ibovespa sobe", "https://fonte.test/a", "2025-03-10T10:00:00"),
+            '<div class="post-card"><span>Publicidade</span></div>',  # bloco sem manchete
+            _headline("Dólar cai", "https://fonte.test/b", "2025-03-09T18:30:00"),
+            _headline("Juros futuros", "https://fonte.test/c", "2025-03-09T17:00:00", categoria=""))
+
+        assert parse_infomoney(page, "post-card") == _infomoney_linha_a_linha(page, "post-card")
+        assert parse_infomoney(page, "post-card", "lxml") == _infomoney_linha_a_linha(page, "post-card")
+
+    def test_block_without_time_uses_today(self):
+        page = _infomoney_page(_headline("Sem data", "https://fonte.test/a"),
+                               _headline("Com data", "https://fonte.test/b", "2025-03-09T18:30:00"))
+
+        noticias = parse_infomoney(page, "post-card")
+
+        # a implementação anterior herdava a data da manchete seguinte
+        assert _infomoney_linha_a_linha(page, "post-card")[0]["dat_ref"] == "2025-03-09T18:30:00"
+        assert noticias[0]["dat_ref"][:10] == HOJE
+        assert noticias[1]["dat_ref"] == "2025-03-09T18:30:00"
+
+    def test_strainer_keeps_only_blocks_and_times(self):
+        page = _infomoney_page("<header><time datetime='2025-01-01'>x</time></header>",
+                               _headline("Ibovespa sobe", "https://fonte.test/a", "2025-03-10T10:00:00"), "<footer>rodapé</footer>")
+        soup = make_soup(page, "html.parser", utils._HeadlineStrainer("post-card"))  # pylint: disable=protected-access
+
+        assert {tag.name for tag in soup.find_all(True)} <= {"div", "span", "h2", "a", "time"}
+        assert "rodapé" not in soup.get_text()
+
+    def test_empty_page(self):
+        assert parse_infomoney("", "post-card") == []
+
+
+class TestVetorizado:
+    def test_extrair_campos(self):
+        textos = pd.Series(["Mercados  Ibovespa sobe 2%  10 mar 2025",
+                            "  Economia  Inflação desacelera  9 mar 2025  Leia mais",
+                            "Economia Inflação desacelera em capitais 12 jan 2025",  # sem separadores duplos
+                            "Ibovespa sobe  10 mar 2025"])  # sem categoria
+
+        esperado = textos.apply(utils.extrair_campos).set_axis(["categoria", "titulo", "data_publicacao"], axis=1)
+        pd.testing.assert_frame_equal(parsing.extrair_campos_vetorizado(textos), esperado)
+
+    def test_extrair_data_url(self):
+        links = pd.Series(["https://valorinveste.globo.com/mercados/2025/03/10/a.ghtml", "https://fonte.test/sem-data",
+                           "https://fonte.test/2025/3/1/a"])
+
+        assert parsing.extrair_data_url_vetorizado(links).tolist() == links.apply(utils.extrair_data_url).tolist()
+
+    def test_parse_data_portugues(self):
+        textos = pd.Series(["3 de março de 2025", "10 de Março de 2025", "3 de marco de 2025", "ontem",
+                            "Publicado em 28 de fevereiro de 2025 às 10h", "3 de março de 2025"])
+
+        assert parsing.parse_data_portugues_vetorizado(textos).tolist() == textos.apply(utils.parse_data_portugues).tolist()
+
+    def test_datas_relativas(self):
+        textos = pd.Series(["há 3 horas", "há 1 hora", "Há 2 dias", "há 45 minutos", "agora"])
+
+        obtido = parsing.data_relativa_para_absoluta_vetorizado(textos, AGORA)
+
+        assert obtido.tolist() == textos.apply(utils.data_relativa_para_absoluta, agora=AGORA).tolist()
+        assert obtido.tolist() == ["2025-03-09", "2025-03-10", "2025-03-08", None, None]
+
+    @pytest.mark.parametrize("replace_decimal, valores", [
+        (True, ["1.234,56", "987,5", "1234", "", "-"]),
+        (True, ["1.234,56", "1,234.56", "12,5", "3", "7,0"]),  # separadores misturados
+        (False, ["1234.56", "987.5", "1,234.56", "", "n/d"]),
+    ])
+    def test_converter_numerico(self, replace_decimal, valores):
+        df = pd.DataFrame({"dat_ref": ["2025-03-10"] * 5, "close_price": valores, "open_price": valores[::-1],
+                           "change_percentage": ["-0,50%", "1,2%", "", "0%", "10,00%"] if replace_decimal else
+                           ["-0.50%", "1.2%", "", "0%", "10.00%"]})
+        columns = ["close_price", "open_price", "change_percentage"]
+
+        pd.testing.assert_frame_equal(parsing.converter_numerico(df, columns, replace_decimal),
+                                      _numerico_linha_a_linha(df, columns, replace_decimal))
+
+    def test_empty_page(self):
+        vazio = pd.Series([], dtype=object)
+
+        assert list(parsing.extrair_campos_vetorizado(vazio).columns) == ["categoria", "titulo", "data_publicacao"]
+        assert parsing.parse_data_portugues_vetorizado(vazio).empty
+        assert parsing.data_relativa_para_absoluta_vetorizado(vazio, AGORA).empty
+        df = pd.DataFrame(columns=["dat_ref", "close_price", "change_percentage"])
+        assert parsing.converter_numerico(df, ["close_price", "change_percentage"], True).empty
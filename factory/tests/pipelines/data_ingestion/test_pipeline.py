@@ -7,3 +7,17 @@ Kedro recommends using `pytest` framework, more info about it can be found
 in the official documentation:
 https://docs.pytest.org/en/latest/getting-started.html
 """
+from factory.pipelines.data_ingestion.pipeline import create_pipeline
+
+
+def test_yf_node_outputs_follow_configured_tickers(tmp_path, monkeypatch):
+    (tmp_path / "conf" / "base").mkdir(parents=True)
+    (tmp_path / "conf" / "local").mkdir()
+    (tmp_path / "conf" / "base" / "parameters.yml").write_text(
+        'yf_tickers:\n  rw_ibov_stage: "^BVSP"\n  rw_petr_stage: "PETR4.SA"\n', encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    yf_node = next(node for node in create_pipeline().nodes if node.name == "etl_yf_node")
+
+    assert sorted(yf_node.outputs) == ["rw_ibov_stage", "rw_petr_stage"]
+    assert "params:yf_tickers" in yf_node.inputs
@@ -0,0 +1,90 @@
+"""
+Testes da busca do histórico por intervalo de datas (`range_fetch`): divisão em janelas,
+deduplicação das datas repetidas entre janelas, conferência das datas de cada janela e
+interrupção pelo prazo da execução.
+"""
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+from factory.pipelines.data_ingestion.utils import DeadlineExceeded, HttpClient, date_windows, scraping_range
+
+RANGE_PARMS = {"url_template": "https://fonte.test/historico?st_date={start}&end_date={end}",
+               "date_format": "%Y-%m-%d", "window_days": 10}
+
+
+def _table(start: str, end: str, overlap_days: int = 1) -> str:
+    """Tabela histórica de `start` a `end` mais `overlap_days` (sobreposição com a janela seguinte)."""
+    days = pd.date_range(start, pd.Timestamp(end) + pd.Timedelta(days=overlap_days))
+    rows = "".join(f"<tr><td>{day:%Y-%m-%d}</td><td>{start}</td></tr>" for day in days)
+    return f"<html><body><table><thead><tr><th>Date</th><th>Price</th></tr></thead><tbody>{rows}</tbody></table></body></html>"
+
+
+@pytest.fixture
+def client(fake_http_client) -> HttpClient:
+    def window(url: str) -> str:
+        query = parse_qs(urlparse(url).query)
+        start, end = query["st_date"][0], query["end_date"][0]
+        if client.fail_from and start >= client.fail_from:
+            raise DeadlineExceeded(f"Prazo da execução esgotado para: {url}")
+        if client.ignore_range:  # a página padrão, com os últimos dias, qualquer que seja o intervalo pedido
+            start, end = "2025-01-18", "2025-01-25"
+        return _table(start, end, client.overlap_days)
+
+    client = fake_http_client(window, {"max_workers": 4})
+    client.fail_from, client.overlap_days, client.ignore_range = None, 1, False
+    return client
+
+
+def _starts(client: HttpClient) -> list:
+    return sorted(parse_qs(urlparse(url).query)["st_date"][0] for url in client.calls)
+
+
+class TestDateWindows:
+    def test_splits_inclusive_range(self):
+        assert date_windows("2025-01-01", "2025-01-25", 10) == [
+            ("2025-01-01", "2025-01-10"), ("2025-01-11", "2025-01-20"), ("2025-01-21", "2025-01-25")]
+
+    def test_single_day(self):
+        assert date_windows("2025-01-01", "2025-01-01", 90) == [("2025-01-01", "2025-01-01")]
+
+
+class TestScrapingRange:
+    def test_fetches_every_window_once(self, client):
+        data, complete = scraping_range(RANGE_PARMS, {}, "2025-01-01", "2025-01-25")
+
+        assert complete
+        assert _starts(client) == ["2025-01-01", "2025-01-11", "2025-01-21"]
+        assert [row[0] for row in data] == [f"{day:%Y-%m-%d}" for day in pd.date_range("2025-01-01", "2025-01-26")]
+
+    def test_overlapping_dates_keep_first_window(self, client):
+        data, _ = scraping_range(RANGE_PARMS, {}, "2025-01-01", "2025-01-25")
+
+        rows = dict(data)
+        assert rows["2025-01-11"] == "2025-01-01"  # veio também na janela seguinte, descartada
+        assert rows["2025-01-12"] == "2025-01-11"
+
+    def test_run_deadline_returns_partial_history(self, client):
+        client.fail_from = "2025-01-21"
+
+        data, complete = scraping_range(RANGE_PARMS, {}, "2025-01-01", "2025-01-25")
+
+        assert not complete
+        assert [row[0] for row in data] == [f"{day:%Y-%m-%d}" for day in pd.date_range("2025-01-01", "2025-01-21")]
+
+    def test_windows_checked_against_requested_range(self, client):
+        client.overlap_days = 0
+
+        data, complete = scraping_range(RANGE_PARMS, {}, "2025-01-01", "2025-01-25", dat_ref_format="%Y-%m-%d")
+
+        assert complete
+        assert len(data) == 25
+
+    def test_source_ignoring_range_is_incomplete(self, client):
+        client.overlap_days, client.ignore_range = 0, True
+
+        data, complete = scraping_range(RANGE_PARMS, {}, "2025-01-01", "2025-01-25", dat_ref_format="%Y-%m-%d")
+
+        assert not complete
+        assert data == []  # nenhuma janela trouxe só as datas pedidas
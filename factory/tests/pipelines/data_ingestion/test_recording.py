@@ -0,0 +1,86 @@
+"""
+Testes da gravação e reprodução dos payloads de ingestão (`PayloadRecorder`): a reprodução
+devolve o que foi gravado sem acesso à rede, falha quando o payload não foi gravado e o
+gravador vale apenas para a execução corrente (`get_payload_recorder`).
+"""
+import pandas as pd
+import pytest
+import requests
+
+from factory.pipelines.data_ingestion import utils
+from factory.pipelines.data_ingestion.utils import PayloadRecorder, get_payload_recorder
+
+URL = "https://fonte.test/historico"
+
+
+@pytest.fixture
+def parameters(tmp_path, monkeypatch) -> dict:
+    monkeypatch.setattr(utils, "_RECORDER", None)
+    monkeypatch.setattr(utils, "_RECORDER_KEY", None)
+    return {"odate": "2025-03-10", "run_id": "manual__2025-03-10", "environment": "record",
+            "recording_parms": {"path": str(tmp_path / "recordings")}}
+
+
+def _offline(url: str):
+    raise AssertionError(f"Acesso à rede na reprodução: {url}")
+
+
+class TestPayloadRecorder:
+    def test_http_round_trip_without_network(self, parameters, fake_http_client):
+        recorder = get_payload_recorder(parameters)
+        online = fake_http_client(lambda url: "<table>v1</table>", recorder=recorder)
+        recorded = online.get(URL, {"User-Agent": "teste"})
+
+        replay = get_payload_recorder({**parameters, "environment": "replay"})
+        offline = fake_http_client(_offline, recorder=replay)
+        response = offline.get(URL, {"User-Agent": "teste"})
+
+        assert offline.calls == []
+        assert response.content == recorded.content == b"<table>v1</table>"
+        assert response.status_code == 200 and response.url == URL
+        assert replay.recorded_at == recorder.recorded_at.replace(microsecond=0)
+
+    def test_frame_round_trip_in_call_order(self, parameters):
+        recorder = get_payload_recorder(parameters)
+        frames = [pd.DataFrame({"close": [1.0]}), pd.DataFrame({"close": [2.0]})]
+        for frame in frames:
+            recorder.frame("yf_download", lambda frame=frame: frame)
+
+        replay = get_payload_recorder({**parameters, "environment": "replay"})
+        for frame in frames:
+            pd.testing.assert_frame_equal(replay.frame("yf_download", lambda: _offline("yf_download")), frame)
+
+    def test_missing_recording_fails(self, parameters, fake_http_client):
+        replay = get_payload_recorder({**parameters, "environment": "replay"})
+        offline = fake_http_client(_offline, recorder=replay)
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            offline.get(URL)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            replay.frame("yf_download", lambda: _offline("yf_download"))
+        assert offline.calls == []
+
+    def test_invalid_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            PayloadRecorder(str(tmp_path / "recordings"), "rewind")
+
+
+class TestGetPayloadRecorder:
+    def test_only_in_recording_environments(self, parameters):
+        assert get_payload_recorder({**parameters, "environment": "production"}) is None
+
+    def test_shared_within_run(self, parameters):
+        recorder = get_payload_recorder(parameters)
+
+        assert get_payload_recorder(dict(parameters)) is recorder
+        assert recorder.path.endswith("2025-03-10")
+
+    def test_new_run_restarts_frame_sequence(self, parameters):
+        get_payload_recorder(parameters).frame("yf_download", lambda: pd.DataFrame({"close": [1.0]}))
+        replay = get_payload_recorder({**parameters, "environment": "replay"})
+        replay.frame("yf_download", lambda: _offline("yf_download"))
+
+        again = get_payload_recorder({**parameters, "environment": "replay", "run_id": "manual__2025-03-10__2"})
+
+        assert again is not replay
+        assert again.frame("yf_download", lambda: _offline("yf_download"))["close"].tolist() == [1.0]
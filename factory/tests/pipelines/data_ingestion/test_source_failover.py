@@ -0,0 +1,151 @@
+"""
+Testes do `SourceFailover`: memoização do payload, circuit breaker (aberto, meio-aberto e
+recuperação), ordenação das fontes pela saúde registrada e o `SourceFailover` de cada
+execução (`get_source_failover`).
+"""
+import pytest
+
+from factory.pipelines.data_ingestion import utils
+from factory.pipelines.data_ingestion.utils import DeadlineExceeded, SourceBudgetExceeded, SourceFailover, get_source_failover
+
+PRIMARY, FALLBACK = "https://primaria.test/tabela", "https://alternativa.test/tabela"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(utils, "time_now", clock)
+    return clock
+
+
+@pytest.fixture
+def failover_parms(tmp_path) -> dict:
+    return {"health_path": str(tmp_path / "source_health"), "failure_threshold": 2, "cooldown_seconds": 600}
+
+
+def _fail(error: Exception = ValueError("fora do ar")):
+    def fetch():
+        raise error
+    return fetch
+
+
+def _failures(failover_parms: dict, source: str, count: int) -> None:
+    """Falhas em execuções distintas (a memoização vale apenas dentro de uma execução)."""
+    for _ in range(count):
+        with pytest.raises(Exception):
+            SourceFailover(failover_parms).fetch(source, _fail())
+
+
+class TestMemoization:
+    def test_payload_fetched_once(self, failover_parms, clock):
+        failover, calls = SourceFailover(failover_parms), []
+
+        def fetch():
+            calls.append(1)
+            return [["2025-03-10", "1"]]
+
+        assert failover.fetch(PRIMARY, fetch) == failover.fetch(PRIMARY, fetch)
+        assert len(calls) == 1
+
+    def test_error_memoized(self, failover_parms, clock):
+        failover = SourceFailover(failover_parms)
+        with pytest.raises(ValueError):
+            failover.fetch(PRIMARY, _fail())
+        with pytest.raises(ValueError):
+            failover.fetch(PRIMARY, lambda: [["ok"]])
+        assert failover.stats().set_index("source").loc[PRIMARY, "failures"] == 1
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self, failover_parms, clock):
+        _failures(failover_parms, PRIMARY, 1)
+        assert not SourceFailover(failover_parms).is_open(PRIMARY)
+
+        _failures(failover_parms, PRIMARY, 1)
+        failover = SourceFailover(failover_parms)
+        assert failover.is_open(PRIMARY)
+        assert failover.order([{"url": PRIMARY}, {"url": FALLBACK}]) == [{"url": FALLBACK}]
+
+    def test_half_open_failure_reopens(self, failover_parms, clock):
+        _failures(failover_parms, PRIMARY, 2)
+        clock.now += 601  # fim do cooldown: a fonte volta a ser tentada
+
+        failover = SourceFailover(failover_parms)
+        assert [source["url"] for source in failover.order([{"url": PRIMARY}])] == [PRIMARY]
+        with pytest.raises(ValueError):
+            failover.fetch(PRIMARY, _fail())
+        assert SourceFailover(failover_parms).is_open(PRIMARY)  # uma falha na tentativa já reabre
+
+    def test_half_open_success_closes(self, failover_parms, clock):
+        _failures(failover_parms, PRIMARY, 2)
+        clock.now += 601
+
+        SourceFailover(failover_parms).fetch(PRIMARY, lambda: [["2025-03-10", "1"]])
+
+        failover = SourceFailover(failover_parms)
+        assert not failover.is_open(PRIMARY)
+        health = failover.stats().set_index("source").loc[PRIMARY]
+        assert health["consecutive_failures"] == 0 and health["successes"] == 1
+        _failures(failover_parms, PRIMARY, 1)
+        assert not SourceFailover(failover_parms).is_open(PRIMARY)  # contagem recomeça do zero
+
+    def test_empty_payload_counts_as_failure(self, failover_parms, clock):
+        for _ in range(2):
+            SourceFailover(failover_parms).fetch(PRIMARY, lambda: [])
+        assert SourceFailover(failover_parms).is_open(PRIMARY)
+
+    def test_source_budget_is_a_failure_but_run_deadline_is_not(self, failover_parms, clock):
+        for _ in range(2):
+            with pytest.raises(DeadlineExceeded):
+                SourceFailover(failover_parms).fetch(PRIMARY, _fail(DeadlineExceeded("prazo")))
+        assert SourceFailover(failover_parms).stats().empty
+
+        for _ in range(2):
+            with pytest.raises(SourceBudgetExceeded):
+                SourceFailover(failover_parms).fetch(PRIMARY, _fail(SourceBudgetExceeded("fonte lenta")))
+        assert SourceFailover(failover_parms).is_open(PRIMARY)
+
+
+class TestOrder:
+    def test_healthier_source_first(self, failover_parms, clock):
+        _failures(failover_parms, PRIMARY, 1)
+        SourceFailover(failover_parms).fetch(FALLBACK, lambda: [["ok"]])
+
+        order = SourceFailover(failover_parms).order([{"url": PRIMARY}, {"url": FALLBACK}])
+        assert [source["url"] for source in order] == [FALLBACK, PRIMARY]
+
+    def test_configured_order_on_tie(self, failover_parms, clock):
+        order = SourceFailover(failover_parms).order([{"url": PRIMARY}, {"url": FALLBACK}])
+        assert [source["url"] for source in order] == [PRIMARY, FALLBACK]
+
+
+class TestGetSourceFailover:
+    @pytest.fixture
+    def parameters(self, failover_parms, monkeypatch) -> dict:
+        monkeypatch.setattr(utils, "_FAILOVER", None)
+        monkeypatch.setattr(utils, "_FAILOVER_KEY", None)
+        return {"odate": "2025-03-10", "run_id": "manual__2025-03-10", "failover_parms": failover_parms}
+
+    def test_shared_within_run(self, parameters, clock):
+        failover = get_source_failover(parameters)
+        failover.fetch(PRIMARY, lambda: [["2025-03-10", "1"]])
+
+        assert get_source_failover(dict(parameters)) is failover
+        assert get_source_failover(parameters).fetch(PRIMARY, _fail()) == [["2025-03-10", "1"]]
+
+    def test_new_run_forgets_memoized_payloads(self, parameters, clock):
+        with pytest.raises(ValueError):
+            get_source_failover(parameters).fetch(PRIMARY, _fail())
+
+        retry = get_source_failover({**parameters, "try_number": 2})
+
+        assert retry.fetch(PRIMARY, lambda: [["2025-03-10", "1"]]) == [["2025-03-10", "1"]]
+        assert get_source_failover(parameters) is not retry  # a execução anterior não é reaproveitada
@@ -0,0 +1,109 @@
+"""
+Testes do download em streaming das tabelas históricas (`TableStreamDetector`): parada no
+`</table>` da tabela esperada e falha rápida, com failover para a fonte alternativa, quando
+o cabeçalho não aparece.
+"""
+import pandas as pd
+import pytest
+
+from factory.pipelines.data_ingestion.nodes import extract_transform_html_table
+from factory.pipelines.data_ingestion.utils import HttpClient, TableStreamDetector, parse_html_table, table_stream_detector
+
+PRIMARY, FALLBACK = "https://www.fonte.test/historico", "https://br.fonte.test/historico"
+COLUMNS_ORDER = ['dat_ref', 'open_price', 'close_price', 'high_price', 'low_price', 'change_percentage']
+MAPPING = {"url": PRIMARY, "headers": {"User-Agent": "teste"}, "dat_ref_format": "%b %d, %Y",
+           "csv_read": "rw_cds_stage", "stream": {"enabled": True, "header_kb": 8},
+           "scraping_except": {"url": FALLBACK, "dat_ref_format": "%d.%m.%Y", "replace_decimal": True,
+                               "columns_order": ['dat_ref', 'close_price', 'open_price', 'high_price',
+                                                 'low_price', 'change_percentage']}}
+
+
+def _table(headers, rows) -> str:
+    head = "".join(f"<th>{header}</th>" for header in headers)
+    body = "".join("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in rows)
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+
+NAV = _table(["Ativo", "Último"], [["IBOV", "130.000"]])
+HISTORY_EN = _table(["Date", "Price", "Open", "High", "Low", "Change %"],
+                    [["Mar 10, 2025", "150.10", "151.00", "152.00", "149.00", "-0.50%"]])
+HISTORY_BR = _table(["Data", "Último", "Abertura", "Máxima", "Mínima", "Var%"],
+                    [["10.03.2025", "150,10", "151,00", "152,00", "149,00", "-0,50%"]])
+TAIL = "<div>" + "rodapé " * 20000 + "</div></body></html>"  # ~140 KB depois da tabela
+
+
+def _chunks(text: str, size: int):
+    data = text.encode("utf-8")
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+class TestTableStreamDetector:
+    def test_stops_at_end_of_history_table(self):
+        detector = TableStreamDetector()
+        page = f"<html><body>{NAV}<p>ação</p>{HISTORY_BR}{TAIL}"
+
+        stopped_at = next(index for index, chunk in enumerate(_chunks(page, 7)) if detector(chunk))
+
+        assert detector.matched and detector.done
+        assert stopped_at * 7 < len(page.encode("utf-8")) - len(TAIL)
+
+    def test_ignores_tables_without_signature(self):
+        detector = TableStreamDetector()
+        for chunk in _chunks(f"<html><body>{NAV}", 5):
+            assert not detector(chunk)
+        assert not detector.matched
+
+    def test_nested_tables_end_with_outer_table(self):
+        detector = TableStreamDetector()
+        nested = HISTORY_EN.replace("<td>Mar 10, 2025</td>", f"<td>Mar 10, 2025{NAV}</td>")
+        results = [detector(chunk) for chunk in _chunks(nested, 3)]
+
+        assert results[-1] and not any(results[:-1])
+
+    def test_missing_header_fails_fast(self):
+        detector = TableStreamDetector(header_limit=1024)
+        with pytest.raises(ValueError):
+            for chunk in _chunks(TAIL, 512):
+                detector(chunk)
+
+    def test_disabled_by_config(self):
+        assert table_stream_detector(None) is None
+        assert table_stream_detector({"enabled": False}) is None
+        assert table_stream_detector({"enabled": True, "header_kb": 2})().header_limit == 2048
+
+
+@pytest.fixture
+def client(fake_http_client) -> HttpClient:
+    """Cliente do processo com a fonte primária sem a tabela e a alternativa com a tabela em português"""
+    pages = {PRIMARY: f"<html><body>{TAIL}{HISTORY_EN}", FALLBACK: f"<html><body>{NAV}{HISTORY_BR}{TAIL}"}
+    client = fake_http_client(pages.__getitem__, {"retry": {"total": 0}})
+    client.http_parms = {"rate_per_second": 0, "retry": {"total": 0}}
+    return client
+
+
+class TestStreamedScraping:
+    def test_body_truncated_after_table(self, client):
+        response = client.get(FALLBACK, until=table_stream_detector(MAPPING["stream"]))
+
+        assert len(response.content) < len(TAIL)
+        assert parse_html_table(response.content) == [["10.03.2025", "150,10", "151,00", "152,00", "149,00", "-0,50%"]]
+
+    def test_without_stream_reads_whole_body(self, client):
+        response = client.get(FALLBACK)
+
+        assert client.calls == [FALLBACK]
+        assert not client.sent[0].get("stream")
+        assert len(response.content) > len(TAIL)
+
+    def test_falls_back_to_alternative_source(self, client, tmp_path):
+        parameters = {"odate": "2025-03-10", "environment": "production", "http_parms": client.http_parms,
+                      "failover_parms": {"health_path": str(tmp_path / "health")},
+                      "deadline_parms": {"path": str(tmp_path / "runs")},
+                      "watermark_parms": {"path": str(tmp_path / "watermarks")}}
+
+        df = extract_transform_html_table(MAPPING, COLUMNS_ORDER, parameters)
+
+        assert client.calls == [PRIMARY, FALLBACK]
+        assert all(sent.get("stream") for sent in client.sent)
+        assert df["dat_ref"].tolist() == [pd.Timestamp("2025-03-10")]
+        assert df["close_price"].tolist() == [150.10]
@@ -0,0 +1,115 @@
+"""
+Testes das marcas d'água de ingestão (`WatermarkStore`), do hook que as avança após a
+gravação do staging (`WatermarkHook`) e da janela do modo `incremental`.
+"""
+import pandas as pd
+import pytest
+from kedro.framework.hooks.manager import _create_hook_manager
+from kedro.io import DataCatalog, DatasetError, MemoryDataset
+from kedro.pipeline import node, pipeline
+from kedro.runner import SequentialRunner
+
+from factory.datasets import DatePartitionedDataset
+from factory.hooks import WatermarkHook
+from factory.pipelines.data_ingestion.stores import WatermarkStore
+from factory.pipelines.data_ingestion.utils import resolve_date_window
+
+
+@pytest.fixture
+def parameters(tmp_path) -> dict:
+    return {"odate": "2025-03-10", "environment": "production", "ingestion_mode": "incremental",
+            "watermark_parms": {"path": str(tmp_path / "watermarks")}}
+
+
+def _market(*dates: str, value: float = 1.0) -> pd.DataFrame:
+    return pd.DataFrame({"dat_ref": list(dates), "close": [value] * len(dates)})
+
+
+class _FailingDataset(MemoryDataset):
+    def _save(self, data) -> None:
+        raise OSError("bucket indisponível")
+
+
+def _run(hook: WatermarkHook, catalog: DataCatalog, frame: pd.DataFrame) -> None:
+    hook_manager = _create_hook_manager()
+    hook_manager.register(hook)
+    stage = pipeline([node(lambda: frame, None, "rw_ibov_stage", name="extract_ibov")])
+    SequentialRunner().run(stage, catalog, hook_manager)
+
+
+def _hook(parameters: dict) -> WatermarkHook:
+    hook = WatermarkHook()
+    hook.after_context_created(type("Context", (), {"params": parameters})())
+    return hook
+
+
+class TestWatermarkStore:
+    def test_content_hash_ignores_row_order(self):
+        frame = _market("2025-03-07", "2025-03-10")
+
+        assert WatermarkStore.content_hash(frame) == WatermarkStore.content_hash(frame.iloc[::-1])
+        assert WatermarkStore.content_hash(frame) != WatermarkStore.content_hash(_market("2025-03-07", "2025-03-10", value=2.0))
+
+    def test_advance_records_latest_date(self, parameters):
+        store = WatermarkStore(parameters["watermark_parms"]["path"])
+
+        assert store.advance("rw_ibov_stage", _market("2025-03-07", "2025-03-10"))
+        assert not store.advance("rw_ibov_stage", _market("2025-03-10", "2025-03-07"))  # mesmo conteúdo
+        assert store.get("rw_ibov_stage")["dat_ref"] == "2025-03-10"
+        assert store.get("rw_ibov_stage")["rows"] == 2
+
+    def test_advance_never_moves_back(self, parameters):
+        store = WatermarkStore(parameters["watermark_parms"]["path"])
+        store.advance("rw_ibov_stage", _market("2025-03-10"))
+
+        assert store.advance("rw_ibov_stage", _market("2025-02-03"))  # reprocessamento de um intervalo antigo
+        assert store.get("rw_ibov_stage")["dat_ref"] == "2025-03-10"
+        assert store.get("rw_ibov_stage")["content_hash"] == WatermarkStore.content_hash(_market("2025-03-10"))
+
+    def test_frame_without_dates_is_ignored(self, parameters):
+        store = WatermarkStore(parameters["watermark_parms"]["path"])
+
+        assert not store.advance("rw_ibov_stage", _market("sem data"))
+        assert store.get("rw_ibov_stage") == {}
+
+
+class TestWatermarkHook:
+    def test_advances_after_save(self, parameters, tmp_path):
+        catalog = DataCatalog({"rw_ibov_stage": DatePartitionedDataset(str(tmp_path / "rw_ibov_stage"))})
+
+        _run(_hook(parameters), catalog, _market("2025-03-07", "2025-03-10"))
+
+        assert WatermarkStore(parameters["watermark_parms"]["path"]).get("rw_ibov_stage")["dat_ref"] == "2025-03-10"
+
+    def test_failed_save_keeps_watermark(self, parameters):
+        catalog = DataCatalog({"rw_ibov_stage": _FailingDataset()})
+
+        with pytest.raises(DatasetError):
+            _run(_hook(parameters), catalog, _market("2025-03-07", "2025-03-10"))
+
+        assert WatermarkStore(parameters["watermark_parms"]["path"]).get("rw_ibov_stage") == {}
+
+    @pytest.mark.parametrize("environment", ["test", "replay"])
+    def test_skipped_outside_production(self, parameters, environment):
+        hook = _hook({**parameters, "environment": environment})
+
+        hook.after_dataset_saved("rw_ibov_stage", _market("2025-03-10"))
+
+        assert WatermarkStore(parameters["watermark_parms"]["path"]).get("rw_ibov_stage") == {}
+
+    def test_only_stage_datasets(self, parameters):
+        _hook(parameters).after_dataset_saved("pr_ibov", _market("2025-03-10"))
+
+        assert WatermarkStore(parameters["watermark_parms"]["path"]).get("pr_ibov") == {}
+
+
+class TestIncrementalWindow:
+    def test_starts_after_watermark(self, parameters):
+        _hook(parameters).after_dataset_saved("rw_ibov_stage", _market("2025-03-05", "2025-03-06"))
+
+        assert resolve_date_window("rw_ibov_stage", parameters) == ("2025-03-07", "2025-03-10")
+
+    def test_without_watermark_uses_max_gap(self, parameters):
+        parameters["watermark_parms"]["max_gap_days"] = 5
+
+        assert resolve_date_window("rw_ibov_stage", parameters) == ("2025-03-05", "2025-03-10")
@@ -0,0 +1,143 @@
+"""
+Testes do CachedDataCatalog: leituras repetidas servidas da memória, invalidação pela
+impressão digital do conteúdo e repasse das gravações (inclusive o append incorporado à
+entrada do intervalo lido).
+"""
+import pandas as pd
+from kedro.framework.hooks.manager import _create_hook_manager
+from kedro.io import MemoryDataset
+from kedro.pipeline import node, pipeline
+from kedro.runner import SequentialRunner
+from kedro_datasets.pandas import CSVDataset
+
+from factory.catalog import CachedDataCatalog
+from factory.datasets import AppendCSVDataset, DatePartitionedDataset
+from factory.hooks import LookbackPushdownHook
+
+
+def _market(dates, value: float = 1.0) -> pd.DataFrame:
+    return pd.DataFrame({"dat_ref": dates, "close": [value] * len(dates)})
+
+
+def _count_loads(monkeypatch, cls) -> list:
+    loads = []
+    original = cls.load
+    monkeypatch.setattr(cls, "load", lambda self: loads.append(self) or original(self))
+    return loads
+
+
+class TestCachedDataCatalog:
+    def test_repeated_loads_read_once(self, tmp_path, monkeypatch):
+        dataset = AppendCSVDataset(str(tmp_path / "rw_ibov_stage.csv"))
+        dataset.save(_market(["2025-01-02", "2025-01-03"]))
+        catalog = CachedDataCatalog({"rw_ibov_stage": dataset})
+        loads = _count_loads(monkeypatch, AppendCSVDataset)
+
+        first = catalog.load("rw_ibov_stage")
+        first["close"] = 0.0  # os nós alteram os DataFrames recebidos
+        second = catalog.shallow_copy().load("rw_ibov_stage")
+
+        assert len(loads) == 1
+        assert second["close"].tolist() == [1.0, 1.0]
+        assert catalog.cache_stats() == {"hits": 1, "misses": 1, "passthrough": 0}
+
+    def test_external_write_invalidates(self, tmp_path):
+        dataset = DatePartitionedDataset(str(tmp_path / "rw_ibov_stage"))
+        dataset.save(_market(["2025-01-02"]))
+        catalog = CachedDataCatalog({"rw_ibov_stage": dataset})
+        catalog.load("rw_ibov_stage")
+
+        DatePartitionedDataset(str(tmp_path / "rw_ibov_stage")).save(_market(["2025-02-03"]))  # outra execução
+
+        assert len(catalog.load("rw_ibov_stage")) == 2
+        assert catalog.cache_stats()["misses"] == 2
+
+    def test_fingerprint_covers_only_partitions_in_range(self, tmp_path):
+        dataset = DatePartitionedDataset(str(tmp_path / "rw_ibov_stage"))
+        dataset.save(_market(["2024-06-03", "2025-01-02"]))
+        dataset.set_date_range("2025-01-01", "2025-01-31")
+        catalog = CachedDataCatalog({"rw_ibov_stage": dataset})
+        catalog.load("rw_ibov_stage")
+
+        DatePartitionedDataset(str(tmp_path / "rw_ibov_stage")).save(_market(["2024-06-04", "2024-12-02"]))
+        assert len(catalog.load("rw_ibov_stage")) == 1
+        assert catalog.cache_stats()["hits"] == 1  # partições fora do intervalo não invalidam
+
+        DatePartitionedDataset(str(tmp_path / "rw_ibov_stage")).save(_market(["2025-01-03"]))
+        assert len(catalog.load("rw_ibov_stage")) == 2
+        assert catalog.cache_stats()["misses"] == 2
+
+    def test_save_passthrough_and_append_invalidation(self, tmp_path, monkeypatch):
+        catalog = CachedDataCatalog({"sandbox": CSVDataset(filepath=str(tmp_path / "sandbox.csv")),
+                                     "rw_ibov_stage": AppendCSVDataset(str(tmp_path / "rw_ibov_stage.csv"))})
+        loads = _count_loads(monkeypatch, CSVDataset)
+
+        catalog.save("sandbox", _market(["2025-01-02"]))
+        assert len(catalog.load("sandbox")) == 1
+        assert loads == []
+
+        catalog.save("rw_ibov_stage", _market(["2025-01-02"]))
+        catalog.load("rw_ibov_stage")
+        catalog.save("rw_ibov_stage", _market(["2025-01-03"]))
+        assert len(catalog.load("rw_ibov_stage")) == 2
+
+    def test_append_save_merges_into_cached_range(self, tmp_path, monkeypatch):
+        dataset = DatePartitionedDataset(str(tmp_path / "rw_ibov_stage"))
+        dataset.save(_market(["2024-06-03", "2025-01-02", "2025-01-03"]))
+        dataset.set_date_range("2025-01-01", "2025-01-31")
+        catalog = CachedDataCatalog({"rw_ibov_stage": dataset})
+        catalog.load("rw_ibov_stage")
+        loads = _count_loads(monkeypatch, DatePartitionedDataset)
+
+        catalog.save("rw_ibov_stage", _market(["2025-01-03", "2025-01-06"], value=2.0))
+        cached = catalog.load("rw_ibov_stage")
+
+        assert loads == []
+        assert catalog.cache_stats() == {"hits": 1, "misses": 1, "passthrough": 1}
+        stored = DatePartitionedDataset(str(tmp_path / "rw_ibov_stage")).load_range("2025-01-01", "2025-01-31")
+        pd.testing.assert_frame_equal(cached.sort_values("dat_ref", ignore_index=True),
+                                      stored.sort_values("dat_ref", ignore_index=True))
+        assert cached.set_index("dat_ref")["close"].to_dict() == {
+            pd.Timestamp("2025-01-06"): 2.0, pd.Timestamp("2025-01-03"): 2.0, pd.Timestamp("2025-01-02"): 1.0}
+
+    def test_append_save_after_external_write_invalidates(self, tmp_path, monkeypatch):
+        dataset = DatePartitionedDataset(str(tmp_path / "rw_ibov_stage"))
+        dataset.save(_market(["2025-01-02"]))
+        catalog = CachedDataCatalog({"rw_ibov_stage": dataset})
+        catalog.load("rw_ibov_stage")
+
+        DatePartitionedDataset(str(tmp_path / "rw_ibov_stage")).save(_market(["2025-01-03"]))  # outra execução
+        catalog.save("rw_ibov_stage", _market(["2025-01-06"]))
+
+        assert catalog.cache_stats()["passthrough"] == 0
+        assert len(catalog.load("rw_ibov_stage")) == 3
+        assert catalog.cache_stats()["misses"] == 2
+
+    def test_pipeline_reads_each_dataset_once(self, tmp_path, monkeypatch):
+        dataset = DatePartitionedDataset(str(tmp_path / "rw_ibov_stage"))
+        dataset.save(_market([day.strftime("%Y-%m-%d") for day in pd.date_range("2024-01-01", "2025-01-31")]))
+        catalog = CachedDataCatalog({"rw_ibov_stage": dataset, "resultado_a": MemoryDataset(),
+                                     "resultado_b": MemoryDataset(), "resultado_c": MemoryDataset()})
+        loads = _count_loads(monkeypatch, DatePartitionedDataset)
+
+        def janela(dias: int):
+            def indicador(df: pd.DataFrame) -> int:
+                return len(df)
+            indicador.lookback_days = lambda parms: dias
+            return indicador
+
+        consumers = pipeline([node(janela(days), "rw_ibov_stage", f"resultado_{name}", name=name)
+                              for name, days in (("a", 180), ("b", 30), ("c", 65))])
+        hook = LookbackPushdownHook()
+        hook.after_context_created(type("Context", (), {"params": {"odate": "2025-01-31"}})())
+        hook.after_catalog_created(catalog)
+        hook.before_pipeline_run({}, consumers, catalog)  # chamado pela sessão
+        hook_manager = _create_hook_manager()
+        hook_manager.register(hook)
+
+        SequentialRunner().run(consumers, catalog, hook_manager)
+
+        assert len(loads) == 1
+        assert catalog.cache_stats()["hits"] == 2
+        assert dataset.date_range == ("2024-08-04", "2025-01-31")  # união das janelas dos consumidores
+        assert [catalog.load(f"resultado_{name}") for name in "abc"] == [181] * 3
@@ -0,0 +1,564 @@
+"""
+Testes do AppendParquetDataset com log de deltas (semântica de duplicatas,
+compactação e gravações concorrentes), do DatePartitionedDataset e da leitura
+por janela de lookback, do cache local dos objetos remotos e das gravações
+concorrentes do AppendCSVDataset e das partições sem log de deltas.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import fsspec
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fsspec.implementations.memory import MemoryFileSystem
+
+from kedro.pipeline import node
+
+from factory import datasets as datasets_module
+from factory.datasets import AppendCSVDataset, AppendParquetDataset, DatePartitionedDataset, LocalCache
+from factory.hooks import DataPartitioningHook, LookbackPushdownHook
+from factory.pipelines.data_processing.nodes import indicador_retorno_mercado
+
+
+GRACE_SECONDS = 0.5
+
+
+def _dataset(path, **delta_log) -> AppendParquetDataset:
+    options = {"max_deltas": 1000, "grace_seconds": 0, "background": False}
+    options.update(delta_log)
+    return AppendParquetDataset(str(path / "rw_cds_stage.parquet"), delta_log=options)
+
+
+def _day(writer: int, day: int) -> str:
+    return (pd.Timestamp("2020-01-01") + pd.Timedelta(days=writer * 1000 + day)).strftime("%Y-%m-%d")
+
+
+def _frame(writer: int, day: int, value: float) -> pd.DataFrame:
+    return pd.DataFrame({"dat_ref": [_day(writer, day)], "close_price": [value]})
+
+
+def _dates(data: pd.DataFrame) -> list:
+    return list(data["dat_ref"].dt.strftime("%Y-%m-%d"))
+
+
+def _by_date(data: pd.DataFrame) -> dict:
+    return dict(zip(_dates(data), data["close_price"]))
+
+
+def _write_many(args) -> int:
+    path, writer, saves, delta_log, pause = args
+    dataset = _dataset(path, **delta_log)
+    for day in range(saves):
+        dataset.save(_frame(writer, day, float(day)))
+        time.sleep(pause)
+    dataset.release()  # aguarda as compactações em segundo plano
+    return saves
+
+
+def _log_objects(path, prefix: str):
+    log_dir = path / "rw_cds_stage.parquet.deltas"
+    return sorted(name for name in os.listdir(log_dir) if name.startswith(prefix)) if log_dir.exists() else []
+
+
+class TestAppendParquetDeltaLog:
+    def test_save_writes_one_delta_per_call(self, tmp_path):
+        dataset = _dataset(tmp_path)
+        dataset.save(_frame(0, 0, 1.0))
+        dataset.save(_frame(0, 1, 2.0))
+
+        assert len(_log_objects(tmp_path, "delta-")) == 2
+        assert not (tmp_path / "rw_cds_stage.parquet").exists()
+        assert sorted(_dates(dataset.load())) == [_day(0, 0), _day(0, 1)]
+
+    def test_load_keeps_latest_per_key(self, tmp_path):
+        dataset = _dataset(tmp_path)
+        dataset.save(pd.DataFrame({"dat_ref": ["2025-01-01", "2025-01-02"], "close_price": [1.0, 2.0]}))
+        dataset.save(pd.DataFrame({"dat_ref": ["2025-01-02"], "close_price": [9.0]}))
+
+        assert _by_date(dataset.load()) == {"2025-01-01": 1.0, "2025-01-02": 9.0}
+
+    def test_news_keys_and_projection(self, tmp_path):
+        dataset = AppendParquetDataset(str(tmp_path / "news.parquet"), load_args={"columns": ["link"]},
+                                       delta_log={"grace_seconds": 0, "background": False})
+        row = {"dat_ref": "2025-01-01", "fonte": "InfoMoney", "titulo": "t"}
+        dataset.save(pd.DataFrame([{**row, "link": "antigo"}]))
+        dataset.save(pd.DataFrame([{**row, "link": "novo"}, {**row, "titulo": "u", "link": "outro"}]))
+
+        loaded = dataset.load()
+        assert list(loaded.columns) == ["link"]
+        assert sorted(loaded["link"]) == ["novo", "outro"]
+
+    def test_compaction_folds_deltas_into_base(self, tmp_path):
+        dataset = _dataset(tmp_path, max_deltas=3)
+        for day in range(3):
+            dataset.save(_frame(0, day, float(day)))
+        dataset.save(_frame(0, 0, 7.0))
+
+        assert len(_log_objects(tmp_path, "base-")) == 1
+        assert len(_log_objects(tmp_path, "delta-")) == 1
+        assert _by_date(dataset.load()) == {_day(0, 0): 7.0, _day(0, 1): 1.0, _day(0, 2): 2.0}
+
+    def test_compaction_respects_grace_period(self, tmp_path):
+        dataset = _dataset(tmp_path, grace_seconds=3600)
+        dataset.save(_frame(0, 0, 1.0))
+
+        assert dataset.compact() == 0
+        assert len(_log_objects(tmp_path, "delta-")) == 1
+
+    def test_legacy_parquet_is_the_first_base(self, tmp_path):
+        pd.DataFrame({"dat_ref": ["2025-01-01", "2025-01-02"], "close_price": [1.0, 2.0]}).to_parquet(
+            tmp_path / "rw_cds_stage.parquet", index=False)
+        dataset = _dataset(tmp_path)
+        dataset.save(pd.DataFrame({"dat_ref": ["2025-01-02"], "close_price": [5.0]}))
+        dataset.compact()
+
+        assert _by_date(dataset.load()) == {"2025-01-01": 1.0, "2025-01-02": 5.0}
+
+    @pytest.mark.parametrize("max_deltas", [1000, 4])
+    def test_concurrent_thread_writers(self, tmp_path, max_deltas):
+        writers, saves = 8, 15
+        with ThreadPoolExecutor(max_workers=writers) as executor:
+            list(executor.map(_write_many, [(tmp_path, writer, saves, {"max_deltas": max_deltas, "grace_seconds": GRACE_SECONDS}, 0)
+                                            for writer in range(writers)]))
+
+        dataset = _dataset(tmp_path)
+        assert len(dataset.load()) == writers * saves
+        time.sleep(GRACE_SECONDS)
+        dataset.compact()
+        assert len(dataset.load()) == writers * saves
+        assert _log_objects(tmp_path, "delta-") == []
+
+    def test_concurrent_process_writers_with_compaction(self, tmp_path):
+        writers, saves = 4, 12
+        with ProcessPoolExecutor(max_workers=writers) as executor:
+            list(executor.map(_write_many, [(tmp_path, writer, saves, {"max_deltas": 5, "grace_seconds": GRACE_SECONDS}, 0.1)
+                                            for writer in range(writers)]))
+
+        loaded = _dataset(tmp_path).load()
+        assert len(loaded) == writers * saves
+        assert set(_dates(loaded)) == {_day(w, d) for w in range(writers) for d in range(saves)}
+        assert len(_log_objects(tmp_path, "base-")) >= 1
+
+    def test_compaction_lock_shared_by_path(self, tmp_path):
+        first, second = _dataset(tmp_path), _dataset(tmp_path)
+        second.save(_frame(0, 0, 1.0))
+
+        with datasets_module._compaction_lock(first._delta_dir):  # compactação em curso em outra instância
+            assert second.compact() == 0
+        assert second.compact() == 1
+
+    def test_background_compaction_joined_on_release(self, tmp_path):
+        delta_log = {"max_deltas": 2, "grace_seconds": 0}
+        dataset = DatePartitionedDataset(str(tmp_path / "rw_cds_stage"), delta_log=delta_log)
+        for day in range(2):
+            dataset.save(_frame(0, day, float(day)))
+
+        dataset.release()
+
+        assert not [thread for thread in threading.enumerate() if thread.name.startswith("compact-")]
+        log_dir = tmp_path / "rw_cds_stage" / "mes=2020-01" / "data.parquet.deltas"
+        assert [name for name in os.listdir(log_dir) if name.startswith("base-")]
+        assert _by_date(dataset.load()) == {_day(0, 0): 0.0, _day(0, 1): 1.0}
+
+
+def _market(dates, value: float = 1.0) -> pd.DataFrame:
+    return pd.DataFrame({"dat_ref": dates, "close_price": [value] * len(dates)})
+
+
+class TestDatePartitionedDataset:
+    def test_save_routes_rows_to_month_partitions(self, tmp_path):
+        dataset = DatePartitionedDataset(str(tmp_path / "rw_cds_stage"))
+        dataset.save(_market(["2025-01-30", "2025-01-31", "2025-02-03"]))
+
+        assert dataset.partitions() == ["2025-01", "2025-02"]
+        assert sorted(os.listdir(tmp_path / "rw_cds_stage")) == ["mes=2025-01", "mes=2025-02"]
+
+    def test_load_range_prunes_partitions(self, tmp_path, monkeypatch):
+        dataset = DatePartitionedDataset(str(tmp_path / "rw_cds_stage"), granularity="day")
+        dataset.save(_market([f"2025-01-{day:02d}" for day in range(1, 11)]))
+        opened = []
+        original = DatePartitionedDataset._partition_dataset
+        monkeypatch.setattr(DatePartitionedDataset, "_partition_dataset",
+                            lambda self, key: opened.append(key) or original(self, key))
+
+        loaded = dataset.load_range("2025-01-04", "2025-01-05")
+
+        assert _dates(loaded) == ["2025-01-05", "2025-01-04"]
+        assert sorted(opened) == ["2025-01-04", "2025-01-05"]
+
+    def test_set_date_range_applies_to_load(self, tmp_path):
+        dataset = DatePartitionedDataset(str(tmp_path / "rw_cds_stage"))
+        dataset.save(_market(["2024-12-31", "2025-01-15", "2025-02-01"]))
+        dataset.set_date_range("2025-01-01", None)
+
+        assert _dates(dataset.load()) == ["2025-02-01", "2025-01-15"]
+
+    def test_keeps_latest_within_partition(self, tmp_path):
+        dataset = DatePartitionedDataset(str(tmp_path / "rw_cds_stage"))
+        dataset.save(_market(["2025-01-02"], 1.0))
+        dataset.save(_market(["2025-01-02"], 2.0))
+
+        assert dataset.load()["close_price"].tolist() == [2.0]
+
+    def test_first_save_migrates_legacy_history(self, tmp_path):
+        _market(["2024-11-05", "2024-12-05"]).to_csv(tmp_path / "rw_cds_stage.csv", index=False)
+        dataset = DatePartitionedDataset(str(tmp_path / "rw_cds_stage"), legacy_filepath=str(tmp_path / "rw_cds_stage.parquet"))
+
+        assert _dates(dataset.load()) == ["2024-12-05", "2024-11-05"]
+        dataset.save(_market(["2025-01-02"]))
+        assert dataset.partitions() == ["2024-11", "2024-12", "2025-01"]
+
+    def test_hook_routes_rows_without_date_to_odate(self, tmp_path):
+        dataset = DatePartitionedDataset(str(tmp_path / "indice"))
+        hook = DataPartitioningHook()
+        hook.after_catalog_created(type("Catalog", (), {"_get_dataset": lambda self, name: dataset})())
+        data = pd.DataFrame({"dat_ref": [None], "score": [50.0], "odate": ["2025-03-10"]})
+
+        hook.before_dataset_saved("indice_isbm", data)
+        dataset.save(data)
+
+        assert "odate" not in data.columns
+        assert dataset.partitions() == ["2025-03"]
+
+
+def _history(days: int) -> pd.DataFrame:
+    dates = pd.date_range("2024-01-01", periods=days, freq="D").strftime("%Y-%m-%d")
+    return _market(list(dates))
+
+
+class TestDateRangeLoad:
+    def test_csv_scan_stops_after_range(self, tmp_path, monkeypatch, caplog):
+        dataset = AppendCSVDataset(str(tmp_path / "rw_cds_stage.csv"))
+        dataset.save(_history(400))
+        monkeypatch.setattr(AppendCSVDataset, "SCAN_CHUNK_ROWS", 30)
+        dataset.set_date_range("2025-01-20", "2025-01-31")
+
+        with caplog.at_level("INFO", logger="factory.datasets"):
+            loaded = dataset.load()
+
+        assert sorted(_dates(loaded)) == [f"2025-01-{day}" for day in range(20, 32)]
+        assert [record.args[1] for record in caplog.records if "blocos lidos" in record.msg] == [1]
+        dataset.set_date_range(None, None)
+        assert len(dataset.load()) == 400
+
+    def test_csv_save_keeps_history_outside_range(self, tmp_path):
+        dataset = AppendCSVDataset(str(tmp_path / "rw_cds_stage.csv"))
+        dataset.save(_history(10))
+        dataset.set_date_range("2024-01-09", None)
+        dataset.save(_market(["2024-01-11"]))
+
+        dataset.set_date_range(None, None)
+        assert len(dataset.load()) == 11
+
+    @pytest.mark.parametrize("delta_log", [None, {"grace_seconds": 0, "background": False}])
+    def test_parquet_range_filters(self, tmp_path, delta_log):
+        dataset = AppendParquetDataset(str(tmp_path / "rw_cds_stage.parquet"), save_args={"row_group_size": 50},
+                                       delta_log=delta_log)
+        dataset.save(_history(400))
+        dataset.set_date_range("2024-12-30", "2025-01-02")
+
+        assert sorted(_dates(dataset.load())) == ["2024-12-30", "2024-12-31", "2025-01-01", "2025-01-02"]
+
+    def test_typed_deltas_over_text_base(self, tmp_path):
+        _history(10).to_parquet(tmp_path / "rw_cds_stage.parquet", index=False)  # dat_ref como texto
+        dataset = _dataset(tmp_path)
+        dataset.save(_market(["2024-01-10", "2024-01-11"], 2.0))
+        dataset.set_date_range("2024-01-09", None)
+
+        loaded = dataset.load()
+
+        assert pd.api.types.is_datetime64_any_dtype(loaded["dat_ref"])
+        assert _by_date(loaded) == {"2024-01-09": 1.0, "2024-01-10": 2.0, "2024-01-11": 2.0}
+
+    def test_hook_sets_node_lookback_window(self, tmp_path):
+        dataset = DatePartitionedDataset(str(tmp_path / "rw_ibov_stage"))
+        dataset.save(_history(400))
+        hook = LookbackPushdownHook()
+        hook.after_context_created(type("Context", (), {"params": {
+            "odate": "2025-01-31", "parameters_retorno_mercado": {"lookback_days": 100}}})())
+        hook.after_catalog_created(type("Catalog", (), {"_get_dataset": lambda self, name: dataset})())
+        consumer = node(indicador_retorno_mercado, ["rw_ibov_stage", "params:parameters_retorno_mercado", "parameters"],
+                        "indicador_retorno_mercado")
+
+        hook.before_dataset_loaded("rw_ibov_stage", consumer)
+        loaded = dataset.load()
+
+        assert loaded["dat_ref"].min() == pd.Timestamp("2024-10-23")
+        assert loaded["dat_ref"].max() == pd.Timestamp("2025-01-31")
+        hook.after_context_created(type("Context", (), {"params": {"odate": "2025-01-31", "process_full_data": True}})())
+        hook.before_dataset_loaded("rw_ibov_stage", consumer)
+        assert len(dataset.load()) == 400
+
+
+@pytest.fixture
+def remote(tmp_path):
+    """Prefixo `memory://` (um object store em memória) exclusivo do teste"""
+    fs = fsspec.filesystem("memory")
+    root = f"/{tmp_path.name}"
+    yield f"memory://{root}"
+    if fs.exists(root):
+        fs.rm(root, recursive=True)
+
+
+class TestLocalCache:
+    def test_tasks_share_downloads(self, tmp_path, remote, monkeypatch):
+        AppendCSVDataset(f"{remote}/rw_cds_stage.csv").save(_history(10))
+        downloads = []
+        get_file = MemoryFileSystem.get_file
+        monkeypatch.setattr(MemoryFileSystem, "get_file",
+                            lambda self, rpath, lpath, **kwargs: downloads.append(rpath) or get_file(self, rpath, lpath, **kwargs))
+        tasks = [AppendCSVDataset(f"{remote}/rw_cds_stage.csv", local_cache={"dir": str(tmp_path / "cache")})
+                 for _ in range(3)]
+
+        loaded = [dataset.load() for dataset in tasks]
+
+        assert all(len(data) == 10 for data in loaded)
+        assert len(downloads) == 1
+        assert len(os.listdir(tmp_path / "cache")) == 1
+
+    def test_new_version_is_downloaded(self, tmp_path, remote):
+        dataset = AppendCSVDataset(f"{remote}/rw_cds_stage.csv", local_cache={"dir": str(tmp_path / "cache")})
+        dataset.save(_history(10))
+        assert len(dataset.load()) == 10
+
+        AppendCSVDataset(f"{remote}/rw_cds_stage.csv").save(_market(["2025-01-02"]))  # outra tarefa
+
+        assert len(dataset.load()) == 11
+        assert len(os.listdir(tmp_path / "cache")) == 1  # a versão antiga é descartada
+
+    def test_evicts_least_recently_used(self, tmp_path, remote, monkeypatch):
+        monkeypatch.setattr(LocalCache, "MIN_AGE_SECONDS", 0)
+        fs, root = fsspec.core.url_to_fs(remote)
+        for name in "abc":
+            fs.pipe_file(f"{root}/{name}.bin", b"x" * 100)
+        cache = LocalCache(str(tmp_path / "cache"), max_bytes=250)
+
+        first = cache.fetch(fs, f"{root}/a.bin")
+        cache.fetch(fs, f"{root}/b.bin")
+        os.utime(first, (time.time() + 10, time.time() + 10))  # "a" usado por último
+        cache.fetch(fs, f"{root}/c.bin")
+
+        assert os.path.exists(first)
+        assert len(os.listdir(tmp_path / "cache")) == 2
+        assert cache.stats["evicted"] == 1
+
+    def test_partitioned_delta_log_reads_through_cache(self, tmp_path, remote):
+        delta_log = {"grace_seconds": 0, "background": False}
+        DatePartitionedDataset(remote, delta_log=delta_log).save(_history(60))
+        cached = DatePartitionedDataset(remote, delta_log=delta_log, local_cache={"dir": str(tmp_path / "cache")})
+        cached.set_date_range("2024-01-25", None)
+
+        assert len(cached.load()) == 36
+        assert len(cached.load()) == 36
+        assert len(os.listdir(tmp_path / "cache")) == 2  # um delta por partição lida
+
+
+def _append_many(args) -> int:
+    filepath, writer, saves, storage_options = args
+    dataset = AppendCSVDataset(filepath, fs_args=storage_options)
+    for day in range(saves):
+        dataset.save(_frame(writer, day, float(writer)))
+    return saves
+
+
+def _partition_many(args) -> int:
+    filepath, writer, saves = args
+    dataset = DatePartitionedDataset(filepath)  # sem delta_log: cada partição é regravada
+    for day in range(saves):
+        dataset.save(_frame(writer, day, float(writer)))
+    return saves
+
+
+@pytest.fixture
+def s3_bucket():
+    """Bucket em um servidor S3 local (moto) e as `fs_args` para acessá-lo"""
+    server_module = pytest.importorskip("moto.server")
+    boto3 = pytest.importorskip("boto3")
+    server = server_module.ThreadedMotoServer(port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    options = {"key": "test", "secret": "test",
+               "client_kwargs": {"endpoint_url": f"http://{host}:{port}", "region_name": "us-east-1"}}
+    boto3.client("s3", endpoint_url=options["client_kwargs"]["endpoint_url"], aws_access_key_id="test",
+                 aws_secret_access_key="test", region_name="us-east-1").create_bucket(Bucket="meu-bucket-ismb")
+    yield "s3://meu-bucket-ismb", options
+    server.stop()
+
+
+class TestConcurrentCSVWriters:
+    def test_parallel_processes_keep_every_row(self, tmp_path):
+        filepath = str(tmp_path / "rw_cds_stage.csv")
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            assert sum(pool.map(_append_many, [(filepath, writer, 5, None) for writer in range(4)])) == 20
+
+        loaded = AppendCSVDataset(filepath).load()
+        assert len(loaded) == 20
+        assert _by_date(loaded) == {_day(writer, day): float(writer) for writer in range(4) for day in range(5)}
+
+    def test_conflict_rereads_and_merges(self, tmp_path, monkeypatch, caplog):
+        filepath = str(tmp_path / "rw_cds_stage.csv")
+        AppendCSVDataset(filepath).save(_frame(0, 0, 1.0))
+        conditional_put = datasets_module._conditional_put
+        concurrent = []
+
+        def put_after_other_run(fs, path, payload, version):
+            if not concurrent:  # outra execução grava entre a leitura e a gravação
+                concurrent.append(path)
+                conditional_put(fs, path, _frame(1, 0, 2.0).to_csv(index=False).encode(), version)
+            conditional_put(fs, path, payload, version)
+
+        monkeypatch.setattr(datasets_module, "_conditional_put", put_after_other_run)
+        with caplog.at_level("INFO", logger="factory.datasets"):
+            AppendCSVDataset(filepath).save(_frame(2, 0, 3.0))
+
+        assert _by_date(AppendCSVDataset(filepath).load()) == {_day(1, 0): 2.0, _day(2, 0): 3.0}
+        assert len([record for record in caplog.records if "Gravação concorrente" in record.msg]) == 1
+
+    def test_parallel_processes_keep_every_partitioned_row(self, tmp_path):
+        filepath = str(tmp_path / "rw_cds_stage")
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            assert sum(pool.map(_partition_many, [(filepath, writer, 5) for writer in range(4)])) == 20
+
+        loaded = DatePartitionedDataset(filepath).load()
+        assert _by_date(loaded) == {_day(writer, day): float(writer) for writer in range(4) for day in range(5)}
+
+    def test_parquet_conflict_rereads_and_merges(self, tmp_path, monkeypatch, caplog):
+        filepath = str(tmp_path / "rw_cds_stage.parquet")
+        AppendParquetDataset(filepath).save(_frame(0, 0, 1.0))
+        conditional_put = datasets_module._conditional_put
+        concurrent = []
+
+        def put_after_other_run(fs, path, payload, version):
+            if not concurrent:  # outra execução grava entre a leitura e a gravação
+                concurrent.append(path)
+                conditional_put(fs, path, AppendParquetDataset(filepath)._serialize(_frame(1, 0, 2.0)), version)
+            return conditional_put(fs, path, payload, version)
+
+        monkeypatch.setattr(datasets_module, "_conditional_put", put_after_other_run)
+        with caplog.at_level("INFO", logger="factory.datasets"):
+            AppendParquetDataset(filepath).save(_frame(2, 0, 3.0))
+
+        assert _by_date(AppendParquetDataset(filepath).load()) == {_day(1, 0): 2.0, _day(2, 0): 3.0}
+        assert len([record for record in caplog.records if "Gravação concorrente" in record.msg]) == 1
+
+    def test_s3_conditional_writes(self, s3_bucket):
+        root, options = s3_bucket
+        filepath = f"{root}/staging/rw_cds_stage.csv"
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            assert sum(pool.map(_append_many, [(filepath, writer, 5, options) for writer in range(4)])) == 20
+
+        assert len(AppendCSVDataset(filepath, fs_args=options).load()) == 20
+
+
+def _news(*titles: str, day: str = "2025-01-02", fonte: str = "infomoney") -> pd.DataFrame:
+    return pd.DataFrame({"dat_ref": [day] * len(titles), "fonte": [fonte] * len(titles), "titulo": list(titles),
+                         "link": [f"https://{fonte}/{title}" for title in titles]})
+
+
+class TestKeyIndex:
+    def test_csv_appends_only_unseen_rows(self, tmp_path):
+        filepath = tmp_path / "rw_infomoney_stage.csv"
+        dataset = AppendCSVDataset(str(filepath), key_index=True)
+        dataset.save(_news("a", "b"))
+        dataset.save(_news("b", "c", day="2025-01-03"))
+        dataset.save(_news("b", "c", day="2025-01-03"))  # nada novo: o arquivo não é regravado
+        before = filepath.read_bytes()
+        dataset.save(_news("a"))
+
+        assert filepath.read_bytes() == before
+        assert (tmp_path / "rw_infomoney_stage.csv.keys").exists()
+        lines = before.decode().splitlines()
+        assert [line.split(",")[2] for line in lines[1:]] == ["c", "b", "b", "a"]  # novas linhas no início
+        assert len(dataset.load()) == 4
+
+    def test_csv_older_rows_keep_descending_order(self, tmp_path):
+        filepath = tmp_path / "rw_infomoney_stage.csv"
+        dataset = AppendCSVDataset(str(filepath), key_index=True)
+        dataset.save(_news("a", day="2025-01-03"))
+        dataset.save(_news("b", day="2025-01-05"))
+        dataset.save(_news("c", day="2025-01-01"))  # backfill: anterior à primeira linha do arquivo
+
+        lines = filepath.read_text().splitlines()[1:]
+        assert [line.split(",")[0] for line in lines] == ["2025-01-05", "2025-01-03", "2025-01-01"]
+        dataset.set_date_range("2025-01-02", None)
+        assert sorted(dataset.load()["titulo"]) == ["a", "b"]
+
+    def test_parquet_skips_rewrite_without_new_rows(self, tmp_path):
+        filepath = tmp_path / "rw_infomoney_stage.parquet"
+        dataset = AppendParquetDataset(str(filepath), key_index=True)
+        dataset.save(_news("a", "b"))
+        before = filepath.read_bytes()
+        dataset.save(_news("b", "a"))
+
+        assert filepath.read_bytes() == before
+        dataset.save(_news("b", "c"))
+        assert sorted(dataset.load()["titulo"]) == ["a", "b", "c"]
+
+    def test_csv_rebuilds_stale_index(self, tmp_path, caplog):
+        filepath = tmp_path / "rw_infomoney_stage.csv"
+        AppendCSVDataset(str(filepath), key_index=True).save(_news("a"))
+        AppendCSVDataset(str(filepath)).save(_news("b"))  # gravação sem o índice
+
+        with caplog.at_level("INFO", logger="factory.datasets"):
+            AppendCSVDataset(str(filepath), key_index=True).save(_news("a", "b", "c"))
+
+        assert sorted(AppendCSVDataset(str(filepath)).load()["titulo"]) == ["a", "b", "c"]
+        assert any("reconstruindo" in record.msg for record in caplog.records)
+
+    def test_delta_log_skips_seen_rows(self, tmp_path):
+        delta_log = {"grace_seconds": 0, "background": False}
+        dataset = DatePartitionedDataset(str(tmp_path / "rw_infomoney_stage"), delta_log=delta_log, key_index=True)
+        deltas_dir = tmp_path / "rw_infomoney_stage" / "mes=2025-01" / "data.parquet.deltas"
+        dataset.save(_news("a", "b"))
+        dataset.save(_news("a", "b"))
+
+        assert len(os.listdir(deltas_dir)) == 1
+        dataset.save(_news("b", "c"))
+        newest = sorted(os.listdir(deltas_dir))[-1]
+        assert list(pd.read_parquet(deltas_dir / newest)["titulo"]) == ["c"]
+
+        partition = AppendParquetDataset(str(tmp_path / "rw_infomoney_stage" / "mes=2025-01" / "data.parquet"),
+                                         delta_log=delta_log, key_index=True)
+        assert partition.compact() == 2
+        partition.save(_news("a", "c", "d"))  # o índice é reconstruído após a compactação
+        assert sorted(dataset.load()["titulo"]) == ["a", "b", "c", "d"]
+        assert len([name for name in os.listdir(deltas_dir) if name.startswith("delta-")]) == 1
+
+    def test_csv_changed_row_keeps_latest(self, tmp_path):
+        filepath = tmp_path / "rw_infomoney_stage.csv"
+        dataset = AppendCSVDataset(str(filepath), key_index=True)
+        dataset.save(_news("a", "b").assign(coleta_completa=False))
+        dataset.save(_news("a", "b").assign(coleta_completa=True))  # nova coleta, completa
+        before = filepath.read_bytes()
+        dataset.save(_news("a", "b").assign(coleta_completa=True))
+
+        assert filepath.read_bytes() == before
+        stored = dataset.load()
+        assert len(stored) == 2 and stored["coleta_completa"].all()
+
+    def test_csv_rebuilds_index_without_row_hashes(self, tmp_path, caplog):
+        filepath = tmp_path / "rw_infomoney_stage.csv"
+        AppendCSVDataset(str(filepath), key_index=True).save(_news("a"))
+        pq.write_table(pa.table({"key": pa.array([1], type=pa.uint64())}), f"{filepath}.keys")  # formato antigo: só as chaves
+
+        with caplog.at_level("INFO", logger="factory.datasets"):
+            AppendCSVDataset(str(filepath), key_index=True).save(_news("a", "b"))
+
+        assert sorted(AppendCSVDataset(str(filepath)).load()["titulo"]) == ["a", "b"]
+        assert any("reconstruindo" in record.msg for record in caplog.records)
+
+    def test_delta_log_changed_row_keeps_latest(self, tmp_path):
+        delta_log = {"grace_seconds": 0, "background": False}
+        dataset = DatePartitionedDataset(str(tmp_path / "rw_infomoney_stage"), delta_log=delta_log, key_index=True)
+        deltas_dir = tmp_path / "rw_infomoney_stage" / "mes=2025-01" / "data.parquet.deltas"
+        dataset.save(_news("a", "b").assign(coleta_completa=False))
+        dataset.save(_news("a", "b").assign(coleta_completa=True))
+        dataset.save(_news("a", "b").assign(coleta_completa=True))
+
+        assert len(os.listdir(deltas_dir)) == 2
+        stored = dataset.load()
+        assert len(stored) == 2 and stored["coleta_completa"].all()